@@ -0,0 +1 @@
+"""Benchmarks for the validation pipeline and the issue table."""
@@ -0,0 +1,113 @@
+"""Synthetic invoices for samples/xsd_ejemplo_1.xsd, used by the benchmarks.
+
+The cases are written by XmlGenerator, the same generator behind
+generar_xml.py, so the benchmarks and load tests share one source of test
+documents. The only hand-written case is ``deep_nesting``: it puts element
+content where the schema expects text, a fault the generator never produces
+because it only ever substitutes values.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, TextIO
+
+from src.xsd_manager.services.generation.xml_generator import DEFAULT_SEED, XmlGenerator
+
+
+SAMPLE_XSD = Path(__file__).resolve().parent.parent / "samples" / "xsd_ejemplo_1.xsd"
+
+# Average size of a generated <Linea>, to turn line counts into target sizes.
+LINE_BYTES = 290
+# A <Linea> holds seven values, so this injects about one fault per line.
+FAULTS_PER_VALUE = 1 / 7
+
+HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<Factura numero="F-2026-{number:04d}" fecha="2026-02-28" moneda="EUR">
+  <Emisor>
+    <Nombre>ACME Soluciones S.L.</Nombre>
+    <NIF>B12345678</NIF>
+    <Direccion>Calle Mayor 10, Madrid</Direccion>
+  </Emisor>
+  <Receptor>
+    <Nombre>Cliente Demo S.A.</Nombre>
+    <NIF>A87654321</NIF>
+    <Direccion>Avenida Central 25, Barcelona</Direccion>
+  </Receptor>
+  <Lineas>
+"""
+
+FOOTER = """  </Lineas>
+  <Totales>
+    <TotalBaseImponible>0.00</TotalBaseImponible>
+    <TotalIVA>0.00</TotalIVA>
+    <TotalFactura>0.00</TotalFactura>
+  </Totales>
+</Factura>
+"""
+
+
+@dataclass(frozen=True)
+class CorpusCase:
+    name: str
+    path: Path
+    lines: int
+    description: str
+
+
+def write_invoice(path: Path, lines: int, *, fault_rate: float = 0.0, seed: int = DEFAULT_SEED) -> Path:
+    """Write an invoice of about ``lines`` lines; ``fault_rate`` of its values break the schema."""
+    generator = XmlGenerator(SAMPLE_XSD, root="Factura", seed=seed, fault_rate=fault_rate)
+    generator.write(path, target_bytes=lines * LINE_BYTES, repeat_element="Linea")
+    return path
+
+
+def _write_nested_line(out: TextIO, index: int, nesting: int) -> None:
+    # Element content where text is expected: the parser and the validator
+    # still have to walk the whole subtree.
+    out.write("    <Linea>\n")
+    out.write(f"      <Descripcion>{'<Detalle>' * nesting}Servicio {index}{'</Detalle>' * nesting}</Descripcion>\n")
+    for name, value in (
+        ("Cantidad", "1"),
+        ("PrecioUnitario", "10.00"),
+        ("TipoIVA", "21"),
+        ("BaseImponible", "10.00"),
+        ("CuotaIVA", "2.10"),
+        ("TotalLinea", "12.10"),
+    ):
+        out.write(f"      <{name}>{value}</{name}>\n")
+    out.write("    </Linea>\n")
+
+
+def write_nested_invoice(path: Path, lines: int, nesting: int, seed: int = DEFAULT_SEED) -> Path:
+    """Write an invoice whose every line nests ``nesting`` levels of elements in a text field."""
+    with open(path, "w", encoding="utf-8", newline="\n") as out:
+        out.write(HEADER.format(number=seed % 10_000))
+        for index in range(lines):
+            _write_nested_line(out, index, nesting)
+        out.write(FOOTER)
+    return path
+
+
+def generate_corpus(directory: Path, scale: float = 1.0, seed: int = DEFAULT_SEED) -> List[CorpusCase]:
+    """Write the benchmark cases into ``directory``; ``scale`` multiplies their sizes."""
+    directory.mkdir(parents=True, exist_ok=True)
+
+    def size(lines: int) -> int:
+        return max(1, int(lines * scale))
+
+    specs = (
+        ("small", size(2), 0.0, "Factura valida de pocas lineas"),
+        ("huge", size(100_000), 0.0, "Factura valida muy grande (parse y validacion)"),
+        ("many_errors", size(4_000), FAULTS_PER_VALUE, "Una incidencia por linea, de media (registro de errores)"),
+    )
+    cases = []
+    for name, lines, fault_rate, description in specs:
+        path = write_invoice(directory / f"{name}.xml", lines, fault_rate=fault_rate, seed=seed)
+        cases.append(CorpusCase(name=name, path=path, lines=lines, description=description))
+
+    lines = size(2_000)
+    path = write_nested_invoice(directory / "deep_nesting.xml", lines, nesting=200, seed=seed)
+    cases.append(CorpusCase("deep_nesting", path, lines, "Contenido anidado a 200 niveles en cada linea"))
+    return cases
@@ -0,0 +1,299 @@
+"""Time the validation pipeline stage by stage and compare against JSON baselines.
+
+Run from the repository root::
+
+    python -m benchmarks.run --output benchmarks/results/base.json
+    python -m benchmarks.run --compare benchmarks/results/base.json
+
+Every case of the synthetic corpus goes through schema compile, parse,
+validate, issue conversion and classification, the whole
+XsdValidator.validate call, and MainWindow.load_issues on an offscreen Qt
+window. Results are the min/median over ``--repeat`` runs; comparing uses
+the medians.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import lxml.etree as etree
+
+from benchmarks.corpus import DEFAULT_SEED, SAMPLE_XSD, CorpusCase, generate_corpus
+from src.xsd_manager.domain.models import IssueColumns, ValidationRequest
+from src.xsd_manager.services.validators.classification import MessageClassifier
+from src.xsd_manager.services.validators.document import DocumentContext
+from src.xsd_manager.services.validators.schema_cache import SchemaCache
+from src.xsd_manager.services.validators.xsd_validator import XsdValidator
+
+
+RESULTS_FORMAT = 1
+DEFAULT_THRESHOLD = 0.15
+# Sub-millisecond stages jitter by more than any sensible threshold.
+DEFAULT_MIN_DELTA_MS = 1.0
+
+Timings = Dict[str, Dict[str, float]]
+
+
+def _measure(run: Callable[[], float], repeat: int) -> Dict[str, float]:
+    """Call ``run`` ``repeat`` times; each call returns the seconds it measured."""
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        samples.append(run())
+    return {
+        "min_ms": round(min(samples) * 1000.0, 3),
+        "median_ms": round(statistics.median(samples) * 1000.0, 3),
+        "repeat": repeat,
+    }
+
+
+def _timed(action: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def bench_case(case: CorpusCase, xsd_path: Path, repeat: int, window=None) -> Timings:
+    request = ValidationRequest(xml_path=case.path, xsd_paths=[xsd_path])
+    columnar_request = ValidationRequest(xml_path=case.path, xsd_paths=[xsd_path], columnar=True)
+    validator = XsdValidator(schema_cache=SchemaCache())
+    compiled = validator.schema_cache.get(xsd_path)
+    results: Timings = {}
+
+    results["compile"] = _measure(lambda: _timed(lambda: SchemaCache().get(xsd_path)), repeat)
+
+    def parse() -> float:
+        with DocumentContext(request) as context:
+            return _timed(context.tree)
+
+    results["parse"] = _measure(parse, repeat)
+
+    with DocumentContext(request) as context:
+        document = context.tree()
+        results["validate"] = _measure(lambda: _timed(lambda: compiled.schema.validate(document)), repeat)
+        compiled.schema.validate(document)
+        entries = list(compiled.schema.error_log)
+        # The context dropped its reference on exit; drop this one before the next stages.
+        del document
+
+    def convert() -> float:
+        # A fresh classifier each run, so memoized messages do not hide the cost.
+        validator.classifier = MessageClassifier()
+        return _timed(lambda: [validator._to_issue(entry) for entry in entries])
+
+    results["convert_issues"] = _measure(convert, repeat)
+
+    messages = [entry.message for entry in entries]
+
+    def classify(classifier: MessageClassifier) -> float:
+        return _timed(lambda: [classifier.classify(message) for message in messages])
+
+    results["classify_cold"] = _measure(lambda: classify(MessageClassifier()), repeat)
+    warm = MessageClassifier()
+    classify(warm)
+    results["classify_warm"] = _measure(lambda: classify(warm), repeat)
+
+    validator.classifier = MessageClassifier()
+    results["validate_total"] = _measure(lambda: _timed(lambda: validator.validate(request)), repeat)
+    results["validate_total_columnar"] = _measure(
+        lambda: _timed(lambda: validator.validate(columnar_request)), repeat
+    )
+    streaming_request = ValidationRequest(
+        xml_path=case.path,
+        xsd_paths=[xsd_path],
+        streaming=True,
+        record_tag="Linea",
+    )
+    results["validate_streaming"] = _measure(
+        lambda: _timed(lambda: validator.validate(streaming_request)), repeat
+    )
+
+    if window is not None:
+        issues = validator.validate(columnar_request).issues
+        results["ui_load_issues"] = _measure(lambda: _load_issues(window, issues), repeat)
+
+    results["_issues"] = {"count": len(entries)}
+    return results
+
+
+def _load_issues(window, issues: IssueColumns) -> float:
+    from PyQt6.QtWidgets import QApplication
+
+    elapsed = _timed(lambda: window.load_issues(issues))
+    QApplication.processEvents()
+    return elapsed
+
+
+def _create_window():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    # Keep the benchmark away from the user's settings and result cache.
+    app.setOrganizationName("XsdManagerBenchmarks")
+    app.setApplicationName("benchmarks")
+
+    from src.ui.main_window import MainWindow
+
+    window = MainWindow()
+    window._result_cache = None
+    return app, window
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def environment() -> Dict[str, object]:
+    return {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "lxml": ".".join(map(str, etree.LXML_VERSION)),
+        "libxml2": ".".join(map(str, etree.LIBXML_VERSION)),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(
+    current: Dict[str, Timings],
+    baseline: Dict[str, Timings],
+    threshold: float,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> List[str]:
+    """Lines describing every stage whose median grew by more than ``threshold``
+    and by at least ``min_delta_ms``."""
+    regressions = []
+    for case, stages in current.items():
+        for stage, timing in stages.items():
+            previous = baseline.get(case, {}).get(stage)
+            if stage.startswith("_") or not previous or not previous.get("median_ms"):
+                continue
+            ratio = timing["median_ms"] / previous["median_ms"]
+            if ratio > 1.0 + threshold and timing["median_ms"] - previous["median_ms"] >= min_delta_ms:
+                regressions.append(
+                    f"{case}/{stage}: {previous['median_ms']:.3f} ms -> {timing['median_ms']:.3f} ms "
+                    f"(+{(ratio - 1.0) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_results(results: Dict[str, Timings], baseline: Optional[Dict[str, Timings]] = None) -> None:
+    for case, stages in results.items():
+        print(f"{case} ({stages['_issues']['count']} incidencias)")
+        for stage, timing in stages.items():
+            if stage.startswith("_"):
+                continue
+            line = f"  {stage:<26} min {timing['min_ms']:>10.3f} ms   mediana {timing['median_ms']:>10.3f} ms"
+            previous = (baseline or {}).get(case, {}).get(stage)
+            if previous and previous.get("median_ms"):
+                change = (timing["median_ms"] / previous["median_ms"] - 1.0) * 100
+                line += f"   ({change:+.0f}%)"
+            print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks del flujo de validacion.")
+    parser.add_argument("--output", help="Guarda los resultados en este JSON")
+    parser.add_argument("--compare", metavar="JSON", help="Compara con una linea base guardada con --output")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Empeoramiento relativo de la mediana que cuenta como regresion (0.15 = 15%%)",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=DEFAULT_MIN_DELTA_MS,
+        help="Diferencia absoluta minima para contar una regresion",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por etapa")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplica el tamano de los casos")
+    parser.add_argument("--cases", nargs="+", help="Ejecuta solo estos casos")
+    parser.add_argument("--corpus-dir", help="Directorio del corpus (por defecto, uno temporal)")
+    parser.add_argument("--xsd", default=str(SAMPLE_XSD), help="XSD contra el que validar")
+    parser.add_argument("--no-ui", action="store_true", help="Omite MainWindow.load_issues")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat debe ser mayor que cero.")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            saved = json.load(file)
+        baseline = saved["results"]
+        options = saved.get("options", {})
+        if options.get("scale") != args.scale or options.get("seed") != args.seed:
+            print("AVISO: la linea base se genero con otra escala o semilla del corpus.", file=sys.stderr)
+
+    app = window = None
+    if not args.no_ui:
+        app, window = _create_window()
+
+    with tempfile.TemporaryDirectory(prefix="xsd-bench-") as temporary:
+        corpus_dir = Path(args.corpus_dir) if args.corpus_dir else Path(temporary)
+        cases = generate_corpus(corpus_dir, scale=args.scale, seed=args.seed)
+        if args.cases:
+            unknown = set(args.cases) - {case.name for case in cases}
+            if unknown:
+                parser.error(f"casos desconocidos: {', '.join(sorted(unknown))}")
+            cases = [case for case in cases if case.name in args.cases]
+
+        results: Dict[str, Timings] = {}
+        for case in cases:
+            print(f"... {case.name}: {case.description}", file=sys.stderr, flush=True)
+            results[case.name] = bench_case(case, Path(args.xsd), args.repeat, window)
+
+    if window is not None:
+        window.close()
+    del app
+
+    print_results(results, baseline)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "format": RESULTS_FORMAT,
+            "environment": environment(),
+            "options": {"repeat": args.repeat, "scale": args.scale, "seed": args.seed},
+            "results": results,
+        }
+        output.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"REGRESIONES (> {args.threshold * 100:.0f}%):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("Sin regresiones respecto a la linea base.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
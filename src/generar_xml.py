@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+try:
+    from xsd_manager.services.generation.xml_generator import (
+        DEFAULT_MAX_OCCURS,
+        DEFAULT_SEED,
+        GenerationStats,
+        GeneratorError,
+        XmlGenerator,
+    )
+except ModuleNotFoundError:
+    from src.xsd_manager.services.generation.xml_generator import (
+        DEFAULT_MAX_OCCURS,
+        DEFAULT_SEED,
+        GenerationStats,
+        GeneratorError,
+        XmlGenerator,
+    )
+
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("debe ser mayor que cero")
+    return number
+
+
+def _rate(value: str) -> float:
+    number = float(value)
+    if not 0.0 <= number <= 1.0:
+        raise argparse.ArgumentTypeError("debe estar entre 0 y 1")
+    return number
+
+
+def _size(value: str) -> int:
+    text = value.strip().upper().removesuffix("B")
+    unit = text[-1:] if text[-1:] in _SIZE_UNITS else ""
+    try:
+        number = float(text[: len(text) - len(unit)])
+    except ValueError:
+        raise argparse.ArgumentTypeError("use un tamano como 500K, 200M o 2G") from None
+    if number <= 0:
+        raise argparse.ArgumentTypeError("debe ser mayor que cero")
+    return int(number * _SIZE_UNITS[unit])
+
+
+def format_stats(stats: GenerationStats, elapsed: float) -> str:
+    megabytes = stats.bytes_written / (1024 * 1024)
+    return (
+        f"GENERADO: {stats.documents} documentos, {megabytes:.2f} MB, {stats.elements} elementos, "
+        f"{stats.violations} incidencias inyectadas en {elapsed:.1f} s "
+        f"({megabytes / elapsed if elapsed else 0.0:.2f} MB/s)"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Genera XML de prueba que cumplen un XSD, para corpus de carga y benchmarks."
+    )
+    parser.add_argument("xsd", help="Ruta al archivo XSD")
+    parser.add_argument("--root", metavar="ELEMENTO", help="Elemento raiz (por defecto, el primero declarado)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Semilla; la misma semilla da los mismos XML")
+    output_group = parser.add_argument_group("salida")
+    output_group.add_argument("--output", metavar="ARCHIVO", help="Escribe un unico XML en ARCHIVO")
+    output_group.add_argument(
+        "--output-dir",
+        metavar="DIRECTORIO",
+        help="Escribe --count XML en DIRECTORIO como PREFIJO_000001.xml, PREFIJO_000002.xml...",
+    )
+    output_group.add_argument("--count", type=_positive_int, default=1, metavar="N", help="Numero de XML a generar")
+    output_group.add_argument("--prefix", default="doc", metavar="PREFIJO", help="Prefijo de los archivos generados")
+    content_group = parser.add_argument_group("contenido")
+    content_group.add_argument(
+        "--size",
+        type=_size,
+        metavar="TAMANO",
+        help="Tamano aproximado de cada XML (p. ej. 500M): repite el primer elemento repetible hasta alcanzarlo",
+    )
+    content_group.add_argument(
+        "--repeat",
+        metavar="ELEMENTO",
+        help="Elemento que se repite para alcanzar --size (por defecto, el primero con maxOccurs > 1)",
+    )
+    content_group.add_argument(
+        "--max-occurs",
+        type=_positive_int,
+        default=DEFAULT_MAX_OCCURS,
+        metavar="N",
+        help="Repeticiones maximas de los elementos con maxOccurs > 1",
+    )
+    content_group.add_argument(
+        "--optional-rate",
+        type=_rate,
+        default=0.5,
+        metavar="P",
+        help="Probabilidad de incluir cada elemento o atributo opcional",
+    )
+    content_group.add_argument(
+        "--fault-rate",
+        type=_rate,
+        default=0.0,
+        metavar="P",
+        help="Fraccion de valores que se sustituyen por uno que incumple el XSD",
+    )
+    args = parser.parse_args()
+
+    if args.output and args.output_dir:
+        parser.error("use --output o --output-dir, no ambos.")
+    if not args.output and not args.output_dir:
+        parser.error("se requiere --output o --output-dir.")
+    if args.output and args.count != 1:
+        parser.error("--count requiere --output-dir.")
+    if args.repeat and not args.size:
+        parser.error("--repeat requiere --size.")
+
+    start = time.perf_counter()
+    try:
+        generator = XmlGenerator(
+            args.xsd,
+            root=args.root,
+            seed=args.seed,
+            max_occurs=args.max_occurs,
+            optional_rate=args.optional_rate,
+            fault_rate=args.fault_rate,
+        )
+        if args.output:
+            stats = generator.write(args.output, target_bytes=args.size, repeat_element=args.repeat)
+        else:
+            stats = generator.write_corpus(
+                Path(args.output_dir),
+                args.count,
+                prefix=args.prefix,
+                target_bytes=args.size,
+                repeat_element=args.repeat,
+            )
+    except GeneratorError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
+    except OSError as exc:
+        print(f"ERROR: No se pudo escribir el XML: {exc}", file=sys.stderr)
+        return 2
+
+    print(format_stats(stats, time.perf_counter() - start), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,199 @@
+"""Progressive loading of files into the code editors."""
+
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QProgressBar
+
+from src.ui.widgets import CodeEditor, PageNavigator
+from src.ui.workers import CancelToken, FileLoadWorker
+from src.xsd_manager.infra.files import PagedFile, read_text
+
+
+# Files up to this size are read on the GUI thread in one step; the
+# round-trip through a worker is not worth it for them.
+SYNC_LOAD_MAX_BYTES = 1024 * 1024
+DEFAULT_PAGED_VIEW_THRESHOLD_MB = 64
+
+
+class EditorLoader(QObject):
+    """Load files into one CodeEditor without blocking the window.
+
+    Small files are read synchronously. Larger ones are streamed in chunks
+    by a FileLoadWorker while ``progress_bar`` shows how far it got, and
+    files of at least ``paged_threshold`` bytes open in a read-only paged
+    view driven by ``navigator``. While a load runs or a paged view is shown
+    the editor does not hold the whole file, so ``is_partial`` is True and
+    its text must not be saved over the original.
+    """
+
+    loaded = pyqtSignal(str)
+    failed = pyqtSignal(str, str)
+
+    def __init__(
+        self,
+        editor: CodeEditor,
+        navigator: PageNavigator,
+        progress_bar: QProgressBar,
+        thread_pool: QThreadPool,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self.editor = editor
+        self.navigator = navigator
+        self.progress_bar = progress_bar
+        self.thread_pool = thread_pool
+        self.path = ""
+        self._read_only = editor.isReadOnly()
+        self._run_id = 0
+        self._token: CancelToken | None = None
+        self._worker: FileLoadWorker | None = None
+        self._paged: PagedFile | None = None
+        self._page_index = 0
+
+        self.navigator.setVisible(False)
+        self.progress_bar.setVisible(False)
+        self.navigator.page_requested.connect(self.show_page)
+        self.navigator.line_requested.connect(self.go_to_line)
+
+    @property
+    def is_loading(self) -> bool:
+        return self._token is not None
+
+    @property
+    def is_paged(self) -> bool:
+        return self._paged is not None
+
+    @property
+    def is_partial(self) -> bool:
+        return self.is_loading or self.is_paged
+
+    def load(self, path: str, paged_threshold: int) -> None:
+        self.reset()
+        self.path = path
+        try:
+            size = Path(path).stat().st_size
+        except OSError as exc:
+            self.failed.emit(path, f"No se pudo leer el archivo: {exc}")
+            return
+
+        if size <= SYNC_LOAD_MAX_BYTES and size < paged_threshold:
+            try:
+                content = read_text(path)
+            except OSError as exc:
+                self.failed.emit(path, f"No se pudo leer el archivo: {exc}")
+                return
+            self.editor.set_content(content)
+            self.loaded.emit(path)
+            return
+
+        self._run_id += 1
+        self._token = CancelToken()
+        worker = FileLoadWorker(self._run_id, path, self._token, paged_threshold)
+        worker.signals.progress.connect(self._on_progress)
+        worker.signals.chunk.connect(self._on_chunk)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        self._worker = worker
+
+        if size < paged_threshold:
+            self.editor.begin_load(size)
+        else:
+            self.editor.set_content("")
+        self.editor.setReadOnly(True)
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.thread_pool.start(worker)
+
+    def cancel(self) -> None:
+        if self._token is None:
+            return
+        self._token.cancel()
+        self._token = None
+        self._worker = None
+        self._run_id += 1
+        self.progress_bar.setVisible(False)
+        self.editor.end_load()
+        self.editor.setReadOnly(self._read_only)
+
+    def reset(self) -> None:
+        """Cancel any load in flight and leave the editor in normal editing mode."""
+        self.cancel()
+        if self._paged is not None:
+            self._paged.close()
+            self._paged = None
+        self._page_index = 0
+        self.path = ""
+        self.navigator.setVisible(False)
+        self.editor.set_line_offset(0)
+        self.editor.setReadOnly(self._read_only)
+
+    def show_page(self, index: int) -> None:
+        if self._paged is None or not 0 <= index < self._paged.page_count:
+            return
+        self._page_index = index
+        page = self._paged.pages[index]
+        self.editor.set_line_offset(page.first_line - 1)
+        self.editor.set_content(self._paged.page_text(index))
+        self.navigator.set_page(
+            index,
+            self._paged.page_count,
+            page.first_line,
+            self._paged.last_line(index),
+            self._paged.line_count,
+        )
+
+    def go_to_line(self, line: int) -> None:
+        """Show ``line`` (1-based, in file numbering) and put the cursor on it."""
+        if self._paged is not None:
+            index = self._paged.page_for_line(line)
+            if index != self._page_index:
+                self.show_page(index)
+            line -= self._paged.pages[self._page_index].first_line - 1
+        block = self.editor.document().findBlockByNumber(max(0, line - 1))
+        if not block.isValid():
+            return
+        cursor = QTextCursor(block)
+        self.editor.setTextCursor(cursor)
+        self.editor.centerCursor()
+
+    def _on_progress(self, run_id: int, done: int, total: int) -> None:
+        if run_id != self._run_id or total <= 0:
+            return
+        self.progress_bar.setValue(int(done * 1000 / total))
+
+    def _on_chunk(self, run_id: int, text: str) -> None:
+        worker = self._worker
+        if run_id != self._run_id or worker is None:
+            return
+        self.editor.append_text(text)
+        worker.chunk_consumed()
+
+    def _on_finished(self, run_id: int, paged: PagedFile | None) -> None:
+        if run_id != self._run_id:
+            if paged is not None:
+                paged.close()
+            return
+        self._token = None
+        self._worker = None
+        self.progress_bar.setVisible(False)
+        self.editor.end_load()
+        if paged is not None:
+            self._paged = paged
+            self.navigator.setVisible(True)
+            self.show_page(0)
+        else:
+            self.editor.setReadOnly(self._read_only)
+            self.editor.moveCursor(QTextCursor.MoveOperation.Start)
+        self.loaded.emit(self.path)
+
+    def _on_failed(self, run_id: int, message: str) -> None:
+        if run_id != self._run_id:
+            return
+        path = self.path
+        self.cancel()
+        self.reset()
+        self.editor.set_content("")
+        self.failed.emit(path, message)
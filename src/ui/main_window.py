@@ -3,15 +3,19 @@
 import sys
 from pathlib import Path
 import ctypes
+import hashlib
 import re
 
-from PyQt6.QtCore import Qt, QEvent, QSettings, QTimer
-from PyQt6.QtGui import QColor, QBrush, QAction, QIcon, QKeySequence
+from PyQt6.QtCore import Qt, QEvent, QSettings, QThreadPool, QTimer
+from PyQt6.QtGui import QAction, QIcon, QKeySequence
 from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
     QFileDialog,
     QFrame,
     QGridLayout,
     QHBoxLayout,
+    QInputDialog,
     QLabel,
     QLineEdit,
     QMainWindow,
@@ -22,22 +26,43 @@ from PyQt6.QtWidgets import (
     QHeaderView,
     QSplitter,
     QPlainTextEdit,
+    QProgressBar,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QToolButton,
     QVBoxLayout,
     QWidget,
 )
 
 try:
-    from src.validar_xml import ValidationIssue, validate
+    from src.validar_xml import (
+        IssueColumns,
+        IssueSequence,
+        Severity,
+        ValidationIssue,
+        ValidationReport,
+        count_severities,
+    )
 except ImportError:
-    from validar_xml import ValidationIssue, validate
-
+    from validar_xml import (
+        IssueColumns,
+        IssueSequence,
+        Severity,
+        ValidationIssue,
+        ValidationReport,
+        count_severities,
+    )
+
+from src.ui.loading import DEFAULT_PAGED_VIEW_THRESHOLD_MB, EditorLoader
+from src.ui.models import IssueFilterProxyModel, IssueTableModel
 from src.ui.styles import apply_styles
 from src.ui.utils import build_app_icon, resource_path
-from src.ui.widgets import CodeEditor, StatCard
+from src.ui.widgets import CodeEditor, PageNavigator, StatCard
+from src.ui.workers import CancelToken, ValidationWorker
+from src.xsd_manager.infra.result_cache import ResultCache
+
+
+LIVE_VALIDATION_DELAY_MS = 600
 
 
 class MainWindow(QMainWindow):
@@ -45,6 +70,14 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.settings = QSettings()
         self.last_xml_line = 0
+        self._validation_run_id = 0
+        self._validation_token: CancelToken | None = None
+        self._validation_live = False
+        self._live_content_hash: bytes | None = None
+        self._result_cache: ResultCache | None = None
+        if self.settings.value("result_cache", True, bool):
+            self._result_cache = ResultCache()
+        self._thread_pool = QThreadPool.globalInstance()
         self._overlay_close_buttons: dict[QWidget, QPushButton] = {}
         self.setWindowTitle("XSD MANAGER")
         self.setWindowIconText("XSD MANAGER")
@@ -73,6 +106,7 @@ class MainWindow(QMainWindow):
         root.addLayout(body)
 
         self._build_validation_status_widget()
+        self._build_validation_progress_widget()
         self._build_toolbar_actions()
         self.main_split = QSplitter(Qt.Orientation.Horizontal)
         self.main_split.setObjectName("MainSplit")
@@ -121,6 +155,7 @@ class MainWindow(QMainWindow):
         self.xsd_editor.setReadOnly(False)
         self.xsd_editor.set_syntax(True)
         xsd_view_layout.addWidget(xsd_view_title)
+        self.xsd_loader = self._build_editor_loader(xsd_view_layout, self.xsd_editor)
         xsd_view_layout.addWidget(self.xsd_editor, 1)
 
         self.xml_view_panel = self._build_xml_viewer_panel()
@@ -150,8 +185,24 @@ class MainWindow(QMainWindow):
         cards.addWidget(self.card_warnings, 0, 2)
         results_layout.addLayout(cards)
 
-        self.table = QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["Nivel", "Linea", "Columna", "Mensaje"])
+        self.level_filter = QComboBox()
+        self.level_filter.setObjectName("IssueLevelFilter")
+        self.level_filter.addItem("Todos los niveles", None)
+        self.level_filter.addItem("Solo errores", "ERROR")
+        self.level_filter.addItem("Solo avisos", "AVISO")
+        self.level_filter.currentIndexChanged.connect(self._apply_level_filter)
+        filter_row = QHBoxLayout()
+        filter_row.addStretch(1)
+        filter_row.addWidget(self.level_filter)
+        results_layout.addLayout(filter_row)
+
+        self.issue_model = IssueTableModel(self)
+        self.issue_proxy = IssueFilterProxyModel(self)
+        self.issue_proxy.setSourceModel(self.issue_model)
+        self.table = QTableView()
+        self.table.setModel(self.issue_proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
         h_header = self.table.horizontalHeader()
         if h_header is not None:
             h_header.setStretchLastSection(True)
@@ -163,12 +214,12 @@ class MainWindow(QMainWindow):
         v_header = self.table.verticalHeader()
         if v_header is not None:
             v_header.setVisible(False)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
         self.table.setWordWrap(True)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         results_layout.addWidget(self.table, 1)
         results_box.setVisible(False)
         self.results_box = results_box
@@ -184,6 +235,12 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(0, self._apply_default_sidebar_width)
         self._refresh_overlay_close_positions()
 
+        self._live_timer = QTimer(self)
+        self._live_timer.setSingleShot(True)
+        self._live_timer.setInterval(LIVE_VALIDATION_DELAY_MS)
+        self._live_timer.timeout.connect(self._run_live_validation)
+        self.xml_editor.textChanged.connect(self._schedule_live_validation)
+
         self.apply_styles()
         self._load_last_paths()
         self._maybe_auto_validate()
@@ -302,8 +359,20 @@ class MainWindow(QMainWindow):
         open_xml_view.setShortcutContext(Qt.ShortcutContext.ApplicationShortcut)
         self.addAction(open_xml_view)
 
+        self.live_validation_action = QAction("Validación en vivo", self)
+        self.live_validation_action.setCheckable(True)
+        self.live_validation_action.setChecked(self.settings.value("live_validation", True, bool))
+        self.live_validation_action.toggled.connect(self._toggle_live_validation)
+
+        self.result_cache_action = QAction("Reutilizar resultados de validación", self)
+        self.result_cache_action.setCheckable(True)
+        self.result_cache_action.setChecked(self._result_cache is not None)
+        self.result_cache_action.toggled.connect(self._toggle_result_cache)
+
         view_menu = QMenu(self)
         view_menu.addAction(open_xml_view)
+        view_menu.addAction(self.live_validation_action)
+        view_menu.addAction(self.result_cache_action)
         view_btn = QToolButton()
         view_btn.setText("Vista")
         view_btn.setObjectName("TopToolbarViewButton")
@@ -344,6 +413,7 @@ class MainWindow(QMainWindow):
         save_btn.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextOnly)
 
         act_settings = QAction("Ajustes", self)
+        act_settings.triggered.connect(self._edit_paged_view_threshold)
         act_info = QAction("Info", self)
         act_info.triggered.connect(self.show_info)
         settings_btn = QToolButton()
@@ -375,6 +445,7 @@ class MainWindow(QMainWindow):
         right_layout = QHBoxLayout(right_actions)
         right_layout.setContentsMargins(0, 0, 0, 0)
         right_layout.setSpacing(8)
+        right_layout.addWidget(self.validation_progress_widget)
         right_layout.addWidget(self.validation_status_widget)
         right_layout.addWidget(settings_btn)
         right_layout.addWidget(info_btn)
@@ -471,6 +542,34 @@ class MainWindow(QMainWindow):
         status_layout.addWidget(self.validation_chip_warnings)
         status_layout.addWidget(self.validation_chip_ok)
 
+    def _build_validation_progress_widget(self) -> None:
+        self.validation_progress_widget = QWidget()
+        self.validation_progress_widget.setObjectName("ValidationProgressContainer")
+        self.validation_progress_widget.setVisible(False)
+        progress_layout = QHBoxLayout(self.validation_progress_widget)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        progress_layout.setSpacing(6)
+
+        self.validation_progress = QProgressBar()
+        self.validation_progress.setObjectName("ValidationProgress")
+        self.validation_progress.setRange(0, 0)
+        self.validation_progress.setTextVisible(False)
+        self.validation_progress.setFixedSize(90, 6)
+
+        self.validation_cancel_btn = QToolButton()
+        self.validation_cancel_btn.setText("Cancelar")
+        self.validation_cancel_btn.setObjectName("TopToolbarOpenButton")
+        self.validation_cancel_btn.setToolTip("Cancelar la validación en curso")
+        self.validation_cancel_btn.clicked.connect(self.cancel_validation)
+
+        progress_layout.addWidget(self.validation_progress, 0, Qt.AlignmentFlag.AlignVCenter)
+        progress_layout.addWidget(self.validation_cancel_btn)
+
+    def _set_validation_busy(self, busy: bool) -> None:
+        self.validation_progress_widget.setVisible(busy)
+        if busy:
+            self.validation_status_widget.setVisible(False)
+
     def _set_validation_status(self, total: int, errors: int, warnings: int, *, has_run: bool = True) -> None:
         if not has_run:
             self.validation_status_widget.setVisible(False)
@@ -530,11 +629,42 @@ class MainWindow(QMainWindow):
         self.xml_editor.setReadOnly(False)
         self.xml_editor.setEnabled(False)
         self.xml_editor.set_syntax(True)
+        self.xml_loader = self._build_editor_loader(panel_layout, self.xml_editor)
+        self.xml_loader.loaded.connect(self._on_xml_loaded)
 
         panel_layout.addWidget(self.xml_editor, 1)
         self._add_overlay_close_button(panel, self._close_xml_panel)
         return panel
 
+    def _build_editor_loader(self, layout: QVBoxLayout, editor: CodeEditor) -> EditorLoader:
+        navigator = PageNavigator()
+        progress = QProgressBar()
+        progress.setObjectName("EditorLoadProgress")
+        progress.setTextVisible(False)
+        progress.setFixedHeight(4)
+        layout.addWidget(navigator)
+        layout.addWidget(progress)
+        loader = EditorLoader(editor, navigator, progress, self._thread_pool, self)
+        loader.failed.connect(self._on_editor_load_failed)
+        return loader
+
+    def _paged_view_threshold(self) -> int:
+        megabytes = self.settings.value("paged_view_threshold_mb", DEFAULT_PAGED_VIEW_THRESHOLD_MB, int)
+        return max(1, megabytes) * 1024 * 1024
+
+    def _edit_paged_view_threshold(self) -> None:
+        current = self._paged_view_threshold() // (1024 * 1024)
+        value, accepted = QInputDialog.getInt(
+            self,
+            "Ajustes",
+            "Abrir en vista paginada los archivos desde (MB):",
+            current,
+            1,
+            1024 * 1024,
+        )
+        if accepted:
+            self.settings.setValue("paged_view_threshold_mb", value)
+
     def _add_overlay_close_button(self, panel: QWidget, on_close) -> None:
         close_btn = QPushButton("\u00d7", panel)
         close_btn.setObjectName("PanelOverlayClose")
@@ -593,8 +723,9 @@ class MainWindow(QMainWindow):
 
     def _create_new_xml(self) -> None:
         self.xml_input.clear()
+        self.xml_loader.reset()
         self.xml_editor.setEnabled(True)
-        self.xml_editor.setPlainText("")
+        self.xml_editor.set_content("")
         self._set_file_title(self.xml_view_title, "XML", "Nuevo XML")
         self.xml_view_panel.setVisible(True)
         if hasattr(self, "editor_split"):
@@ -630,6 +761,14 @@ class MainWindow(QMainWindow):
         self._save_preferences()
         return True
 
+    def _warn_partial_content(self, title: str) -> None:
+        QMessageBox.warning(
+            self,
+            f"Guardar {title}",
+            "El archivo se está cargando o se muestra en vista paginada; "
+            "el editor no contiene el documento completo y no se puede guardar.",
+        )
+
     def save_xml(self, *, silent: bool = False) -> bool:
         path = self.xml_input.text().strip()
         if not path:
@@ -644,6 +783,9 @@ class MainWindow(QMainWindow):
             self.xml_input.setText(path)
             self._save_preferences()
 
+        if self.xml_loader.is_partial:
+            self._warn_partial_content("XML")
+            return False
         if self._save_editor_content(path, self.xml_editor.toPlainText(), "XML"):
             if not silent:
                 QMessageBox.information(self, "Guardar XML", "Archivo XML guardado correctamente.")
@@ -652,8 +794,9 @@ class MainWindow(QMainWindow):
 
     def _create_new_xsd(self) -> None:
         self.xsd_input.clear()
+        self.xsd_loader.reset()
         self.xsd_editor.setEnabled(True)
-        self.xsd_editor.setPlainText("")
+        self.xsd_editor.set_content("")
         self._set_file_title(self.xsd_view_title, "XSD", "Nuevo XSD")
         self._save_preferences()
 
@@ -671,6 +814,9 @@ class MainWindow(QMainWindow):
             self.xsd_input.setText(path)
             self._save_preferences()
 
+        if self.xsd_loader.is_partial:
+            self._warn_partial_content("XSD")
+            return False
         if self._save_editor_content(path, self.xsd_editor.toPlainText(), "XSD"):
             if not silent:
                 QMessageBox.information(self, "Guardar XSD", "Archivo XSD guardado correctamente.")
@@ -735,20 +881,16 @@ class MainWindow(QMainWindow):
     def _load_xml_into_editor(self, xml_path: str) -> None:
         if not xml_path or not Path(xml_path).exists():
             self._set_file_title(self.xml_view_title, "XML")
-            self.xml_editor.setPlainText("")
+            self.xml_loader.reset()
+            self.xml_editor.set_content("")
             self.xml_editor.setEnabled(False)
             self.xml_view_panel.setVisible(False)
             if hasattr(self, "editor_split"):
                 self.editor_split.setSizes([1, 0])
             return
 
-        try:
-            with open(xml_path, "r", encoding="utf-8", errors="replace") as file:
-                content = file.read()
-        except OSError:
-            content = ""
-        self.xml_editor.setPlainText(content)
         self.xml_editor.setEnabled(True)
+        self.xml_loader.load(xml_path, self._paged_view_threshold())
         self._set_file_title(self.xml_view_title, "XML", xml_path)
         self.xml_view_panel.setVisible(True)
         if hasattr(self, "editor_split"):
@@ -759,19 +901,22 @@ class MainWindow(QMainWindow):
     def _load_xsd_into_editor(self, xsd_path: str) -> None:
         if not xsd_path or not Path(xsd_path).exists():
             self._set_file_title(self.xsd_view_title, "XSD")
-            self.xsd_editor.setPlainText("")
+            self.xsd_loader.reset()
+            self.xsd_editor.set_content("")
             self.xsd_editor.setEnabled(False)
             return
 
-        try:
-            with open(xsd_path, "r", encoding="utf-8", errors="replace") as file:
-                content = file.read()
-        except OSError:
-            content = ""
-        self.xsd_editor.setPlainText(content)
         self.xsd_editor.setEnabled(True)
+        self.xsd_loader.load(xsd_path, self._paged_view_threshold())
         self._set_file_title(self.xsd_view_title, "XSD", xsd_path)
 
+    def _on_xml_loaded(self, _path: str) -> None:
+        self._mark_live_content_current()
+
+    def _on_editor_load_failed(self, path: str, message: str) -> None:
+        title = Path(path).name or path
+        QMessageBox.critical(self, f"Error al abrir {title}", message)
+
     def _set_file_title(self, title_label: QLabel, prefix: str, file_path: str | None = None) -> None:
         if not file_path:
             title_label.setText(prefix)
@@ -780,7 +925,8 @@ class MainWindow(QMainWindow):
         title_label.setText(f"{prefix} - {title}")
 
     def clear_results(self) -> None:
-        self.table.setRowCount(0)
+        self.issue_model.clear()
+        self.xml_editor.set_issue_markers({})
         self.card_total.set_value(0)
         self.card_errors.set_value(0)
         self.card_warnings.set_value(0)
@@ -846,7 +992,6 @@ class MainWindow(QMainWindow):
         return super().eventFilter(watched, event)
 
     def run_validation(self) -> None:
-        self._set_validation_status(0, 0, 0, has_run=True)
         xml_path = self.xml_input.text().strip()
         xsd_path = self.xsd_input.text().strip()
 
@@ -860,33 +1005,118 @@ class MainWindow(QMainWindow):
             self._set_validation_status(0, 0, 0, has_run=False)
             return
 
-        try:
-            issues = validate(xml_path, xsd_path)
-        except RuntimeError as exc:
-            message = str(exc)
-            if message.startswith("XML mal formado:"):
-                line, column = self._extract_line_column_from_error(message)
-                self._save_preferences()
-                self.load_fatal_error("ERROR", line, column, message)
-                return
-            QMessageBox.critical(self, "Error de validacion", message)
-            self._set_validation_status(1, 1, 0, has_run=True)
+        self._start_validation_worker(xml_path, xsd_path)
+
+    def _start_validation_worker(self, xml_path: str, xsd_path: str, content: bytes | None = None) -> None:
+        # A newer run supersedes any stale one still in flight.
+        if self._validation_token is not None:
+            self._validation_token.cancel()
+        self._validation_run_id += 1
+        self._validation_token = CancelToken()
+        self._validation_live = content is not None
+
+        worker = ValidationWorker(
+            self._validation_run_id,
+            xml_path,
+            xsd_path,
+            self._validation_token,
+            content=content,
+            result_cache=self._result_cache,
+        )
+        worker.signals.finished.connect(self._on_validation_finished)
+        worker.signals.failed.connect(self._on_validation_failed)
+        # Live runs happen while typing; keep the toolbar quiet for them.
+        self._set_validation_busy(not self._validation_live)
+        self._thread_pool.start(worker)
+
+    def _toggle_live_validation(self, enabled: bool) -> None:
+        self.settings.setValue("live_validation", enabled)
+        if not enabled:
+            self._live_timer.stop()
+
+    def _toggle_result_cache(self, enabled: bool) -> None:
+        self.settings.setValue("result_cache", enabled)
+        # Workers in flight keep their reference; the connection closes with them.
+        self._result_cache = ResultCache() if enabled else None
+
+    def _live_content_digest(self, content: bytes, xsd_path: str) -> bytes:
+        digest = hashlib.blake2b(content, digest_size=16)
+        digest.update(xsd_path.encode("utf-8"))
+        return digest.digest()
+
+    def _mark_live_content_current(self) -> None:
+        # Content just loaded from disk is validated by the regular file run.
+        self._live_timer.stop()
+        if self.xml_loader.is_partial or self.xml_editor.is_large_document:
+            self._live_content_hash = None
             return
+        content = self.xml_editor.toPlainText().encode("utf-8")
+        self._live_content_hash = self._live_content_digest(content, self.xsd_input.text().strip())
 
-        self.last_xml_line = self._get_last_line_number(xml_path)
-        self._save_preferences()
-        self._set_validation_panel_visible(True)
-        self.load_issues(issues)
+    def _schedule_live_validation(self) -> None:
+        if not self.live_validation_action.isChecked() or not self.xml_editor.isEnabled():
+            return
+        # Text arriving from the loader or a page of a paged view is not an edit.
+        if self.xml_loader.is_partial:
+            return
+        # Re-encoding and hashing the whole buffer on every pause is too slow
+        # for large documents; those are validated from disk on demand.
+        if self.xml_editor.is_large_document:
+            return
+        self._live_timer.start()
 
-    def _get_last_line_number(self, xml_path: str) -> int:
-        try:
-            with open(xml_path, "rb") as file:
-                data = file.read()
-            if not data:
-                return 0
-            return data.count(b"\n") + 1
-        except OSError:
-            return 0
+    def _run_live_validation(self) -> None:
+        xsd_path = self.xsd_input.text().strip()
+        if not self.xml_editor.isEnabled() or not xsd_path or not Path(xsd_path).exists():
+            return
+        if self.xml_loader.is_partial:
+            return
+        content = self.xml_editor.toPlainText().encode("utf-8")
+        digest = self._live_content_digest(content, xsd_path)
+        if digest == self._live_content_hash:
+            return
+        self._live_content_hash = digest
+        xml_path = self.xml_input.text().strip() or "nuevo.xml"
+        self._start_validation_worker(xml_path, xsd_path, content=content)
+
+    def cancel_validation(self) -> None:
+        if self._validation_token is None:
+            return
+        self._validation_token.cancel()
+        self._validation_token = None
+        self._validation_run_id += 1
+        self._set_validation_busy(False)
+        self._set_validation_status(0, 0, 0, has_run=False)
+
+    def _finish_validation_run(self, run_id: int) -> bool:
+        if run_id != self._validation_run_id:
+            return False
+        self._validation_token = None
+        self._set_validation_busy(False)
+        self._set_validation_status(0, 0, 0, has_run=True)
+        return True
+
+    def _on_validation_finished(self, run_id: int, report: ValidationReport, last_line: int) -> None:
+        if not self._finish_validation_run(run_id):
+            return
+        self.last_xml_line = last_line
+        if not self._validation_live:
+            self._save_preferences()
+            self._set_validation_panel_visible(True)
+        self.load_issues(report.issues, truncated=report.truncated)
+
+    def _on_validation_failed(self, run_id: int, message: str) -> None:
+        if not self._finish_validation_run(run_id):
+            return
+        if message.startswith("XML mal formado:"):
+            line, column = self._extract_line_column_from_error(message)
+            if not self._validation_live:
+                self._save_preferences()
+            self.load_fatal_error("ERROR", line, column, message)
+            return
+        if not self._validation_live:
+            QMessageBox.critical(self, "Error de validacion", message)
+        self._set_validation_status(1, 1, 0, has_run=True)
 
     def _extract_line_column_from_error(self, message: str) -> tuple[int, int]:
         match = re.search(r"line\s+(\d+),\s+column\s+(\d+)", message, flags=re.IGNORECASE)
@@ -895,90 +1125,53 @@ class MainWindow(QMainWindow):
         return int(match.group(1)), int(match.group(2))
 
     def load_fatal_error(self, level: str, line: int, column: int, message: str) -> None:
-        self._set_validation_panel_visible(True)
-        self.table.setRowCount(0)
+        if not self._validation_live:
+            self._set_validation_panel_visible(True)
+        self.xml_editor.set_issue_markers({line: level} if line else {})
         self.card_total.set_value(1)
         self.card_errors.set_value(1 if level == "ERROR" else 0)
         self.card_warnings.set_value(1 if level == "AVISO" else 0)
         self._set_validation_status(1, 1 if level == "ERROR" else 0, 1 if level == "AVISO" else 0)
 
-        self.table.insertRow(0)
-        level_item = QTableWidgetItem(level)
-        line_item = QTableWidgetItem(str(line))
-        col_item = QTableWidgetItem(str(column))
-        msg_item = QTableWidgetItem(message)
-
-        color = QColor("#ff6b6b") if level == "ERROR" else QColor("#ffcc66")
-        brush = QBrush(color)
-        for item in (level_item, line_item, col_item, msg_item):
-            item.setForeground(brush)
-            item.setData(Qt.ItemDataRole.ForegroundRole, brush)
-
-        self.table.setItem(0, 0, level_item)
-        self.table.setItem(0, 1, line_item)
-        self.table.setItem(0, 2, col_item)
-        self.table.setItem(0, 3, msg_item)
+        issue = ValidationIssue(line=line, column=column, message=message, severity=Severity(level))
+        self.issue_model.set_issues([issue])
         self.table.resizeColumnsToContents()
 
-    def load_issues(self, issues: list[ValidationIssue]) -> None:
+    def load_issues(self, issues: IssueSequence, truncated: bool = False) -> None:
         self.results_box.setVisible(True)
-        self.table.setRowCount(0)
-
-        errors = [i for i in issues if i.level == "ERROR"]
-        warnings = [i for i in issues if i.level == "AVISO"]
-
-        self.card_total.set_value(len(issues))
-        self.card_errors.set_value(len(errors))
-        self.card_warnings.set_value(len(warnings))
-
-        for issue in issues:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            level_item = QTableWidgetItem(issue.level)
-            line_item = QTableWidgetItem(str(issue.line))
-            col_item = QTableWidgetItem(str(issue.column))
-            msg_item = QTableWidgetItem(issue.message)
-
-            if issue.level == "ERROR":
-                color = QColor("#ff6b6b")
-            else:
-                color = QColor("#ffcc66")
-
-            for item in (level_item, line_item, col_item, msg_item):
-                item.setForeground(QBrush(color))
-                item.setData(Qt.ItemDataRole.ForegroundRole, QBrush(color))
-
-            self.table.setItem(row, 0, level_item)
-            self.table.setItem(row, 1, line_item)
-            self.table.setItem(row, 2, col_item)
-            self.table.setItem(row, 3, msg_item)
-
-        if not issues:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            ok_items = (
-                QTableWidgetItem("OK"),
-                QTableWidgetItem(str(self.last_xml_line)),
-                QTableWidgetItem("N/A"),
-                QTableWidgetItem("XML valido sin errores ni avisos."),
-            )
-            ok_brush = QBrush(QColor("#4ade80"))
-            for item in ok_items:
-                item.setForeground(ok_brush)
-                item.setData(Qt.ItemDataRole.ForegroundRole, ok_brush)
-                item_font = item.font()
-                item_font.setBold(True)
-                item.setFont(item_font)
-
-            self.table.setItem(row, 0, ok_items[0])
-            self.table.setItem(row, 1, ok_items[1])
-            self.table.setItem(row, 2, ok_items[2])
-            self.table.setItem(row, 3, ok_items[3])
-        self._set_validation_status(len(issues), len(errors), len(warnings))
+
+        counts = count_severities(issues)
+        errors = counts[Severity.ERROR]
+        warnings = counts[Severity.WARNING]
+
+        # A truncated run stopped at the issue limit; more issues may follow.
+        self.card_total.set_value(len(issues), at_least=truncated)
+        self.card_errors.set_value(errors)
+        self.card_warnings.set_value(warnings)
+
+        self.xml_editor.set_issue_markers(self._issue_markers(issues))
+        if issues:
+            self.issue_model.set_issues(issues)
+        else:
+            self.issue_model.set_ok_row(self.last_xml_line, "XML valido sin errores ni avisos.")
+        self._set_validation_status(len(issues), errors, warnings)
         self._refresh_message_column()
 
+    def _issue_markers(self, issues: IssueSequence) -> dict[int, str]:
+        markers: dict[int, str] = {}
+        if isinstance(issues, IssueColumns):
+            entries = issues.line_severities()
+        else:
+            entries = ((issue.line, issue.severity) for issue in issues)
+        for line, severity in entries:
+            # Errors win over warnings reported on the same line.
+            if markers.get(line) != "ERROR":
+                markers[line] = severity.value
+        return markers
+
+    def _apply_level_filter(self, _index: int = 0) -> None:
+        self.issue_proxy.set_level(self.level_filter.currentData())
+
     def _refresh_message_column(self) -> None:
         h_header = self.table.horizontalHeader()
         if h_header is None:
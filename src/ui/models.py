@@ -0,0 +1,152 @@
+"""Item models backing the results views."""
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt6.QtGui import QBrush, QColor, QFont
+
+try:
+    from src.validar_xml import IssueColumns, IssueSequence
+except ImportError:
+    from validar_xml import IssueColumns, IssueSequence
+
+
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
+LEVEL_BRUSHES = {
+    "ERROR": QBrush(QColor("#ff6b6b")),
+    "AVISO": QBrush(QColor("#ffcc66")),
+    "OK": QBrush(QColor("#4ade80")),
+}
+LEVEL_RANK = {"ERROR": 0, "AVISO": 1, "INFO": 2, "OK": 3}
+
+
+class IssueTableModel(QAbstractTableModel):
+    """Read-only model over a list of ValidationIssue.
+
+    Cells are produced on demand in ``data()``, so only the rows the view
+    actually paints cost anything; brushes are shared across all rows. When
+    the list is empty a single summary row ("OK") can be shown instead.
+    IssueColumns are read column by column, without building an issue
+    object per cell.
+    """
+
+    HEADERS = ("Nivel", "Linea", "Columna", "Mensaje")
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._issues: IssueSequence = []
+        self._ok_row: tuple[str, str, str, str] | None = None
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+
+    def set_issues(self, issues: IssueSequence) -> None:
+        self.beginResetModel()
+        self._issues = issues
+        self._ok_row = None
+        self.endResetModel()
+
+    def set_ok_row(self, last_line: int, message: str) -> None:
+        self.beginResetModel()
+        self._issues = []
+        self._ok_row = ("OK", str(last_line), "N/A", message)
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._issues = []
+        self._ok_row = None
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        if parent.isValid():
+            return 0
+        if self._ok_row is not None:
+            return 1
+        return len(self._issues)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):  # type: ignore[override]
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def level_at(self, row: int) -> str:
+        if self._ok_row is not None:
+            return "OK"
+        if isinstance(self._issues, IssueColumns):
+            return self._issues.severity_at(row).value
+        return self._issues[row].level
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):  # type: ignore[override]
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if self._ok_row is not None:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._ok_row[column]
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return LEVEL_BRUSHES["OK"]
+            if role == Qt.ItemDataRole.FontRole:
+                return self._bold_font
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return self.level_at(row)
+            if column == 1:
+                return str(self._line_at(row))
+            if column == 2:
+                return str(self._column_at(row))
+            return self._message_at(row)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return LEVEL_BRUSHES.get(self.level_at(row), LEVEL_BRUSHES["AVISO"])
+        if role == SORT_ROLE:
+            if column == 0:
+                return LEVEL_RANK.get(self.level_at(row), len(LEVEL_RANK))
+            if column == 1:
+                return self._line_at(row)
+            if column == 2:
+                return self._column_at(row)
+            return self._message_at(row)
+        return None
+
+    def _line_at(self, row: int) -> int:
+        if isinstance(self._issues, IssueColumns):
+            return self._issues.line_at(row)
+        return self._issues[row].line
+
+    def _column_at(self, row: int) -> int:
+        if isinstance(self._issues, IssueColumns):
+            return self._issues.column_at(row)
+        return self._issues[row].column
+
+    def _message_at(self, row: int) -> str:
+        if isinstance(self._issues, IssueColumns):
+            return self._issues.message_at(row)
+        return self._issues[row].message
+
+
+class IssueFilterProxyModel(QSortFilterProxyModel):
+    """Sort by raw values and optionally keep only one severity level."""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._level: str | None = None
+        self.setSortRole(SORT_ROLE)
+
+    def set_level(self, level: str | None) -> None:
+        if level == self._level:
+            return
+        self._level = level
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:  # type: ignore[override]
+        if self._level is None:
+            return True
+        model = self.sourceModel()
+        if not isinstance(model, IssueTableModel):
+            return True
+        level = model.level_at(source_row)
+        return level == "OK" or level == self._level
@@ -1,8 +1,42 @@
 """Reusable UI widgets for the application."""
 
-from PyQt6.QtCore import Qt, QRect, QSize, QRegularExpression
-from PyQt6.QtGui import QColor, QFont, QPainter, QTextCharFormat, QTextFormat, QSyntaxHighlighter
-from PyQt6.QtWidgets import QFrame, QPlainTextEdit, QLabel, QTextEdit, QVBoxLayout, QWidget
+import time
+from collections import deque
+
+from PyQt6.QtCore import Qt, QObject, QPoint, QRect, QSize, QRegularExpression, QTimer, pyqtSignal
+from PyQt6.QtGui import (
+    QColor,
+    QFont,
+    QPainter,
+    QSyntaxHighlighter,
+    QTextBlock,
+    QTextCharFormat,
+    QTextCursor,
+    QTextFormat,
+    QTextLayout,
+)
+from PyQt6.QtWidgets import (
+    QFrame,
+    QHBoxLayout,
+    QLabel,
+    QPlainTextEdit,
+    QSpinBox,
+    QTextEdit,
+    QToolButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+# Above this many characters highlighting switches to viewport-only mode,
+# and above the second threshold it is turned off altogether.
+LARGE_DOCUMENT_CHARS = 2_000_000
+HUGE_DOCUMENT_CHARS = 50_000_000
+
+MARKER_COLORS = {
+    "ERROR": QColor("#f14c4c"),
+    "AVISO": QColor("#cca700"),
+}
 
 
 class StatCard(QFrame):
@@ -24,13 +58,68 @@ class StatCard(QFrame):
         layout.addWidget(self.title_label)
         layout.addWidget(self.value_label)
 
-    def set_value(self, value: int) -> None:
-        self.value_label.setText(str(value))
+    def set_value(self, value: int, at_least: bool = False) -> None:
+        """Show ``value``; ``at_least`` marks it as a lower bound ("15+")."""
+        self.value_label.setText(f"{value}+" if at_least else str(value))
 
 
-class XmlSyntaxHighlighter(QSyntaxHighlighter):
-    def __init__(self, parent) -> None:
+class PageNavigator(QFrame):
+    """Previous/next buttons, a page label and a go-to-line box for paged views."""
+
+    page_requested = pyqtSignal(int)
+    line_requested = pyqtSignal(int)
+
+    def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
+        self.setObjectName("PageNavigator")
+        self._index = 0
+        self._count = 0
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.prev_button = QToolButton()
+        self.prev_button.setText("\u2039")
+        self.prev_button.setToolTip("Página anterior")
+        self.prev_button.clicked.connect(lambda: self.page_requested.emit(self._index - 1))
+
+        self.next_button = QToolButton()
+        self.next_button.setText("\u203a")
+        self.next_button.setToolTip("Página siguiente")
+        self.next_button.clicked.connect(lambda: self.page_requested.emit(self._index + 1))
+
+        self.page_label = QLabel()
+        self.page_label.setObjectName("PageNavigatorLabel")
+
+        self.line_box = QSpinBox()
+        self.line_box.setObjectName("PageNavigatorLine")
+        self.line_box.setPrefix("Línea ")
+        self.line_box.setMinimum(1)
+        self.line_box.setKeyboardTracking(False)
+        self.line_box.editingFinished.connect(lambda: self.line_requested.emit(self.line_box.value()))
+
+        layout.addWidget(self.prev_button)
+        layout.addWidget(self.page_label)
+        layout.addWidget(self.next_button)
+        layout.addStretch(1)
+        layout.addWidget(self.line_box)
+
+    def set_page(self, index: int, count: int, first_line: int, last_line: int, max_line: int) -> None:
+        self._index = index
+        self._count = count
+        self.prev_button.setEnabled(index > 0)
+        self.next_button.setEnabled(index + 1 < count)
+        self.page_label.setText(
+            f"Vista paginada (solo lectura) · página {index + 1} de {count} · líneas {first_line}-{last_line}"
+        )
+        self.line_box.setMaximum(max(1, max_line))
+
+
+class XmlHighlightRules:
+    """Formats and regex rules for XML, shared by the highlighter implementations."""
+
+    def __init__(self) -> None:
         self._setup_formats()
         self._setup_rules()
 
@@ -63,20 +152,123 @@ class XmlSyntaxHighlighter(QSyntaxHighlighter):
             (QRegularExpression(r"([\"']).*?\1"), self.attribute_value_format),
             (QRegularExpression(r"</?[A-Za-z_:][A-Za-z0-9._:-]*"), self.tag_name_format),
         ]
+        # Equal signs between attribute names and values, applied last.
+        self.equal_expression = QRegularExpression(r"=")
 
-    def highlightBlock(self, text: str) -> None:  # type: ignore[override]
+    def ranges(self, text: str) -> list[tuple[int, int, QTextCharFormat]]:
+        result = []
         for expression, color_format in self.rules:
             it = expression.globalMatch(text)
             while it.hasNext():
                 match = it.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), color_format)
+                result.append((match.capturedStart(), match.capturedLength(), color_format))
 
-        # Highlight equal signs between attribute names and values
-        equal_expression = QRegularExpression(r"=")
-        it_equal = equal_expression.globalMatch(text)
+        it_equal = self.equal_expression.globalMatch(text)
         while it_equal.hasNext():
             match = it_equal.next()
-            self.setFormat(match.capturedStart(), match.capturedLength(), self.attribute_equal_format)
+            result.append((match.capturedStart(), match.capturedLength(), self.attribute_equal_format))
+        return result
+
+
+class XmlSyntaxHighlighter(QSyntaxHighlighter):
+    def __init__(self, parent) -> None:
+        super().__init__(parent)
+        self.rules = XmlHighlightRules()
+
+    def highlightBlock(self, text: str) -> None:  # type: ignore[override]
+        for start, length, color_format in self.rules.ranges(text):
+            self.setFormat(start, length, color_format)
+
+
+class ViewportHighlighter(QObject):
+    """Highlight only the blocks around the viewport, in short idle-time slices.
+
+    Used for large documents instead of QSyntaxHighlighter, which formats
+    every block as soon as the text is set. A block is considered up to date
+    when its user state equals its revision, so edits are picked up without
+    tracking positions.
+    """
+
+    MARGIN_BLOCKS = 40
+    SLICE_MS = 8
+
+    def __init__(self, editor: "CodeEditor") -> None:
+        super().__init__(editor)
+        self.editor = editor
+        self.rules = XmlHighlightRules()
+        self._pending: deque[QTextBlock] = deque()
+        self._applying = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._process_slice)
+
+        editor.updateRequest.connect(self.schedule)
+        editor.document().contentsChange.connect(self._on_contents_change)
+
+    def detach(self) -> None:
+        self._timer.stop()
+        self._pending.clear()
+        self.editor.updateRequest.disconnect(self.schedule)
+        self.editor.document().contentsChange.disconnect(self._on_contents_change)
+        self.setParent(None)
+
+    def _on_contents_change(self, _position: int, _removed: int, _added: int) -> None:
+        if not self._applying:
+            self.schedule()
+
+    def schedule(self, *_args) -> None:
+        first = self.editor.firstVisibleBlock()
+        if not first.isValid():
+            return
+        viewport = self.editor.viewport()
+        height = viewport.height() if viewport is not None else 0
+        last = self.editor.cursorForPosition(QPoint(0, height)).block()
+        last_number = last.blockNumber() if last.isValid() else first.blockNumber()
+
+        block = first
+        for _ in range(self.MARGIN_BLOCKS):
+            previous = block.previous()
+            if not previous.isValid():
+                break
+            block = previous
+
+        self._pending.clear()
+        stop = last_number + self.MARGIN_BLOCKS
+        while block.isValid() and block.blockNumber() <= stop:
+            if block.userState() != block.revision():
+                self._pending.append(block)
+            block = block.next()
+        if self._pending and not self._timer.isActive():
+            self._timer.start()
+
+    def _process_slice(self) -> None:
+        deadline = time.perf_counter() + self.SLICE_MS / 1000.0
+        document = self.editor.document()
+        self._applying = True
+        try:
+            while self._pending and time.perf_counter() < deadline:
+                block = self._pending.popleft()
+                if not block.isValid() or block.userState() == block.revision():
+                    continue
+                self._apply(block)
+                document.markContentsDirty(block.position(), block.length())
+        finally:
+            self._applying = False
+        if not self._pending:
+            self._timer.stop()
+
+    def _apply(self, block: QTextBlock) -> None:
+        formats = []
+        for start, length, color_format in self.rules.ranges(block.text()):
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = length
+            format_range.format = color_format
+            formats.append(format_range)
+        layout = block.layout()
+        if layout is not None:
+            layout.setFormats(formats)
+        block.setUserState(block.revision())
 
 
 class LineNumberArea(QWidget):
@@ -95,6 +287,7 @@ class LineNumberArea(QWidget):
 class CodeEditor(QPlainTextEdit):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
+        self._line_offset = 0
         self.line_number_area = LineNumberArea(self)
         self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
 
@@ -102,21 +295,81 @@ class CodeEditor(QPlainTextEdit):
         self.updateRequest.connect(self.update_line_number_area)
         self.cursorPositionChanged.connect(self.highlight_current_line)
         self.syntax_highlighter: XmlSyntaxHighlighter | None = None
+        self.viewport_highlighter: ViewportHighlighter | None = None
+        self._syntax_enabled = False
+        self._document_chars = 0
+        self._issue_markers: dict[int, str] = {}
 
         self.update_line_number_area_width(0)
         self.highlight_current_line()
 
+    @property
+    def is_large_document(self) -> bool:
+        return self._document_chars >= LARGE_DOCUMENT_CHARS
+
     def set_syntax(self, enabled: bool) -> None:
-        if enabled:
+        self._syntax_enabled = enabled
+        self._apply_highlighting_mode()
+
+    def set_content(self, text: str) -> None:
+        """Replace the text, picking the highlighting mode from its size first.
+
+        The mode must change before setPlainText, otherwise a full-document
+        highlighter would still format every block of a huge text.
+        """
+        self._document_chars = len(text)
+        self._apply_highlighting_mode()
+        self.setPlainText(text)
+
+    def begin_load(self, expected_chars: int) -> None:
+        """Clear the editor before receiving text in chunks through ``append_text``.
+
+        Undo is disabled while loading, otherwise every chunk would be kept a
+        second time in the undo stack.
+        """
+        self._document_chars = expected_chars
+        self._apply_highlighting_mode()
+        self.setUndoRedoEnabled(False)
+        self.setPlainText("")
+
+    def append_text(self, text: str) -> None:
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+
+    def end_load(self) -> None:
+        self.setUndoRedoEnabled(True)
+
+    def set_line_offset(self, offset: int) -> None:
+        """Number the first block as line ``offset + 1``, e.g. when showing one page of a file."""
+        self._line_offset = offset
+        self.update_line_number_area_width()
+
+    def _apply_highlighting_mode(self) -> None:
+        full = self._syntax_enabled and self._document_chars < LARGE_DOCUMENT_CHARS
+        lazy = self._syntax_enabled and LARGE_DOCUMENT_CHARS <= self._document_chars < HUGE_DOCUMENT_CHARS
+
+        if full:
             if self.syntax_highlighter is None:
                 self.syntax_highlighter = XmlSyntaxHighlighter(self.document())
-        else:
-            if self.syntax_highlighter is not None:
-                self.syntax_highlighter.setDocument(None)
+        elif self.syntax_highlighter is not None:
+            self.syntax_highlighter.setDocument(None)
             self.syntax_highlighter = None
 
+        if lazy:
+            if self.viewport_highlighter is None:
+                self.viewport_highlighter = ViewportHighlighter(self)
+        elif self.viewport_highlighter is not None:
+            self.viewport_highlighter.detach()
+            self.viewport_highlighter = None
+
+    def set_issue_markers(self, markers: dict[int, str]) -> None:
+        """Mark 1-based line numbers in the gutter with an issue level ("ERROR"/"AVISO")."""
+        self._issue_markers = markers
+        self.line_number_area.update()
+
     def line_number_area_width(self) -> int:
-        digits = len(str(max(1, self.blockCount())))
+        digits = len(str(max(1, self.blockCount() + self._line_offset)))
         return 10 + self.fontMetrics().horizontalAdvance("0") * digits + 8
 
     def update_line_number_area_width(self, _=0) -> None:
@@ -162,7 +415,8 @@ class CodeEditor(QPlainTextEdit):
 
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible():
-                line = str(block_number + 1)
+                line_number = block_number + 1 + self._line_offset
+                line = str(line_number)
                 if block_number == self.textCursor().blockNumber():
                     painter.fillRect(
                         0,
@@ -175,6 +429,16 @@ class CodeEditor(QPlainTextEdit):
                 else:
                     painter.setPen(QColor("#7f7f7f"))
 
+                marker = self._issue_markers.get(line_number)
+                if marker is not None and bottom >= event.rect().top():
+                    painter.fillRect(
+                        0,
+                        top,
+                        3,
+                        self.fontMetrics().height(),
+                        MARKER_COLORS.get(marker, MARKER_COLORS["ERROR"]),
+                    )
+
                 if bottom >= event.rect().top():
                     painter.drawText(
                         0,
@@ -0,0 +1,192 @@
+"""Background workers that keep long operations off the GUI thread."""
+
+import codecs
+import os
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+try:
+    from src.validar_xml import validate_report
+    from src.xsd_manager.infra.files import MappedFile, PagedFile
+    from src.xsd_manager.infra.result_cache import ResultCache
+except ImportError:
+    from validar_xml import validate_report
+    from xsd_manager.infra.files import MappedFile, PagedFile
+    from xsd_manager.infra.result_cache import ResultCache
+
+
+# The table stays responsive well beyond this, but holding more issues than
+# anyone will scroll through only costs validation time and memory.
+MAX_UI_ISSUES = 200_000
+LOAD_CHUNK_BYTES = 1024 * 1024
+MAX_PENDING_CHUNKS = 4
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class ValidationSignals(QObject):
+    finished = pyqtSignal(int, object, int)
+    failed = pyqtSignal(int, str)
+
+
+class ValidationWorker(QRunnable):
+    """Validate an XML/XSD pair on a pool thread and report back through signals.
+
+    Every run carries the id it was started with so the window can ignore
+    results from runs that were cancelled or superseded meanwhile. lxml cannot
+    be interrupted mid-validation, so cancellation only suppresses the result.
+    When ``content`` is given it is validated instead of the file on disk.
+    ``finished`` carries the ValidationReport, cut at ``MAX_UI_ISSUES``.
+    With a ``result_cache`` unchanged files are not validated again.
+    """
+
+    def __init__(
+        self,
+        run_id: int,
+        xml_path: str,
+        xsd_path: str,
+        token: CancelToken,
+        content: bytes | None = None,
+        result_cache: ResultCache | None = None,
+    ) -> None:
+        super().__init__()
+        self.run_id = run_id
+        self.xml_path = xml_path
+        self.xsd_path = xsd_path
+        self.token = token
+        self.content = content
+        self.result_cache = result_cache
+        self.signals = ValidationSignals()
+
+    def run(self) -> None:
+        if self.token.cancelled:
+            return
+        try:
+            if self.content is not None:
+                report = validate_report(
+                    self.xml_path,
+                    self.xsd_path,
+                    xml_content=self.content,
+                    columnar=True,
+                    max_issues=MAX_UI_ISSUES,
+                    result_cache=self.result_cache,
+                )
+                last_line = self.content.count(b"\n") + 1 if self.content else 0
+            else:
+                # Hash, parse and count lines from one mapping so the file is read once.
+                with MappedFile(self.xml_path) as mapped:
+                    report = validate_report(
+                        self.xml_path,
+                        self.xsd_path,
+                        xml_content=mapped.buffer(),
+                        content_is_file=True,
+                        columnar=True,
+                        max_issues=MAX_UI_ISSUES,
+                        result_cache=self.result_cache,
+                    )
+                    last_line = mapped.line_count()
+        except OSError as exc:
+            if not self.token.cancelled:
+                self.signals.failed.emit(self.run_id, f"XML mal formateado o inaccesible: {exc}")
+            return
+        except RuntimeError as exc:
+            if not self.token.cancelled:
+                self.signals.failed.emit(self.run_id, str(exc))
+            return
+        if not self.token.cancelled:
+            self.signals.finished.emit(self.run_id, report, last_line)
+
+
+class FileLoadSignals(QObject):
+    progress = pyqtSignal(int, int, int)
+    chunk = pyqtSignal(int, str)
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class FileLoadWorker(QRunnable):
+    """Read a file for an editor on a pool thread.
+
+    Files below ``paged_threshold`` bytes are decoded incrementally and sent
+    as text chunks; ``finished`` then carries None. At most
+    ``MAX_PENDING_CHUNKS`` chunks are in flight: the receiver must call
+    ``chunk_consumed`` after appending each one, so a slow GUI throttles the
+    reader instead of queueing the whole file in memory. Larger files are only
+    indexed, and ``finished`` carries a PagedFile the receiver must close.
+    """
+
+    def __init__(self, run_id: int, path: str, token: CancelToken, paged_threshold: int) -> None:
+        super().__init__()
+        self.run_id = run_id
+        self.path = path
+        self.token = token
+        self.paged_threshold = paged_threshold
+        self.signals = FileLoadSignals()
+        self._credits = threading.Semaphore(MAX_PENDING_CHUNKS)
+
+    def chunk_consumed(self) -> None:
+        self._credits.release()
+
+    def run(self) -> None:
+        if self.token.cancelled:
+            return
+        try:
+            with open(self.path, "rb") as file:
+                total = os.fstat(file.fileno()).st_size
+                if total >= self.paged_threshold:
+                    paged = self._index()
+                else:
+                    paged = None
+                    self._stream(file, total)
+        except OSError as exc:
+            if not self.token.cancelled:
+                self.signals.failed.emit(self.run_id, f"No se pudo leer el archivo: {exc}")
+            return
+        if self.token.cancelled:
+            if paged is not None:
+                paged.close()
+            return
+        self.signals.finished.emit(self.run_id, paged)
+
+    def _stream(self, file, total: int) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        loaded = 0
+        while True:
+            data = file.read(LOAD_CHUNK_BYTES)
+            text = decoder.decode(data, final=not data)
+            loaded += len(data)
+            if text:
+                if not self._wait_for_credit():
+                    return
+                self.signals.chunk.emit(self.run_id, text)
+            self.signals.progress.emit(self.run_id, loaded, total)
+            if not data:
+                return
+
+    def _wait_for_credit(self) -> bool:
+        while not self._credits.acquire(timeout=0.1):
+            if self.token.cancelled:
+                return False
+        return not self.token.cancelled
+
+    def _index(self) -> PagedFile | None:
+        paged = PagedFile(self.path)
+        completed = paged.build_index(
+            progress=lambda done, size: self.signals.progress.emit(self.run_id, done, size),
+            cancelled=lambda: self.token.cancelled,
+        )
+        if not completed:
+            paged.close()
+            return None
+        return paged
@@ -1,51 +1,151 @@
 from __future__ import annotations
 
 import argparse
+import cProfile
+import glob
+import signal
 import sys
+import threading
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
 
 try:
-    from xsd_manager.services.validation.use_case import ValidationUseCase
+    from xsd_manager.infra.reporting import REPORT_WRITERS, ReportWriter, create_report_writer
+    from xsd_manager.infra.result_cache import DEFAULT_MAX_BYTES, ResultCache
+    from xsd_manager.services.validation.hooks import ValidationHook
+    from xsd_manager.services.validation.use_case import ValidationUseCase, failure_message
+    from xsd_manager.services.validation.server import (
+        DEFAULT_MAX_BODY_BYTES,
+        DEFAULT_MAX_PENDING,
+        SchemaRegistry,
+        ValidationService,
+        create_server,
+    )
+    from xsd_manager.services.validation.watch import (
+        DEFAULT_POLL_INTERVAL,
+        DEFAULT_SETTLE_SECONDS,
+        FolderWatcher,
+        WatchConfig,
+        WatchStats,
+    )
     from xsd_manager.services.validators.base import ValidatorError
+    from xsd_manager.services.validators.classification import MessageClassifier
+    from xsd_manager.services.validators.schematron_validator import SchematronValidator, get_schematron_cache
     from xsd_manager.services.validators.xsd_validator import (
         ERROR_KEYS,
         classify_message as _classify_message,
         WARNING_KEYS,
         XsdValidator,
     )
-    from xsd_manager.domain.models import ValidationIssue, ValidationRequest
+    from xsd_manager.domain.models import (
+        IssueColumns,
+        IssueSequence,
+        Severity,
+        ValidationIssue,
+        ValidationMetadata,
+        ValidationReport,
+        ValidationRequest,
+        XmlContent,
+        count_severities,
+    )
 except ModuleNotFoundError:
-    from src.xsd_manager.services.validation.use_case import ValidationUseCase
+    from src.xsd_manager.infra.reporting import REPORT_WRITERS, ReportWriter, create_report_writer
+    from src.xsd_manager.infra.result_cache import DEFAULT_MAX_BYTES, ResultCache
+    from src.xsd_manager.services.validation.hooks import ValidationHook
+    from src.xsd_manager.services.validation.use_case import ValidationUseCase, failure_message
+    from src.xsd_manager.services.validation.server import (
+        DEFAULT_MAX_BODY_BYTES,
+        DEFAULT_MAX_PENDING,
+        SchemaRegistry,
+        ValidationService,
+        create_server,
+    )
+    from src.xsd_manager.services.validation.watch import (
+        DEFAULT_POLL_INTERVAL,
+        DEFAULT_SETTLE_SECONDS,
+        FolderWatcher,
+        WatchConfig,
+        WatchStats,
+    )
     from src.xsd_manager.services.validators.base import ValidatorError
+    from src.xsd_manager.services.validators.classification import MessageClassifier
+    from src.xsd_manager.services.validators.schematron_validator import SchematronValidator, get_schematron_cache
     from src.xsd_manager.services.validators.xsd_validator import (
         ERROR_KEYS,
         classify_message as _classify_message,
         WARNING_KEYS,
         XsdValidator,
     )
-    from src.xsd_manager.domain.models import ValidationIssue, ValidationRequest
+    from src.xsd_manager.domain.models import (
+        IssueColumns,
+        IssueSequence,
+        Severity,
+        ValidationIssue,
+        ValidationMetadata,
+        ValidationReport,
+        ValidationRequest,
+        XmlContent,
+        count_severities,
+    )
 
 
 def classify_message(message: str) -> str:
     return _classify_message(message).value
 
 
-def validate(xml_path: str, xsd_path: str) -> list[ValidationIssue]:
+def validate_report(
+    xml_path: str,
+    xsd_path: str,
+    *,
+    extra_xsd_paths: Sequence[str] = (),
+    schematron_paths: Sequence[str] = (),
+    streaming: bool = False,
+    record_tag: Optional[str] = None,
+    xml_content: Optional[XmlContent] = None,
+    content_is_file: bool = False,
+    classifier: Optional[MessageClassifier] = None,
+    columnar: bool = False,
+    fail_fast: bool = False,
+    max_issues: Optional[int] = None,
+    max_issues_per_code: Optional[int] = None,
+    result_cache: Optional[ResultCache] = None,
+    count_elements: bool = False,
+    hooks: Sequence[ValidationHook] = (),
+) -> ValidationReport:
     request = ValidationRequest(
         xml_path=Path(xml_path),
-        xsd_paths=[Path(xsd_path)],
+        xsd_paths=[Path(p) for p in (xsd_path, *extra_xsd_paths)],
+        streaming=streaming,
+        record_tag=record_tag,
+        xml_content=xml_content,
+        content_is_file=content_is_file,
+        columnar=columnar,
+        fail_fast=fail_fast,
+        max_issues=max_issues,
+        max_issues_per_code=max_issues_per_code,
+        count_elements=count_elements,
+        schematron_paths=[Path(p) for p in schematron_paths],
+    )
+    use_case = ValidationUseCase(
+        validators=[XsdValidator(classifier=classifier), SchematronValidator()],
+        result_cache=result_cache,
+        hooks=hooks,
     )
-    use_case = ValidationUseCase(validators=[XsdValidator()])
 
     try:
-        report = use_case.run(request)
+        return use_case.run(request)
     except ValidatorError as exc:
         raise RuntimeError(str(exc)) from exc
 
-    return report.issues
 
+def validate(xml_path: str, xsd_path: str, **options) -> IssueSequence:
+    """Like validate_report(), returning only the issues."""
+    return validate_report(xml_path, xsd_path, **options).issues
 
-def print_report(issues: list[ValidationIssue]) -> int:
+
+def print_report(issues: IssueSequence, truncated: bool = False) -> int:
     if not issues:
         print("OK: El XML cumple el XSD sin errores ni avisos.")
         return 0
@@ -63,24 +163,733 @@ def print_report(issues: list[ValidationIssue]) -> int:
         for w in warnings:
             print(f"  - Linea {w.line}, Columna {w.column}: {w.message}")
 
+    if truncated:
+        print("Listado incompleto: la validacion se detuvo al alcanzar el limite de incidencias.")
+
     return 2 if errors else 1
 
 
+XML_SUFFIXES = (".xml",)
+
+
+@dataclass
+class BatchResult:
+    xml_path: Path
+    issues: IssueSequence = field(default_factory=list)
+    failure: Optional[str] = None
+    truncated: bool = False
+    elapsed_ms: Optional[float] = None
+    metadata: Optional[ValidationMetadata] = None
+    counts: dict[Severity, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.counts = count_severities(self.issues)
+
+    @classmethod
+    def from_report(cls, xml_path: Path, report: ValidationReport) -> "BatchResult":
+        metadata = report.metadata
+        elapsed_ms = metadata.elapsed_ms if metadata is not None else None
+        failure = failure_message(report)
+        if failure is not None:
+            return cls(xml_path=xml_path, failure=failure, elapsed_ms=elapsed_ms, metadata=metadata)
+        return cls(
+            xml_path=xml_path,
+            issues=report.issues,
+            truncated=report.truncated,
+            elapsed_ms=elapsed_ms,
+            metadata=metadata,
+        )
+
+    @property
+    def errors(self) -> int:
+        return self.counts[Severity.ERROR]
+
+    @property
+    def warnings(self) -> int:
+        return self.counts[Severity.WARNING]
+
+
+def _iter_directory(directory: Path, recursive: bool) -> Iterator[Path]:
+    candidates = directory.rglob("*") if recursive else directory.iterdir()
+    for candidate in sorted(candidates):
+        if candidate.is_file() and candidate.suffix.lower() in XML_SUFFIXES:
+            yield candidate
+
+
+def _read_manifest(manifest: Path) -> Iterator[str]:
+    with open(manifest, "r", encoding="utf-8") as file:
+        for raw in file:
+            line = raw.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def collect_xml_paths(
+    inputs: Iterable[str],
+    manifest: Optional[str] = None,
+    recursive: bool = False,
+) -> list[Path]:
+    """Expand directories, glob patterns and manifest entries into unique XML paths."""
+    entries = list(inputs)
+    if manifest:
+        base = Path(manifest).parent
+        for line in _read_manifest(Path(manifest)):
+            entry = Path(line)
+            entries.append(str(entry if entry.is_absolute() else base / entry))
+
+    seen: dict[Path, None] = {}
+    for entry in entries:
+        path = Path(entry)
+        if path.is_dir():
+            matches: Iterable[Path] = _iter_directory(path, recursive)
+        elif glob.has_magic(entry):
+            matches = (Path(m) for m in sorted(glob.glob(entry, recursive=recursive)) if Path(m).is_file())
+        else:
+            matches = (path,)
+        for match in matches:
+            seen.setdefault(match, None)
+    return list(seen)
+
+
+def validate_batch(
+    xml_paths: Iterable[Path],
+    xsd_paths: Sequence[str],
+    workers: int = 1,
+    *,
+    schematron_paths: Sequence[str] = (),
+    streaming: bool = False,
+    record_tag: Optional[str] = None,
+    classifier: Optional[MessageClassifier] = None,
+    columnar: bool = False,
+    fail_fast: bool = False,
+    max_issues: Optional[int] = None,
+    max_issues_per_code: Optional[int] = None,
+    result_cache: Optional[ResultCache] = None,
+    count_elements: bool = False,
+    hooks: Sequence[ValidationHook] = (),
+) -> Iterator[BatchResult]:
+    """Validate many XML files reusing one compiled schema per process.
+
+    With a ``result_cache`` files already validated with the same content,
+    schemas and options are taken from the cache instead. ``hooks`` run in
+    the worker processes when ``workers`` is not 1.
+    """
+    use_case = ValidationUseCase(
+        validators=[XsdValidator(classifier=classifier), SchematronValidator()],
+        result_cache=result_cache,
+        hooks=hooks,
+    )
+    schema_paths = [Path(p) for p in xsd_paths]
+    rule_paths = [Path(p) for p in schematron_paths]
+    requests = (
+        ValidationRequest(
+            xml_path=p,
+            xsd_paths=schema_paths,
+            streaming=streaming,
+            record_tag=record_tag,
+            columnar=columnar,
+            fail_fast=fail_fast,
+            max_issues=max_issues,
+            max_issues_per_code=max_issues_per_code,
+            count_elements=count_elements,
+            schematron_paths=rule_paths,
+        )
+        for p in xml_paths
+    )
+
+    for request, report in use_case.run_many(requests, workers=workers):
+        yield BatchResult.from_report(request.xml_path, report)
+
+
+def print_batch_report(results: Iterable[BatchResult]) -> int:
+    files = valid = with_warnings = with_errors = failed = 0
+    total_errors = total_warnings = 0
+
+    for result in results:
+        files += 1
+        if result.failure is not None:
+            failed += 1
+            print(f"FALLO   {result.xml_path}: {result.failure}")
+            continue
+
+        errors, warnings = result.errors, result.warnings
+        total_errors += errors
+        total_warnings += warnings
+        limited = ", limitado" if result.truncated else ""
+        if errors:
+            with_errors += 1
+            print(f"ERROR   {result.xml_path} (errores: {errors}, avisos: {warnings}{limited})")
+        elif warnings:
+            with_warnings += 1
+            print(f"AVISO   {result.xml_path} (avisos: {warnings}{limited})")
+        else:
+            valid += 1
+            print(f"OK      {result.xml_path}")
+
+    print(
+        f"TOTAL: {files} archivos, {valid} validos, {with_warnings} con avisos, "
+        f"{with_errors} con errores, {failed} fallidos "
+        f"({total_errors} errores, {total_warnings} avisos)"
+    )
+    if failed or with_errors:
+        return 2
+    return 1 if with_warnings else 0
+
+
+def write_report(results: Iterable[BatchResult], writer: ReportWriter) -> int:
+    """Write each result as soon as it is available; returns the exit code."""
+    writer.start()
+    for result in results:
+        writer.write(result)
+    return writer.finish()
+
+
+def format_timings(xml_path: Path, metadata: ValidationMetadata) -> str:
+    stages = ", ".join(f"{stage} {elapsed:.1f}" for stage, elapsed in metadata.stages.items())
+    line = f"TIEMPOS {xml_path}: {metadata.elapsed_ms:.1f} ms"
+    if metadata.cached:
+        line += " (cache)"
+    if stages:
+        line += f" ({stages})"
+    if metadata.bytes_read is not None:
+        line += f", {metadata.bytes_read} bytes"
+    if metadata.elements is not None:
+        line += f", {metadata.elements} elementos"
+    return line
+
+
+def _print_timings(results: Iterable[BatchResult]) -> Iterator[BatchResult]:
+    for result in results:
+        if result.metadata is not None:
+            print(format_timings(result.xml_path, result.metadata), file=sys.stderr)
+        yield result
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("debe ser mayor que cero")
+    return number
+
+
+def _non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("no puede ser negativo")
+    return number
+
+
+def _load_classifier(path: Optional[str]) -> Optional[MessageClassifier]:
+    if not path:
+        return None
+    try:
+        return MessageClassifier.from_file(path)
+    except OSError as exc:
+        raise RuntimeError(f"No se pudo leer la clasificacion: {exc}") from exc
+    except ValueError as exc:
+        raise RuntimeError(str(exc)) from exc
+
+
+def _print_error(args: argparse.Namespace, message: str) -> None:
+    # Machine-readable reports own stdout; keep diagnostics out of them.
+    stream = sys.stdout if args.format == "text" else sys.stderr
+    print(f"ERROR: {message}", file=stream)
+
+
+def _open_report_writer(args: argparse.Namespace, stack: ExitStack) -> ReportWriter:
+    if args.output:
+        stream = stack.enter_context(open(args.output, "wb"))
+    else:
+        sys.stdout.flush()
+        stream = sys.stdout.buffer
+    return create_report_writer(args.format, stream)
+
+
+def _open_result_cache(args: argparse.Namespace) -> Optional[ResultCache]:
+    if not (args.cache or args.cache_path):
+        return None
+    return ResultCache(args.cache_path, max_bytes=args.cache_max_mb * 1024 * 1024)
+
+
+def _run_batch(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    classifier: Optional[MessageClassifier] = None,
+    result_cache: Optional[ResultCache] = None,
+) -> int:
+    positionals = [p for p in (args.xml, args.xsd) if p]
+    if args.xsd_option:
+        xsd_paths = args.xsd_option
+    elif positionals:
+        xsd_paths = [positionals.pop()]
+    else:
+        parser.error("el modo lote requiere un XSD (--xsd).")
+
+    inputs = positionals + list(args.batch or [])
+    try:
+        xml_paths = collect_xml_paths(inputs, args.manifest, args.recursive)
+    except OSError as exc:
+        _print_error(args, f"No se pudo leer el manifiesto: {exc}")
+        return 2
+    if not xml_paths:
+        _print_error(args, "No se encontraron archivos XML para validar.")
+        return 2
+
+    try:
+        XsdValidator().schema_cache.get_many(xsd_paths)
+        for path in args.schematron or ():
+            get_schematron_cache().get(path)
+    except ValidatorError as exc:
+        _print_error(args, str(exc))
+        return 2
+
+    results = validate_batch(
+        xml_paths,
+        xsd_paths,
+        workers=args.workers,
+        schematron_paths=args.schematron or (),
+        streaming=args.stream,
+        record_tag=args.record_tag,
+        classifier=classifier,
+        columnar=args.format != "text",
+        fail_fast=args.fail_fast,
+        max_issues=args.max_issues,
+        max_issues_per_code=args.max_issues_per_code,
+        result_cache=result_cache,
+        count_elements=args.timings,
+    )
+    if args.timings:
+        results = _print_timings(results)
+    if args.format == "text":
+        return print_batch_report(results)
+    with ExitStack() as stack:
+        return write_report(results, _open_report_writer(args, stack))
+
+
+def format_watch_stats(stats: WatchStats) -> str:
+    return (
+        f"VIGILANCIA: {stats.files} archivos ({stats.passed} correctos, {stats.failed} con errores, "
+        f"{stats.cached} en cache), {stats.files_per_second:.2f} archivos/s, "
+        f"{stats.bytes_per_second / (1024 * 1024):.2f} MB/s, {stats.mean_ms:.1f} ms por archivo, "
+        f"{stats.pending} pendientes, {stats.in_flight} en curso"
+    )
+
+
+def _report_stats_periodically(watcher: FolderWatcher, interval: float, done: threading.Event) -> None:
+    while not done.wait(interval):
+        print(format_watch_stats(watcher.stats()), file=sys.stderr, flush=True)
+
+
+def _run_watch(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    classifier: Optional[MessageClassifier] = None,
+    result_cache: Optional[ResultCache] = None,
+) -> int:
+    xsd_paths = args.xsd_option or ([args.xsd] if args.xsd else [])
+    if not xsd_paths:
+        parser.error("el modo vigilancia requiere un XSD (--xsd).")
+    directories = [Path(d) for d in args.watch]
+    missing = [str(d) for d in directories if not d.is_dir()]
+    if missing:
+        _print_error(args, f"No existe el directorio a vigilar: {', '.join(missing)}")
+        return 2
+
+    try:
+        XsdValidator().schema_cache.get_many(xsd_paths)
+        for path in args.schematron or ():
+            get_schematron_cache().get(path)
+    except ValidatorError as exc:
+        _print_error(args, str(exc))
+        return 2
+
+    try:
+        config = WatchConfig(
+            directories=directories,
+            xsd_paths=[Path(p) for p in xsd_paths],
+            recursive=args.recursive,
+            poll_interval=args.interval,
+            settle_seconds=args.settle,
+            ok_dir=Path(args.ok_dir) if args.ok_dir else None,
+            failed_dir=Path(args.failed_dir) if args.failed_dir else None,
+            report_dir=Path(args.report_dir) if args.report_dir else None,
+            workers=args.workers,
+            request_options={
+                "streaming": args.stream,
+                "record_tag": args.record_tag,
+                "columnar": True,
+                "fail_fast": args.fail_fast,
+                "max_issues": args.max_issues,
+                "max_issues_per_code": args.max_issues_per_code,
+                "count_elements": args.timings,
+                "schematron_paths": [Path(p) for p in args.schematron or ()],
+            },
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    use_case = ValidationUseCase(
+        validators=[XsdValidator(classifier=classifier), SchematronValidator()],
+        result_cache=result_cache,
+    )
+    watcher = FolderWatcher(use_case, config)
+
+    def request_stop(signum, frame) -> None:
+        watcher.stop()
+
+    handlers = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    stats_done = threading.Event()
+    if args.stats_interval > 0:
+        threading.Thread(
+            target=_report_stats_periodically,
+            args=(watcher, args.stats_interval, stats_done),
+            daemon=True,
+        ).start()
+    results = watcher.results()
+    if args.timings:
+        results = _print_timings(results)
+    try:
+        if args.format == "text":
+            code = print_batch_report(results)
+        else:
+            with ExitStack() as stack:
+                code = write_report(results, _open_report_writer(args, stack))
+    finally:
+        stats_done.set()
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+    print(format_watch_stats(watcher.stats()), file=sys.stderr)
+    return code
+
+
+def _parse_schema_option(value: str) -> tuple[str, list[str]]:
+    name, separator, paths = value.partition("=")
+    if not separator or not name or not paths:
+        raise argparse.ArgumentTypeError("use NOMBRE=XSD[,XSD...]")
+    return name, [p for p in paths.split(",") if p]
+
+
+def _parse_listen_address(value: str) -> tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    try:
+        number = int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError("use [HOST:]PUERTO") from None
+    return host or "127.0.0.1", number
+
+
+def _run_server(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    classifier: Optional[MessageClassifier] = None,
+    result_cache: Optional[ResultCache] = None,
+) -> int:
+    schemas = list(args.schema or [])
+    if args.xsd_option or args.xsd:
+        schemas.append(("default", args.xsd_option or [args.xsd]))
+    if not schemas:
+        parser.error("el servicio requiere al menos un esquema (--schema NOMBRE=XSD o --xsd).")
+
+    registry = SchemaRegistry()
+    try:
+        for name, paths in schemas:
+            registry.register(name, paths)
+    except (ValidatorError, ValueError) as exc:
+        _print_error(args, str(exc))
+        return 2
+
+    use_case = ValidationUseCase(
+        validators=[XsdValidator(classifier=classifier)],
+        result_cache=result_cache,
+    )
+    service = ValidationService(registry, use_case, workers=args.workers, max_pending=args.max_pending)
+    host, port = args.serve or ("127.0.0.1", 0)
+    try:
+        server = create_server(
+            service,
+            host,
+            port,
+            socket_path=args.socket,
+            max_body_bytes=args.max_body_mb * 1024 * 1024,
+            quiet=not args.access_log,
+        )
+    except (OSError, ValueError) as exc:
+        _print_error(args, f"No se pudo abrir el servicio: {exc}")
+        return 2
+
+    service.start()
+    stop = threading.Event()
+    handlers = {sig: signal.signal(sig, lambda signum, frame: stop.set()) for sig in (signal.SIGINT, signal.SIGTERM)}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    if args.socket:
+        location = args.socket
+    else:
+        bound_host, bound_port = server.server_address[:2]  # type: ignore[misc]
+        location = f"http://{bound_host}:{bound_port}"
+    names = ", ".join(schema.name for schema in registry)
+    print(f"Servicio de validacion en {location} (esquemas: {names})", file=sys.stderr, flush=True)
+    try:
+        while not stop.wait(1.0):
+            pass
+    finally:
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+        server.shutdown()
+        server.server_close()
+        service.close()
+        if args.socket:
+            Path(args.socket).unlink(missing_ok=True)
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Valida un XML contra un XSD y clasifica incidencias en ERROR/AVISO."
     )
-    parser.add_argument("xml", help="Ruta al archivo XML")
-    parser.add_argument("xsd", help="Ruta al archivo XSD")
+    parser.add_argument("xml", nargs="?", help="Ruta al archivo XML")
+    parser.add_argument("xsd", nargs="?", help="Ruta al archivo XSD")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Valida registro a registro con iterparse para XML muy grandes",
+    )
+    parser.add_argument(
+        "--record-tag",
+        help="Elemento repetido que forma cada registro en modo --stream (por defecto, hijos de la raiz)",
+    )
+    parser.add_argument(
+        "--classification",
+        metavar="JSON",
+        help="Tablas de clasificacion ERROR/AVISO (error_keys, warning_keys, code_severities, default)",
+    )
+    parser.add_argument(
+        "--schematron",
+        action="append",
+        metavar="SCH",
+        help="Reglas de negocio ISO Schematron que se comprueban ademas del XSD (repetible)",
+    )
+    output_group = parser.add_argument_group("salida")
+    output_group.add_argument(
+        "--format",
+        choices=("text", *REPORT_WRITERS),
+        default="text",
+        help="Formato del informe: texto legible o jsonl/json/sarif/junit, escritos a medida que se validan los archivos",
+    )
+    output_group.add_argument(
+        "--output",
+        metavar="ARCHIVO",
+        help="Escribe el informe jsonl/json/sarif/junit en ARCHIVO en lugar de la salida estandar",
+    )
+    limits_group = parser.add_argument_group("limites")
+    limits_group.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Detiene la validacion en la primera incidencia (solo indica si el XML es valido)",
+    )
+    limits_group.add_argument(
+        "--max-issues",
+        type=_positive_int,
+        metavar="N",
+        help="Detiene la validacion tras N incidencias",
+    )
+    limits_group.add_argument(
+        "--max-issues-per-code",
+        type=_positive_int,
+        metavar="N",
+        help="Informa como maximo N incidencias de cada codigo",
+    )
+    cache_group = parser.add_argument_group("cache de resultados")
+    cache_group.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reutiliza resultados de archivos ya validados con el mismo contenido, XSD y opciones",
+    )
+    cache_group.add_argument(
+        "--cache-path",
+        metavar="ARCHIVO",
+        help="Base de datos SQLite de la cache (implica --cache; por defecto, en la cache del usuario)",
+    )
+    cache_group.add_argument(
+        "--cache-max-mb",
+        type=_positive_int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        metavar="MB",
+        help="Tamano maximo de la cache; se descartan primero los resultados usados hace mas tiempo",
+    )
+    profile_group = parser.add_argument_group("rendimiento")
+    profile_group.add_argument(
+        "--timings",
+        action="store_true",
+        help="Muestra en la salida de errores el tiempo de cada etapa, los bytes y los elementos de cada archivo",
+    )
+    profile_group.add_argument(
+        "--profile",
+        metavar="ARCHIVO",
+        help="Guarda un perfil cProfile (formato pstats) de la ejecucion; con --workers solo cubre el proceso principal",
+    )
+    watch_group = parser.add_argument_group("modo vigilancia")
+    watch_group.add_argument(
+        "--watch",
+        nargs="+",
+        metavar="DIRECTORIO",
+        help="Vigila directorios y valida los XML nuevos o modificados hasta recibir Ctrl+C",
+    )
+    watch_group.add_argument("--ok-dir", metavar="DIRECTORIO", help="Mueve aqui los XML sin errores")
+    watch_group.add_argument(
+        "--failed-dir",
+        metavar="DIRECTORIO",
+        help="Mueve aqui los XML con errores o que no se pudieron validar",
+    )
+    watch_group.add_argument(
+        "--report-dir",
+        metavar="DIRECTORIO",
+        help="Escribe aqui un informe JSON por archivo validado",
+    )
+    watch_group.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        metavar="SEG",
+        help="Segundos entre revisiones de los directorios",
+    )
+    watch_group.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE_SECONDS,
+        metavar="SEG",
+        help="Segundos sin cambios de tamano ni fecha antes de validar un archivo (escrituras a medias)",
+    )
+    watch_group.add_argument(
+        "--stats-interval",
+        type=float,
+        default=60.0,
+        metavar="SEG",
+        help="Cada cuantos segundos mostrar el rendimiento en la salida de errores (0 = solo al salir)",
+    )
+    server_group = parser.add_argument_group("modo servicio")
+    server_group.add_argument(
+        "--serve",
+        type=_parse_listen_address,
+        metavar="[HOST:]PUERTO",
+        help="Atiende validaciones por HTTP (POST /validate/NOMBRE) con los esquemas compilados en memoria",
+    )
+    server_group.add_argument("--socket", metavar="RUTA", help="Atiende HTTP en un socket Unix en lugar de TCP")
+    server_group.add_argument(
+        "--schema",
+        action="append",
+        type=_parse_schema_option,
+        metavar="NOMBRE=XSD[,XSD...]",
+        help="Registra un esquema con nombre (repetible); --xsd se registra como 'default'",
+    )
+    server_group.add_argument(
+        "--max-pending",
+        type=_positive_int,
+        default=DEFAULT_MAX_PENDING,
+        metavar="N",
+        help="Validaciones simultaneas admitidas; las siguientes reciben 503",
+    )
+    server_group.add_argument(
+        "--max-body-mb",
+        type=_positive_int,
+        default=DEFAULT_MAX_BODY_BYTES // (1024 * 1024),
+        metavar="MB",
+        help="Tamano maximo del XML recibido",
+    )
+    server_group.add_argument("--access-log", action="store_true", help="Registra cada peticion en la salida de errores")
+    batch_group = parser.add_argument_group("modo lote")
+    batch_group.add_argument(
+        "--xsd",
+        dest="xsd_option",
+        action="append",
+        metavar="XSD",
+        help="XSD adicional (repetible); en modo lote, XSD comun a todos los archivos",
+    )
+    batch_group.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="ENTRADA",
+        help="Directorios, patrones glob o archivos XML a validar en un solo proceso",
+    )
+    batch_group.add_argument("--manifest", help="Archivo de texto con una ruta XML por linea")
+    batch_group.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Recorre subdirectorios y habilita '**' en los patrones glob",
+    )
+    batch_group.add_argument(
+        "--workers",
+        type=_non_negative_int,
+        default=1,
+        help="Procesos en paralelo para el modo lote (0 = uno por nucleo)",
+    )
     args = parser.parse_args()
+    if not args.profile:
+        return _run(args, parser)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return _run(args, parser)
+    finally:
+        profiler.disable()
+        try:
+            profiler.dump_stats(args.profile)
+        except OSError as exc:
+            print(f"ERROR: No se pudo guardar el perfil: {exc}", file=sys.stderr)
+
 
+def _run(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
     try:
-        issues = validate(args.xml, args.xsd)
+        classifier = _load_classifier(args.classification)
     except RuntimeError as exc:
-        print(f"ERROR: {exc}")
+        _print_error(args, str(exc))
         return 2
 
-    return print_report(issues)
+    result_cache = _open_result_cache(args)
+
+    if args.serve or args.socket:
+        return _run_server(args, parser, classifier, result_cache)
+
+    if args.watch:
+        return _run_watch(args, parser, classifier, result_cache)
+
+    if args.batch or args.manifest:
+        return _run_batch(args, parser, classifier, result_cache)
+
+    if not args.xml or not args.xsd:
+        parser.error("se requieren las rutas XML y XSD.")
+
+    try:
+        report = validate_report(
+            args.xml,
+            args.xsd,
+            extra_xsd_paths=args.xsd_option or (),
+            schematron_paths=args.schematron or (),
+            streaming=args.stream,
+            record_tag=args.record_tag,
+            classifier=classifier,
+            columnar=args.format != "text",
+            fail_fast=args.fail_fast,
+            max_issues=args.max_issues,
+            max_issues_per_code=args.max_issues_per_code,
+            result_cache=result_cache,
+            count_elements=args.timings,
+        )
+    except RuntimeError as exc:
+        if args.format == "text":
+            print(f"ERROR: {exc}")
+            return 2
+        result = BatchResult(xml_path=Path(args.xml), failure=str(exc))
+    else:
+        if args.timings and report.metadata is not None:
+            print(format_timings(Path(args.xml), report.metadata), file=sys.stderr)
+        if args.format == "text":
+            return print_report(report.issues, report.truncated)
+        result = BatchResult.from_report(Path(args.xml), report)
+
+    with ExitStack() as stack:
+        return write_report([result], _open_report_writer(args, stack))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
 
 
 class Severity(str, Enum):
@@ -12,7 +13,7 @@ class Severity(str, Enum):
     INFO = "INFO"
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationIssue:
     line: int
     column: int
@@ -26,26 +27,292 @@ class ValidationIssue:
         return self.severity.value
 
 
+_SEVERITIES = tuple(Severity)
+_SEVERITY_INDEX = {severity: index for index, severity in enumerate(_SEVERITIES)}
+
+
+class _StringTable:
+    """Intern table mapping strings (or None) to small integer ids."""
+
+    __slots__ = ("values", "_ids")
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = [None]
+        self._ids: Dict[Optional[str], int] = {None: 0}
+
+    def intern(self, value: Optional[str]) -> int:
+        index = self._ids.get(value)
+        if index is None:
+            index = len(self.values)
+            self._ids[value] = index
+            self.values.append(value)
+        return index
+
+    def __getstate__(self) -> List[Optional[str]]:
+        return self.values
+
+    def __setstate__(self, values: List[Optional[str]]) -> None:
+        self.values = values
+        self._ids = {value: index for index, value in enumerate(values)}
+
+
+class IssueColumns(Sequence[ValidationIssue]):
+    """Columnar storage for large numbers of issues.
+
+    Lines, columns and severities live in typed arrays and messages, codes
+    and rules in intern tables, so a repeated message is stored once and a
+    million issues take a few tens of megabytes instead of gigabytes. It
+    behaves as a read-only sequence of ValidationIssue; items are built on
+    access. Severity counts are kept up to date while appending.
+    """
+
+    def __init__(self, issues: Iterable[ValidationIssue] = ()) -> None:
+        self.lines = array("l")
+        self.columns = array("l")
+        self.severities = array("B")
+        self.message_ids = array("L")
+        self.code_ids = array("L")
+        self.rule_ids = array("L")
+        self._messages = _StringTable()
+        self._codes = _StringTable()
+        self._rules = _StringTable()
+        self._counts = [0] * len(_SEVERITIES)
+        self.extend(issues)
+
+    def add(
+        self,
+        line: int,
+        column: int,
+        message: str,
+        severity: Severity = Severity.ERROR,
+        code: Optional[str] = None,
+        rule: Optional[str] = None,
+    ) -> None:
+        severity_index = _SEVERITY_INDEX[severity]
+        self.lines.append(line)
+        self.columns.append(column)
+        self.severities.append(severity_index)
+        self.message_ids.append(self._messages.intern(message))
+        self.code_ids.append(self._codes.intern(code))
+        self.rule_ids.append(self._rules.intern(rule))
+        self._counts[severity_index] += 1
+
+    def append(self, issue: ValidationIssue) -> None:
+        self.add(issue.line, issue.column, issue.message, issue.severity, issue.code, issue.rule)
+
+    def extend(self, issues: Iterable[ValidationIssue]) -> None:
+        for issue in issues:
+            self.append(issue)
+
+    def counts(self) -> Dict[Severity, int]:
+        return dict(zip(_SEVERITIES, self._counts))
+
+    def line_severities(self) -> Iterator[Tuple[int, Severity]]:
+        return zip(self.lines, map(_SEVERITIES.__getitem__, self.severities))
+
+    def line_at(self, index: int) -> int:
+        return self.lines[index]
+
+    def column_at(self, index: int) -> int:
+        return self.columns[index]
+
+    def severity_at(self, index: int) -> Severity:
+        return _SEVERITIES[self.severities[index]]
+
+    def message_at(self, index: int) -> str:
+        return self._messages.values[self.message_ids[index]]  # type: ignore[return-value]
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    @overload
+    def __getitem__(self, index: int) -> ValidationIssue: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[ValidationIssue]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+            if index < 0:
+                raise IndexError("IssueColumns index out of range")
+        return ValidationIssue(
+            line=self.lines[index],
+            column=self.columns[index],
+            message=self._messages.values[self.message_ids[index]],  # type: ignore[arg-type]
+            severity=_SEVERITIES[self.severities[index]],
+            code=self._codes.values[self.code_ids[index]],
+            rule=self._rules.values[self.rule_ids[index]],
+        )
+
+    def __iter__(self) -> Iterator[ValidationIssue]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"IssueColumns({len(self)} issues)"
+
+
+IssueSequence = Union[List[ValidationIssue], IssueColumns]
+
+
+def count_severities(issues: Iterable[ValidationIssue]) -> Dict[Severity, int]:
+    if isinstance(issues, IssueColumns):
+        return issues.counts()
+    counts = dict.fromkeys(Severity, 0)
+    for issue in issues:
+        counts[issue.severity] += 1
+    return counts
+
+
+XmlContent = Union[bytes, bytearray, memoryview, BinaryIO]
+
+IN_MEMORY_XML_NAME = "memoria.xml"
+
+
 @dataclass
 class ValidationRequest:
+    """What to validate and against which schemas.
+
+    ``xml_path`` names the document. When ``xml_content`` is set the XML is
+    read from it (a bytes-like object or a binary stream) instead of from
+    disk, and ``xml_path`` only serves as label and base URL. Setting
+    ``content_is_file`` declares that the bytes-like ``xml_content`` is the
+    current content of ``xml_path`` (say, a MappedFile buffer), so the
+    result cache may reuse the hash it remembers for that file. ``columnar``
+    asks validators to return issues as IssueColumns.
+
+    ``fail_fast`` stops at the first issue and ``max_issues`` after that many;
+    with ``streaming`` the document is not read any further once the limit
+    is hit. ``max_issues_per_code`` keeps at most that many issues of each
+    code. A report cut short by any of them is marked ``truncated``.
+
+    ``schematron_paths`` adds business rules checked by the Schematron
+    validator on top of the XSDs.
+
+    ``count_elements`` fills ``ValidationMetadata.elements`` for tree
+    validations, at the price of one more pass over the parsed document;
+    streaming validations always count them.
+    """
+
     xml_path: Path
     xsd_paths: Sequence[Path]
     strict: bool = False
+    streaming: bool = False
+    record_tag: Optional[str] = None
+    xml_content: Optional[XmlContent] = None
+    content_is_file: bool = False
+    columnar: bool = False
+    fail_fast: bool = False
+    max_issues: Optional[int] = None
+    max_issues_per_code: Optional[int] = None
+    count_elements: bool = False
+    schematron_paths: Sequence[Path] = ()
+
+    def __post_init__(self) -> None:
+        if self.max_issues is not None and self.max_issues < 1:
+            raise ValueError("max_issues debe ser mayor que cero.")
+        if self.max_issues_per_code is not None and self.max_issues_per_code < 1:
+            raise ValueError("max_issues_per_code debe ser mayor que cero.")
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: Union[bytes, bytearray, memoryview],
+        xsd_paths: Sequence[Path],
+        name: str = IN_MEMORY_XML_NAME,
+        **options,
+    ) -> "ValidationRequest":
+        return cls(xml_path=Path(name), xsd_paths=xsd_paths, xml_content=data, **options)
+
+    @classmethod
+    def from_stream(
+        cls,
+        stream: BinaryIO,
+        xsd_paths: Sequence[Path],
+        name: Optional[str] = None,
+        **options,
+    ) -> "ValidationRequest":
+        """Validate a binary stream; it is read once, so it cannot be retried."""
+        label = name or getattr(stream, "name", None) or IN_MEMORY_XML_NAME
+        return cls(xml_path=Path(str(label)), xsd_paths=xsd_paths, xml_content=stream, **options)
+
+    @property
+    def in_memory(self) -> bool:
+        return self.xml_content is not None
+
+    @property
+    def issue_limit(self) -> Optional[int]:
+        """Issues after which validation may stop, or None to collect them all."""
+        if self.fail_fast:
+            return 1
+        return self.max_issues
+
+
+STAGE_SCHEMA = "schema"
+STAGE_PARSE = "parse"
+STAGE_VALIDATE = "validate"
+STAGE_CONVERT = "convert"
+STAGE_CLASSIFY = "classify"
+STAGES = (STAGE_SCHEMA, STAGE_PARSE, STAGE_VALIDATE, STAGE_CONVERT, STAGE_CLASSIFY)
 
 
 @dataclass
 class ValidationMetadata:
+    """How a report was produced.
+
+    ``stages`` maps stage names (see ``STAGES``) to milliseconds. Stages do
+    not overlap, so their sum is at most ``elapsed_ms``; a validator only
+    reports the stages it has. ``bytes_read`` and ``elements`` are the size
+    of the XML and its element count, or None when unknown. A report merged
+    from several validators keeps each validator's metadata in ``parts``;
+    its stage times are the sums over those parts.
+    """
+
     validator: str
     elapsed_ms: float
+    cached: bool = False
+    stages: Dict[str, float] = field(default_factory=dict)
+    bytes_read: Optional[int] = None
+    elements: Optional[int] = None
+    parts: List["ValidationMetadata"] = field(default_factory=list)
 
 
 @dataclass
 class ValidationReport:
+    """Outcome of a validation.
+
+    Severity counts are computed once at construction, so the issue list
+    should not be modified afterwards. ``issues`` may be an IssueColumns
+    when the request asked for columnar storage. ``truncated`` means issue
+    limits of the request dropped issues or stopped validation early.
+    """
+
     ok: bool
-    issues: List[ValidationIssue] = field(default_factory=list)
+    issues: IssueSequence = field(default_factory=list)
     metadata: Optional[ValidationMetadata] = None
+    truncated: bool = False
+    counts: Dict[Severity, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.counts = count_severities(self.issues)
 
     @property
     def has_errors(self) -> bool:
-        return any(issue.severity == Severity.ERROR for issue in self.issues)
+        return self.counts[Severity.ERROR] > 0
+
+    @property
+    def error_count(self) -> int:
+        return self.counts[Severity.ERROR]
+
+    @property
+    def warning_count(self) -> int:
+        return self.counts[Severity.WARNING]
 
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
+import bisect
+import mmap
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Optional
+
+
+LINE_COUNT_CHUNK = 16 * 1024 * 1024
+PAGE_SIZE_BYTES = 2 * 1024 * 1024
 
 
 def ensure_existing_file(path: str | Path) -> Path:
@@ -9,3 +17,209 @@ def ensure_existing_file(path: str | Path) -> Path:
         raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
     return file_path
 
+
+class BufferReader:
+    """Minimal binary reader over a bytes-like object.
+
+    Each ``read`` copies only the requested slice, so feeding a large
+    memoryview to an incremental parser never duplicates the whole buffer.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview | mmap.mmap) -> None:
+        self._view: Optional[memoryview] = memoryview(data).cast("B")
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if self._view is None:
+            return b""
+        start = self._position
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), start + size)
+        self._position = end
+        return self._view[start:end].tobytes()
+
+    def release(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+
+
+class MappedFile:
+    """Read-only memory map of a file for parsing, line counting and slicing.
+
+    Use as a context manager. The parser, the line counter and any byte-range
+    lookups all read the same mapping, so the file content is pulled from
+    disk once per run no matter how many consumers need it. Empty files are
+    served from an empty buffer, since they cannot be mapped.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = ensure_existing_file(path)
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._readers: list[BufferReader] = []
+        self._views: list[memoryview] = []
+        self._line_count: Optional[int] = None
+
+    def __enter__(self) -> "MappedFile":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> None:
+        if self._file is not None:
+            return
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._map = None
+
+    def close(self) -> None:
+        for reader in self._readers:
+            reader.release()
+        self._readers.clear()
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def size(self) -> int:
+        return len(self._map) if self._map is not None else 0
+
+    def reader(self) -> BufferReader:
+        """Return a fresh file-like reader suitable as lxml parser input."""
+        reader = BufferReader(self._map if self._map is not None else b"")
+        self._readers.append(reader)
+        return reader
+
+    def buffer(self) -> memoryview:
+        """Return a view of the whole mapping, valid until the file is closed."""
+        view = memoryview(self._map if self._map is not None else b"")
+        self._views.append(view)
+        return view
+
+    def read_range(self, start: int, end: int) -> bytes:
+        if self._map is None:
+            return b""
+        return self._map[max(0, start):max(0, end)]
+
+    def line_count(self) -> int:
+        """Number of lines, counting a last line without trailing newline."""
+        if self._line_count is None:
+            if self._map is None:
+                self._line_count = 0
+            else:
+                newlines = 0
+                for offset in range(0, len(self._map), LINE_COUNT_CHUNK):
+                    newlines += self._map[offset:offset + LINE_COUNT_CHUNK].count(b"\n")
+                self._line_count = newlines + 1
+        return self._line_count
+
+    def text(self, encoding: str = "utf-8", errors: str = "replace") -> str:
+        if self._map is None:
+            return ""
+        with memoryview(self._map) as view:
+            return str(view, encoding, errors)
+
+
+@dataclass(frozen=True)
+class FilePage:
+    start: int
+    end: int
+    first_line: int
+
+
+class PagedFile:
+    """Split a mapped file into pages of whole lines for read-only browsing.
+
+    Pages are about ``page_size`` bytes long and always end after a newline,
+    so each one can be decoded on its own. The index only stores byte offsets
+    and the number of the first line of each page; text is decoded when a page
+    is requested. The mapping is owned by the instance and released by
+    ``close``.
+    """
+
+    def __init__(self, path: str | Path, page_size: int = PAGE_SIZE_BYTES) -> None:
+        if page_size < 1:
+            raise ValueError("page_size debe ser mayor que cero.")
+        self.path = Path(path)
+        self.page_size = page_size
+        self._mapped = MappedFile(path)
+        self._mapped.open()
+        self.pages: list[FilePage] = []
+        self.line_count = 0
+        self._first_lines: list[int] = []
+
+    @property
+    def size(self) -> int:
+        return self._mapped.size
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def build_index(
+        self,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """Compute page boundaries; return False if ``cancelled`` stopped it."""
+        # An empty file has no mapping and no pages.
+        data = self._mapped._map
+        size = self.size
+        pages: list[FilePage] = []
+        start = 0
+        line = 1
+        while start < size:
+            if cancelled is not None and cancelled():
+                return False
+            newline = data.find(b"\n", min(size, start + self.page_size))
+            end = size if newline < 0 else newline + 1
+            pages.append(FilePage(start, end, line))
+            line += data[start:end].count(b"\n")
+            start = end
+            if progress is not None:
+                progress(start, size)
+        self.pages = pages
+        # Same convention as MappedFile.line_count: newlines plus one.
+        self.line_count = line if size else 0
+        self._first_lines = [page.first_line for page in pages]
+        return True
+
+    def last_line(self, index: int) -> int:
+        if index + 1 < len(self.pages):
+            return self.pages[index + 1].first_line - 1
+        return self.line_count
+
+    def page_for_line(self, line: int) -> int:
+        if not self.pages:
+            return 0
+        return max(0, bisect.bisect_right(self._first_lines, line) - 1)
+
+    def page_text(self, index: int, encoding: str = "utf-8", errors: str = "replace") -> str:
+        page = self.pages[index]
+        return self._mapped.read_range(page.start, page.end).decode(encoding, errors)
+
+    def close(self) -> None:
+        self._mapped.close()
+
+
+def count_lines(path: str | Path) -> int:
+    try:
+        with MappedFile(path) as mapped:
+            return mapped.line_count()
+    except OSError:
+        return 0
+
+
+def read_text(path: str | Path, encoding: str = "utf-8", errors: str = "replace") -> str:
+    with MappedFile(path) as mapped:
+        return mapped.text(encoding, errors)
@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Protocol, Type
+
+import lxml.etree as etree
+
+from ..domain.models import (
+    IssueColumns,
+    IssueSequence,
+    Severity,
+    ValidationIssue,
+    ValidationMetadata,
+    ValidationReport,
+)
+
+
+TOOL_NAME = "validar_xml"
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+# Spooled SARIF sections move from memory to a temporary file past this size.
+SARIF_SPOOL_BYTES = 1 << 20
+DEFAULT_RULE_ID = "XSD"
+
+_SARIF_LEVELS = {
+    Severity.ERROR: "error",
+    Severity.WARNING: "warning",
+    Severity.INFO: "note",
+}
+
+
+class FileResult(Protocol):
+    """Outcome of validating one file, as consumed by the report writers."""
+
+    xml_path: Path
+    issues: Iterable[ValidationIssue]
+    failure: Optional[str]
+    truncated: bool
+    elapsed_ms: Optional[float]
+    metadata: Optional[ValidationMetadata]
+
+    @property
+    def errors(self) -> int: ...
+
+    @property
+    def warnings(self) -> int: ...
+
+
+@dataclass
+class ReportSummary:
+    files: int = 0
+    valid: int = 0
+    with_warnings: int = 0
+    with_errors: int = 0
+    failed: int = 0
+    errors: int = 0
+    warnings: int = 0
+    elapsed_ms: float = 0.0
+
+    def add(self, result: FileResult) -> None:
+        self.files += 1
+        self.elapsed_ms += result.elapsed_ms or 0.0
+        if result.failure is not None:
+            self.failed += 1
+            return
+        self.errors += result.errors
+        self.warnings += result.warnings
+        if result.errors:
+            self.with_errors += 1
+        elif result.warnings:
+            self.with_warnings += 1
+        else:
+            self.valid += 1
+
+    @property
+    def exit_code(self) -> int:
+        if self.failed or self.with_errors:
+            return 2
+        return 1 if self.with_warnings else 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "valid": self.valid,
+            "with_warnings": self.with_warnings,
+            "with_errors": self.with_errors,
+            "failed": self.failed,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+def _issue_dict(issue: ValidationIssue) -> Dict[str, Any]:
+    return {
+        "line": issue.line,
+        "column": issue.column,
+        "level": issue.level,
+        "code": issue.code,
+        "rule": issue.rule,
+        "message": issue.message,
+    }
+
+
+def _file_dict(result: FileResult) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "file": str(result.xml_path),
+        "ok": result.failure is None and result.errors == 0,
+        "elapsed_ms": None if result.elapsed_ms is None else round(result.elapsed_ms, 3),
+    }
+    if result.failure is not None:
+        data["failure"] = result.failure
+    else:
+        data["errors"] = result.errors
+        data["warnings"] = result.warnings
+        data["truncated"] = result.truncated
+    if result.metadata is not None:
+        data.update(_metrics_dict(result.metadata))
+    return data
+
+
+def _metrics_dict(metadata: ValidationMetadata) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "cached": metadata.cached,
+        "stages_ms": _stages_dict(metadata),
+        "bytes": metadata.bytes_read,
+        "elements": metadata.elements,
+    }
+    if metadata.parts:
+        data["validators"] = [
+            {
+                "validator": part.validator,
+                "elapsed_ms": round(part.elapsed_ms, 3),
+                "stages_ms": _stages_dict(part),
+            }
+            for part in metadata.parts
+        ]
+    return data
+
+
+def _stages_dict(metadata: ValidationMetadata) -> Dict[str, float]:
+    return {stage: round(elapsed, 3) for stage, elapsed in metadata.stages.items()}
+
+
+def encode_report(report: ValidationReport) -> bytes:
+    """Serialize one ValidationReport as a UTF-8 JSON object."""
+    metadata = report.metadata
+    head = {
+        "ok": report.ok,
+        "truncated": report.truncated,
+        "errors": report.error_count,
+        "warnings": report.warning_count,
+        "metadata": None
+        if metadata is None
+        else {
+            "validator": metadata.validator,
+            "elapsed_ms": round(metadata.elapsed_ms, 3),
+            **_metrics_dict(metadata),
+        },
+    }
+    issues = b", ".join(
+        json.dumps(_issue_dict(issue), ensure_ascii=False).encode("utf-8") for issue in report.issues
+    )
+    return json.dumps(head, ensure_ascii=False)[:-1].encode("utf-8") + b', "issues": [' + issues + b"]}"
+
+
+def decode_report(data: bytes, columnar: bool = False) -> ValidationReport:
+    """Rebuild a ValidationReport from ``encode_report()`` output.
+
+    Timings come back rounded to microseconds; validator parts keep only
+    their name, time and stages.
+    """
+    document = json.loads(data)
+    issues: IssueSequence = IssueColumns() if columnar else []
+    for item in document["issues"]:
+        issues.append(
+            ValidationIssue(
+                line=item["line"],
+                column=item["column"],
+                message=item["message"],
+                severity=Severity(item["level"]),
+                code=item["code"],
+                rule=item["rule"],
+            )
+        )
+    head = document["metadata"]
+    metadata = None
+    if head is not None:
+        metadata = ValidationMetadata(
+            validator=head["validator"],
+            elapsed_ms=head["elapsed_ms"],
+            cached=head["cached"],
+            stages=head["stages_ms"],
+            bytes_read=head["bytes"],
+            elements=head["elements"],
+            parts=[
+                ValidationMetadata(validator=part["validator"], elapsed_ms=part["elapsed_ms"], stages=part["stages_ms"])
+                for part in head.get("validators", ())
+            ],
+        )
+    return ValidationReport(ok=document["ok"], issues=issues, metadata=metadata, truncated=document["truncated"])
+
+
+class ReportWriter(ABC):
+    """Write validation results to a binary stream as they arrive.
+
+    Call ``start()`` once, ``write()`` for every file and ``finish()`` at
+    the end; ``finish()`` returns the exit code of the whole run. Each file
+    is written as soon as it arrives and only a few counters are kept
+    between files, so memory does not grow with the number of files. Within
+    a file it does: ``write()`` gets the file's finished report, so its
+    issues are already in memory (bounded by ``max_issues``) when they are
+    encoded.
+    """
+
+    format_name = ""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.summary = ReportSummary()
+
+    def start(self) -> None:
+        pass
+
+    def write(self, result: FileResult) -> None:
+        self.summary.add(result)
+        self._write(result)
+        self.stream.flush()
+
+    def finish(self) -> int:
+        self._finish()
+        self.stream.flush()
+        return self.summary.exit_code
+
+    @abstractmethod
+    def _write(self, result: FileResult) -> None:
+        """Encode one file's result and its issues to the stream."""
+
+    def _finish(self) -> None:
+        pass
+
+    def _dump(self, data: Any) -> None:
+        self.stream.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+class JsonLinesWriter(ReportWriter):
+    """One JSON object per line: an ``issue`` record per issue, a ``file``
+    record closing each file and a final ``summary`` record."""
+
+    format_name = "jsonl"
+
+    def _write(self, result: FileResult) -> None:
+        name = str(result.xml_path)
+        if result.failure is None:
+            for issue in result.issues:
+                record = _issue_dict(issue)
+                record["type"] = "issue"
+                record["file"] = name
+                self._dump(record)
+                self.stream.write(b"\n")
+        record = _file_dict(result)
+        record["type"] = "file"
+        self._dump(record)
+        self.stream.write(b"\n")
+
+    def _finish(self) -> None:
+        record = self.summary.as_dict()
+        record["type"] = "summary"
+        self._dump(record)
+        self.stream.write(b"\n")
+
+
+class JsonWriter(ReportWriter):
+    """A single JSON document ``{"files": [...], "summary": {...}}``, written incrementally."""
+
+    format_name = "json"
+
+    def start(self) -> None:
+        self.stream.write(b'{"files": [')
+
+    def _write(self, result: FileResult) -> None:
+        if self.summary.files > 1:
+            self.stream.write(b", ")
+        header = json.dumps(_file_dict(result), ensure_ascii=False)
+        # Drop the closing brace so the issue array is streamed into the same object.
+        self.stream.write(header[:-1].encode("utf-8"))
+        self.stream.write(b', "issues": [')
+        if result.failure is None:
+            for index, issue in enumerate(result.issues):
+                if index:
+                    self.stream.write(b", ")
+                self._dump(_issue_dict(issue))
+        self.stream.write(b"]}")
+
+    def _finish(self) -> None:
+        self.stream.write(b'], "summary": ')
+        self._dump(self.summary.as_dict())
+        self.stream.write(b"}\n")
+
+
+class SarifWriter(ReportWriter):
+    """SARIF 2.1.0 log with one run.
+
+    Results are streamed. Per-file timings go to ``artifacts`` and failed
+    files to the invocation notifications; SARIF puts both after the
+    results, so they are spooled (to a temporary file once they outgrow
+    ``SARIF_SPOOL_BYTES``) and copied to the stream at the end.
+    """
+
+    format_name = "sarif"
+
+    def __init__(self, stream: BinaryIO) -> None:
+        super().__init__(stream)
+        self._contexts = ExitStack()
+        self._artifacts = self._spool()
+        self._notifications = self._spool()
+        self._artifact_count = 0
+        self._notification_count = 0
+        self._results = 0
+
+    def _spool(self) -> BinaryIO:
+        return self._contexts.enter_context(tempfile.SpooledTemporaryFile(SARIF_SPOOL_BYTES))
+
+    def start(self) -> None:
+        self.stream.write(b'{"$schema": ')
+        self._dump(SARIF_SCHEMA)
+        self.stream.write(b', "version": ')
+        self._dump(SARIF_VERSION)
+        self.stream.write(b', "runs": [{"tool": ')
+        self._dump({"driver": {"name": TOOL_NAME}})
+        self.stream.write(b', "results": [')
+
+    def _write(self, result: FileResult) -> None:
+        uri = result.xml_path.as_posix()
+        index = self._artifact_count
+        self._artifact_count += 1
+        self._append(self._artifacts, index, {"location": {"uri": uri}, "properties": _file_dict(result)})
+
+        if result.failure is not None:
+            notification = {
+                "level": "error",
+                "message": {"text": result.failure},
+                "locations": [{"physicalLocation": {"artifactLocation": {"uri": uri, "index": index}}}],
+            }
+            self._append(self._notifications, self._notification_count, notification)
+            self._notification_count += 1
+            return
+
+        for issue in result.issues:
+            location: Dict[str, Any] = {"artifactLocation": {"uri": uri, "index": index}}
+            if issue.line > 0:
+                region = {"startLine": issue.line}
+                if issue.column > 0:
+                    region["startColumn"] = issue.column
+                location["region"] = region
+            if self._results:
+                self.stream.write(b", ")
+            self._results += 1
+            self._dump(
+                {
+                    "ruleId": issue.code or DEFAULT_RULE_ID,
+                    "level": _SARIF_LEVELS[issue.severity],
+                    "message": {"text": issue.message},
+                    "locations": [{"physicalLocation": location}],
+                }
+            )
+
+    def _finish(self) -> None:
+        with self._contexts:
+            self.stream.write(b'], "artifacts": [')
+            self._copy(self._artifacts)
+            self.stream.write(b'], "invocations": [{"executionSuccessful": ')
+            self._dump(not self._notification_count)
+            self.stream.write(b', "toolExecutionNotifications": [')
+            self._copy(self._notifications)
+            self.stream.write(b'], "properties": ')
+            self._dump(self.summary.as_dict())
+            self.stream.write(b"}]}]}\n")
+
+    @staticmethod
+    def _append(spool: BinaryIO, index: int, data: Dict[str, Any]) -> None:
+        if index:
+            spool.write(b", ")
+        spool.write(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    def _copy(self, spool: BinaryIO) -> None:
+        spool.seek(0)
+        shutil.copyfileobj(spool, self.stream)
+
+
+class JUnitWriter(ReportWriter):
+    """JUnit XML with one test case per file.
+
+    Files with errors fail, files that could not be validated are errors
+    and warnings go to ``system-out``. The document is written with lxml's
+    incremental writer; since the totals are only known at the end they
+    are left off ``testsuite`` and go to its trailing ``system-out``.
+    """
+
+    format_name = "junit"
+
+    def __init__(self, stream: BinaryIO) -> None:
+        super().__init__(stream)
+        self._contexts = ExitStack()
+        self._xf: Any = None
+
+    def start(self) -> None:
+        self._xf = self._contexts.enter_context(etree.xmlfile(self.stream, encoding="utf-8"))
+        self._xf.write_declaration()
+        self._contexts.enter_context(self._xf.element("testsuites"))
+        self._contexts.enter_context(self._xf.element("testsuite", name=TOOL_NAME))
+
+    def _write(self, result: FileResult) -> None:
+        xf = self._xf
+        attributes = {"name": str(result.xml_path), "classname": TOOL_NAME}
+        if result.elapsed_ms is not None:
+            attributes["time"] = f"{result.elapsed_ms / 1000.0:.3f}"
+        with xf.element("testcase", attributes):
+            if result.failure is not None:
+                with xf.element("error", message=result.failure, type="VALIDATOR_ERROR"):
+                    pass
+            elif result.errors:
+                message = f"{result.errors} errores, {result.warnings} avisos"
+                with xf.element("failure", message=message, type=Severity.ERROR.value):
+                    self._write_issues(result)
+            elif result.warnings:
+                with xf.element("system-out"):
+                    self._write_issues(result)
+        xf.flush()
+
+    def _write_issues(self, result: FileResult) -> None:
+        for issue in result.issues:
+            self._xf.write(f"[{issue.level}] Linea {issue.line}, Columna {issue.column}: {issue.message}\n")
+        if result.truncated:
+            self._xf.write("Listado incompleto: se alcanzo el limite de incidencias.\n")
+
+    def _finish(self) -> None:
+        with self._xf.element("system-out"):
+            for name, value in self.summary.as_dict().items():
+                self._xf.write(f"{name}: {value}\n")
+        self._contexts.close()
+        self.stream.write(b"\n")
+
+
+REPORT_WRITERS: Dict[str, Type[ReportWriter]] = {
+    writer.format_name: writer for writer in (JsonLinesWriter, JsonWriter, SarifWriter, JUnitWriter)
+}
+
+
+def create_report_writer(format_name: str, stream: BinaryIO) -> ReportWriter:
+    try:
+        writer_class = REPORT_WRITERS[format_name]
+    except KeyError:
+        raise ValueError(f"Formato de informe desconocido: {format_name}") from None
+    return writer_class(stream)
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ..domain.models import ValidationReport, ValidationRequest
+from .reporting import decode_report, encode_report
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_FILE_NAME = "resultados.sqlite3"
+CACHE_DIR_ENV = "XSD_MANAGER_CACHE_DIR"
+SCHEMA_VERSION = 4
+DIGEST_CHUNK = 1 << 20
+EVICTION_BATCH = 64
+# Eviction frees down to this fraction of max_bytes, so it is not rerun on every put.
+EVICTION_LOW_WATER = 0.9
+
+
+def default_cache_path() -> Path:
+    """Per-user cache file; ``XSD_MANAGER_CACHE_DIR`` overrides the directory."""
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if directory:
+        return Path(directory) / CACHE_FILE_NAME
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "xsd_manager" / CACHE_FILE_NAME
+
+
+@dataclass(frozen=True)
+class ResultCacheStats:
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class ResultCache:
+    """On-disk cache of validation reports in a SQLite database.
+
+    Reports are stored as compressed JSON (the ``encode_report`` encoding,
+    never pickle: the file is shared by every tool of the user and must not
+    be able to run code) under a key built from the XML
+    content hash and the cache keys of the validators (which cover schema
+    content and validator version), so a hit is only possible for identical
+    input. When the stored reports exceed ``max_bytes`` the least recently
+    used ones are evicted, down to ``EVICTION_LOW_WATER`` of the limit; the
+    stored size is tracked as a running total and only summed again from the
+    database when that total crosses the limit. File content hashes are
+    remembered by path, mtime and size, so unchanged files are not read
+    again to compute their key; that also holds for in-memory content when
+    the request sets ``content_is_file``.
+
+    The database is opened lazily, once per process, and can be shared by
+    several processes. Any SQLite error disables the cache for the rest of
+    the run instead of failing the validation.
+    """
+
+    def __init__(self, path: Optional[str | Path] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes debe ser mayor que cero.")
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        # Bytes stored, as last summed plus this process's puts; None until summed.
+        self._size: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def __getstate__(self) -> dict:
+        # Connections and locks stay in their process; workers reopen the file.
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_connection"] = None
+        state["_size"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def content_digest(self, request: ValidationRequest) -> Optional[str]:
+        """Hash of the XML to validate, or None when it is a one-shot stream."""
+        content = request.xml_content
+        if content is None:
+            return self._file_digest(request.xml_path)
+        if not isinstance(content, (bytes, bytearray, memoryview)):
+            return None
+        if request.content_is_file:
+            # The caller vouches that this is the file itself (typically a
+            # MappedFile buffer): its hash may already be in the file table.
+            return self._file_digest(request.xml_path, memoryview(content))
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def make_key(content_digest: str, parts: Iterable[str]) -> str:
+        digest = hashlib.sha256(content_digest.encode("ascii"))
+        for part in parts:
+            digest.update(b"\0")
+            digest.update(part.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str, columnar: bool = False) -> Optional[ValidationReport]:
+        start = time.perf_counter()
+        with self._lock:
+            row = self._execute("SELECT report FROM results WHERE key = ?", (key,))
+            row = row.fetchone() if row is not None else None
+            if row is None:
+                self._misses += 1
+                return None
+            try:
+                report = decode_report(zlib.decompress(row[0]), columnar=columnar)
+            except (zlib.error, ValueError, KeyError, TypeError):
+                # Unreadable entry (truncated write, older format): drop it.
+                self._execute("DELETE FROM results WHERE key = ?", (key,))
+                self._misses += 1
+                return None
+            self._execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+            self._hits += 1
+        if report.metadata is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            # Stage timings belonged to the original run, not to this lookup.
+            report.metadata = replace(report.metadata, elapsed_ms=elapsed_ms, cached=True, stages={}, parts=[])
+        return report
+
+    def put(self, key: str, report: ValidationReport) -> None:
+        data = zlib.compress(encode_report(report), 1)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            stored = self._execute(
+                "INSERT OR REPLACE INTO results (key, report, size, used) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            if stored is None:
+                return
+            self._stores += 1
+            if self._size is not None:
+                self._size += len(data)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._execute("DELETE FROM results")
+            self._execute("DELETE FROM files")
+            self._hits = self._misses = self._stores = self._evictions = 0
+            self._size = None
+
+    def stats(self) -> ResultCacheStats:
+        with self._lock:
+            cursor = self._execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results")
+            entries, size = cursor.fetchone() if cursor is not None else (0, 0)
+            return ResultCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                stores=self._stores,
+                evictions=self._evictions,
+                entries=entries,
+                size_bytes=size,
+                max_bytes=self.max_bytes,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _file_digest(self, path: Path, mapped: Optional[memoryview] = None) -> Optional[str]:
+        try:
+            resolved = path.resolve()
+            stat = resolved.stat()
+        except OSError:
+            return None if mapped is None else hashlib.sha256(mapped).hexdigest()
+        if mapped is not None and mapped.nbytes != stat.st_size:
+            # Not a mapping of this file after all.
+            return hashlib.sha256(mapped).hexdigest()
+        with self._lock:
+            cursor = self._execute(
+                "SELECT digest FROM files WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (str(resolved), stat.st_mtime_ns, stat.st_size),
+            )
+            row = cursor.fetchone() if cursor is not None else None
+        if row is not None:
+            return row[0]
+
+        digest = hashlib.sha256()
+        if mapped is not None:
+            digest.update(mapped)
+        else:
+            try:
+                with open(resolved, "rb") as file:
+                    for chunk in iter(lambda: file.read(DIGEST_CHUNK), b""):
+                        digest.update(chunk)
+            except OSError:
+                return None
+        value = digest.hexdigest()
+        with self._lock:
+            self._execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+                (str(resolved), stat.st_mtime_ns, stat.st_size, value),
+            )
+        return value
+
+    def _evict(self) -> None:
+        if self._size is not None and self._size <= self.max_bytes:
+            return
+        # Sum again before evicting: other processes sharing the file store
+        # and evict entries this process's running total does not see.
+        cursor = self._execute("SELECT COALESCE(SUM(size), 0) FROM results")
+        if cursor is None:
+            return
+        total = cursor.fetchone()[0]
+        target = int(self.max_bytes * EVICTION_LOW_WATER) if total > self.max_bytes else total
+        while total > target:
+            cursor = self._execute(
+                "SELECT key, size FROM results ORDER BY used LIMIT ?", (EVICTION_BATCH,)
+            )
+            rows = cursor.fetchall() if cursor is not None else []
+            if not rows:
+                break
+            doomed = []
+            for key, size in rows:
+                if total <= target:
+                    break
+                doomed.append((key,))
+                total -= size
+            if self._connection is None:
+                return
+            try:
+                self._connection.executemany("DELETE FROM results WHERE key = ?", doomed)
+            except sqlite3.Error:
+                self._disable()
+                return
+            self._evictions += len(doomed)
+        self._size = total
+
+    def _execute(self, sql: str, parameters: tuple = ()) -> Optional[sqlite3.Cursor]:
+        connection = self._connect()
+        if connection is None:
+            return None
+        try:
+            return connection.execute(sql, parameters)
+        except sqlite3.Error:
+            self._disable()
+            return None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._connection is not None or self._disabled:
+            return self._connection
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                str(self.path),
+                timeout=30.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS results")
+                connection.execute("DROP TABLE IF EXISTS files")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, report BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, digest TEXT NOT NULL)"
+            )
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except (OSError, sqlite3.Error):
+            self._disabled = True
+            return None
+        self._connection = connection
+        return connection
+
+    def _disable(self) -> None:
+        self._disabled = True
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1 @@
+"""Generation of XML documents from XSD schemas."""
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import random
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import re._constants as _sre
+    import re._parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre  # type: ignore[no-redef]
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+
+class PatternError(ValueError):
+    """An XSD pattern this module cannot translate or sample."""
+
+
+# Multi-character escapes of XML Schema regular expressions that Python lacks,
+# narrowed to ASCII: generated values only need to match, not to cover them.
+_NAME_ESCAPES = {
+    "i": ("A-Za-z_:", False),
+    "I": ("A-Za-z_:", True),
+    "c": (r"A-Za-z0-9._:\-", False),
+    "C": (r"A-Za-z0-9._:\-", True),
+}
+_CATEGORY_CLASSES = {
+    "L": "A-Za-z",
+    "Lu": "A-Z",
+    "Ll": "a-z",
+    "N": "0-9",
+    "Nd": "0-9",
+    "P": ".,;:!?",
+    "Z": " ",
+    "Zs": " ",
+}
+
+# Characters tried for negated classes, "." and violations, in this order.
+_POOL = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,-_"
+_INVALID_CANDIDATES = ("@", "#~", "@@@@", "~", "!", "0", "a", " ")
+
+# Upper bound for "*", "+" and "{n,}" when no length facet gives a better one.
+DEFAULT_UNBOUNDED = 8
+
+
+def translate(pattern: str) -> str:
+    """Rewrite an XSD pattern as an anchored Python regular expression."""
+    out: List[str] = []
+    in_class = False
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\" and index + 1 < len(pattern):
+            escape = pattern[index + 1]
+            index += 2
+            if escape in _NAME_ESCAPES or escape in "pP":
+                if escape in "pP":
+                    close = pattern.find("}", index)
+                    if not pattern.startswith("{", index) or close < 0:
+                        raise PatternError(f"Escape \\{escape} mal formado en {pattern!r}")
+                    name = pattern[index + 1 : close]
+                    index = close + 1
+                    chars = _CATEGORY_CLASSES.get(name) or _CATEGORY_CLASSES.get(name[:1])
+                    if chars is None:
+                        raise PatternError(f"Categoria Unicode no soportada: \\{escape}{{{name}}}")
+                    negated = escape == "P"
+                else:
+                    chars, negated = _NAME_ESCAPES[escape]
+                if not in_class:
+                    out.append(f"[{'^' if negated else ''}{chars}]")
+                elif negated:
+                    raise PatternError(f"Escape negado dentro de una clase no soportado: {pattern!r}")
+                else:
+                    out.append(chars)
+            else:
+                out.append("\\" + escape)
+            continue
+        if in_class:
+            if char == "-" and pattern.startswith("[", index + 1):
+                raise PatternError(f"Resta de clases de caracteres no soportada: {pattern!r}")
+            if char == "]":
+                in_class = False
+            out.append(char)
+        elif char == "[":
+            in_class = True
+            out.append(char)
+            if pattern.startswith("^", index + 1):
+                out.append("^")
+                index += 1
+        elif char in "^$":
+            # Ordinary characters in XSD: patterns have no anchors.
+            out.append("\\" + char)
+        else:
+            out.append(char)
+        index += 1
+    # XSD patterns always match the whole value.
+    return "(?:" + "".join(out) + r")\Z"
+
+
+class PatternSampler:
+    """Random strings matching one step of XSD patterns (any of ``patterns``).
+
+    Every pattern is parsed once. ``sample()`` walks the parse tree with
+    repetition counts drawn up to ``max_length`` (or DEFAULT_UNBOUNDED for
+    open repetitions) and retries until the value also satisfies the length
+    bounds; ``invalid()`` returns a value none of the patterns accept.
+    """
+
+    def __init__(self, patterns: Sequence[str], min_length: int = 0, max_length: Optional[int] = None) -> None:
+        if not patterns:
+            raise PatternError("Se necesita al menos un patron.")
+        self.patterns = list(patterns)
+        self.min_length = min_length
+        self.max_length = max_length
+        self._compiled: List[re.Pattern] = []
+        self._trees: List[object] = []
+        for pattern in self.patterns:
+            source = translate(pattern)
+            try:
+                self._compiled.append(re.compile(source))
+                self._trees.append(_sre_parse.parse(source))
+            except re.error as exc:
+                raise PatternError(f"Patron no valido {pattern!r}: {exc}") from exc
+        self._classes: Dict[int, Callable[[random.Random], str]] = {}
+
+    def matches(self, value: str) -> bool:
+        return any(compiled.match(value) for compiled in self._compiled)
+
+    def sample(self, rng: random.Random, attempts: int = 64) -> str:
+        cap = DEFAULT_UNBOUNDED
+        if self.max_length is not None:
+            cap = max(1, min(cap, self.max_length))
+        for _ in range(attempts):
+            tree = self._trees[rng.randrange(len(self._trees))]
+            parts: List[str] = []
+            self._emit(tree, rng, parts, cap)
+            value = "".join(parts)
+            if self._length_ok(value):
+                return value
+            if self.max_length is not None and len(value) > self.max_length:
+                cap = max(1, cap // 2)
+            elif len(value) < self.min_length:
+                cap += max(1, self.min_length - len(value))
+        raise PatternError(
+            f"No se encontro un valor de {self.min_length}-{self.max_length} caracteres "
+            f"para el patron {' | '.join(self.patterns)}"
+        )
+
+    def invalid(self, valid: str) -> Optional[str]:
+        for candidate in (*_INVALID_CANDIDATES, valid + "@", "@" + valid):
+            if not self.matches(candidate):
+                return candidate
+        return None
+
+    def _length_ok(self, value: str) -> bool:
+        if len(value) < self.min_length:
+            return False
+        return self.max_length is None or len(value) <= self.max_length
+
+    def _emit(self, tree, rng: random.Random, out: List[str], cap: int) -> None:
+        for op, av in tree:
+            if op is _sre.LITERAL:
+                out.append(chr(av))
+            elif op is _sre.NOT_LITERAL:
+                out.append("a" if chr(av) != "a" else "b")
+            elif op is _sre.ANY:
+                out.append(rng.choice(_POOL[:62]))
+            elif op is _sre.IN:
+                out.append(self._class_sampler(av)(rng))
+            elif op in _REPEATS:
+                low, high, item = av
+                high = low + cap if high == _sre.MAXREPEAT else high
+                for _ in range(rng.randint(low, max(low, min(high, low + cap)))):
+                    self._emit(item, rng, out, cap)
+            elif op is _sre.SUBPATTERN:
+                self._emit(av[-1], rng, out, cap)
+            elif op is _sre.BRANCH:
+                self._emit(rng.choice(av[1]), rng, out, cap)
+            elif op is _sre.AT:
+                continue
+            else:
+                raise PatternError(f"Construccion de patron no soportada: {op}")
+
+    def _class_sampler(self, items) -> Callable[[random.Random], str]:
+        key = id(items)
+        sampler = self._classes.get(key)
+        if sampler is None:
+            sampler = self._classes[key] = _class_sampler(items)
+        return sampler
+
+
+_REPEATS = tuple(
+    getattr(_sre, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") if hasattr(_sre, name)
+)
+
+_CATEGORY_CHARS = {
+    "CATEGORY_DIGIT": "0123456789",
+    "CATEGORY_NOT_DIGIT": "abcdefghijklmnopqrstuvwxyz",
+    "CATEGORY_WORD": "abcdefghijklmnopqrstuvwxyz0123456789",
+    "CATEGORY_NOT_WORD": " .,-",
+    "CATEGORY_SPACE": " ",
+    "CATEGORY_NOT_SPACE": "abcdefghijklmnopqrstuvwxyz",
+}
+
+
+def _class_sampler(items) -> Callable[[random.Random], str]:
+    """A character picker for an ``IN`` node: a set of literals, ranges and categories."""
+    negate = bool(items) and items[0][0] is _sre.NEGATE
+    ranges: List[Tuple[int, int]] = []
+    for op, av in items[1:] if negate else items:
+        if op is _sre.LITERAL:
+            ranges.append((av, av))
+        elif op is _sre.RANGE:
+            ranges.append(av)
+        elif op is _sre.CATEGORY:
+            chars = _CATEGORY_CHARS.get(str(av))
+            if chars is None:
+                raise PatternError(f"Clase de caracteres no soportada: {av}")
+            ranges.extend((ord(char), ord(char)) for char in chars)
+        else:
+            raise PatternError(f"Clase de caracteres no soportada: {op}")
+
+    if negate:
+        allowed = [char for char in _POOL if not any(low <= ord(char) <= high for low, high in ranges)]
+        if not allowed:
+            raise PatternError("La clase negada excluye todos los caracteres de prueba.")
+        return lambda rng: rng.choice(allowed)
+
+    # Pick a range in proportion to its size, then a character inside it.
+    weights = [high - low + 1 for low, high in ranges]
+    total = sum(weights)
+
+    def pick(rng: random.Random) -> str:
+        offset = rng.randrange(total)
+        for (low, high), weight in zip(ranges, weights):
+            if offset < weight:
+                return chr(low + offset)
+            offset -= weight
+        raise AssertionError("unreachable")
+
+    return pick
@@ -0,0 +1,901 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal, InvalidOperation
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape, quoteattr
+
+import lxml.etree as etree
+
+from ..validators.schema_cache import XSD_NS
+from .patterns import PatternError, PatternSampler
+
+
+DEFAULT_SEED = 20260228
+DEFAULT_MAX_OCCURS = 3
+DEFAULT_MAX_DEPTH = 12
+
+# Recursive content models stop growing at ``max_depth``; a required
+# recursion deeper than this is a schema the generator cannot finish.
+_HARD_DEPTH = 64
+
+_XSD = f"{{{XSD_NS}}}"
+_PARTICLE_TAGS = {_XSD + name for name in ("element", "sequence", "choice", "all", "group", "any")}
+
+_INTEGER_BOUNDS: Dict[str, Tuple[Optional[int], Optional[int]]] = {
+    "integer": (None, None),
+    "long": (-(2**63), 2**63 - 1),
+    "int": (-(2**31), 2**31 - 1),
+    "short": (-(2**15), 2**15 - 1),
+    "byte": (-128, 127),
+    "nonNegativeInteger": (0, None),
+    "positiveInteger": (1, None),
+    "nonPositiveInteger": (None, 0),
+    "negativeInteger": (None, -1),
+    "unsignedLong": (0, 2**64 - 1),
+    "unsignedInt": (0, 2**32 - 1),
+    "unsignedShort": (0, 2**16 - 1),
+    "unsignedByte": (0, 255),
+}
+_DECIMAL_TYPES = {"decimal", "float", "double"}
+_STRING_TYPES = {"string", "normalizedString", "token", "language", "Name", "NCName", "NMTOKEN", "anySimpleType"}
+_FIXED_SAMPLES = {
+    "boolean": ("true", "false"),
+    "anyURI": ("https://example.com/recurso",),
+    "base64Binary": ("QUJDRA==",),
+    "hexBinary": ("0A1B2C3D",),
+    "duration": ("P1D", "PT2H30M", "P1Y2M"),
+    "QName": ("valor",),
+    "gYear": ("2026",),
+    "gYearMonth": ("2026-02",),
+    "gMonthDay": ("--02-28",),
+    "gDay": ("---28",),
+    "gMonth": ("--02",),
+}
+_INVALID_SAMPLES = {
+    "boolean": "quizas",
+    "date": "2026-13-45",
+    "dateTime": "2026-02-30T25:61:00",
+    "time": "25:61:00",
+    "duration": "1D",
+    "gYear": "veinte",
+}
+
+
+class GeneratorError(Exception):
+    """The schema uses a construct the generator cannot produce documents for."""
+
+
+@dataclass
+class GenerationStats:
+    documents: int = 0
+    bytes_written: int = 0
+    elements: int = 0
+    violations: int = 0
+
+    def add(self, other: "GenerationStats") -> None:
+        self.documents += other.documents
+        self.bytes_written += other.bytes_written
+        self.elements += other.elements
+        self.violations += other.violations
+
+
+@dataclass
+class _SimpleType:
+    builtin: str
+    enumeration: List[str] = field(default_factory=list)
+    patterns: List[List[str]] = field(default_factory=list)
+    length: Optional[int] = None
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    min_inclusive: Optional[str] = None
+    max_inclusive: Optional[str] = None
+    min_exclusive: Optional[str] = None
+    max_exclusive: Optional[str] = None
+    total_digits: Optional[int] = None
+    fraction_digits: Optional[int] = None
+    item: Optional["_SimpleType"] = None
+    members: List["_SimpleType"] = field(default_factory=list)
+    samplers: List[PatternSampler] = field(default_factory=list)
+    number_range: Optional[Tuple[int, int, int]] = None
+
+    def derive(self) -> "_SimpleType":
+        # Facets of a restriction replace those of its base, except patterns,
+        # which must all match: one list per derivation step.
+        return _SimpleType(
+            builtin=self.builtin,
+            enumeration=list(self.enumeration),
+            patterns=[list(step) for step in self.patterns],
+            length=self.length,
+            min_length=self.min_length,
+            max_length=self.max_length,
+            min_inclusive=self.min_inclusive,
+            max_inclusive=self.max_inclusive,
+            min_exclusive=self.min_exclusive,
+            max_exclusive=self.max_exclusive,
+            total_digits=self.total_digits,
+            fraction_digits=self.fraction_digits,
+            item=self.item,
+            members=list(self.members),
+        )
+
+
+@dataclass
+class _Attribute:
+    name: str
+    qualified: bool
+    simple: Optional[_SimpleType]
+    required: bool
+    fixed: Optional[str] = None
+
+
+@dataclass
+class _Particle:
+    kind: str
+    min_occurs: int
+    max_occurs: Optional[int]
+    name: Optional[str] = None
+    node: Optional[etree._Element] = None
+    children: List["_Particle"] = field(default_factory=list)
+
+    @property
+    def repeatable(self) -> bool:
+        return self.max_occurs is None or self.max_occurs > 1
+
+
+@dataclass
+class _ComplexType:
+    attributes: List[_Attribute] = field(default_factory=list)
+    content: List[_Particle] = field(default_factory=list)
+    simple: Optional[_SimpleType] = None
+
+
+@dataclass
+class _Declaration:
+    tag: str
+    complex_type: Optional[_ComplexType]
+    simple: Optional[_SimpleType]
+    fixed: Optional[str]
+    substitutes: List[etree._Element]
+
+
+@dataclass
+class _Schema:
+    target_namespace: Optional[str]
+    elements: Dict[str, etree._Element] = field(default_factory=dict)
+    complex_types: Dict[str, etree._Element] = field(default_factory=dict)
+    simple_types: Dict[str, etree._Element] = field(default_factory=dict)
+    groups: Dict[str, etree._Element] = field(default_factory=dict)
+    attribute_groups: Dict[str, etree._Element] = field(default_factory=dict)
+    attributes: Dict[str, etree._Element] = field(default_factory=dict)
+    substitutes: Dict[str, List[etree._Element]] = field(default_factory=dict)
+    first_element: Optional[str] = None
+    unqualified_locals: bool = False
+    qualified_attributes: bool = False
+
+
+class _Output:
+    """Buffered UTF-8 writer that counts what it writes."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.bytes_written = 0
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self.bytes_written += len(data)
+        self.file.write(data)
+
+
+@dataclass
+class _Run:
+    rng: random.Random
+    out: _Output
+    stats: GenerationStats
+    target_bytes: Optional[int]
+    repeat_element: Optional[str]
+    growing: bool
+    ids: int = 0
+
+
+class XmlGenerator:
+    """Write random XML documents that follow an XSD, for test and load corpora.
+
+    The schema and its ``xs:include`` files are read once; types are resolved
+    on first use and kept, so generating many documents only pays for
+    writing them. Documents are written straight to disk as they are
+    generated, element by element, so memory stays flat however large they
+    get. Values honour enumerations, patterns, length, range and digit
+    facets. Repeated elements get between ``minOccurs`` and ``max_occurs``
+    occurrences and optional ones appear with probability ``optional_rate``.
+
+    ``fault_rate`` is the fraction of simple values (element text and
+    attributes) replaced by one that breaks a facet or the built-in type;
+    values with nothing to break, such as an unrestricted xs:string, stay
+    valid, so the number actually injected is reported in
+    GenerationStats.violations. The same ``seed`` always produces the same
+    documents.
+
+    Only the target namespace of the schema is supported: ``xs:import``,
+    ``xs:any`` and identity constraints are ignored, and ``xs:redefine`` is
+    read like ``xs:include``.
+    """
+
+    def __init__(
+        self,
+        xsd_path: Union[str, Path],
+        *,
+        root: Optional[str] = None,
+        seed: int = DEFAULT_SEED,
+        max_occurs: int = DEFAULT_MAX_OCCURS,
+        optional_rate: float = 0.5,
+        fault_rate: float = 0.0,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+    ) -> None:
+        if max_occurs < 1:
+            raise ValueError("max_occurs debe ser mayor que cero.")
+        if not 0.0 <= optional_rate <= 1.0 or not 0.0 <= fault_rate <= 1.0:
+            raise ValueError("optional_rate y fault_rate deben estar entre 0 y 1.")
+        self.xsd_path = Path(xsd_path)
+        self.seed = seed
+        self.max_occurs = max_occurs
+        self.optional_rate = optional_rate
+        self.fault_rate = fault_rate
+        self.max_depth = max_depth
+        self._schema = self._load(self.xsd_path)
+        self.root = root or self._schema.first_element
+        if self.root is None or self.root not in self._schema.elements:
+            raise GeneratorError(f"El XSD no declara el elemento raiz {self.root or ''}".rstrip() + ".")
+        self._simple_cache: Dict[etree._Element, _SimpleType] = {}
+        self._complex_cache: Dict[etree._Element, _ComplexType] = {}
+        self._builtins: Dict[str, _SimpleType] = {}
+        self._declarations: Dict[etree._Element, _Declaration] = {}
+
+    def write(
+        self,
+        path: Union[str, Path],
+        *,
+        target_bytes: Optional[int] = None,
+        repeat_element: Optional[str] = None,
+        index: int = 0,
+    ) -> GenerationStats:
+        """Write one document to ``path``.
+
+        With ``target_bytes`` the first repeatable element (or the one named
+        ``repeat_element``) is repeated until the file reaches about that
+        size; the elements after it are added on top. ``index`` selects the
+        document of the seeded sequence.
+        """
+        stats = GenerationStats(documents=1)
+        rng = random.Random(self.seed * 1_000_003 + index)
+        with open(path, "wb") as file:
+            out = _Output(file)
+            run = _Run(
+                rng=rng,
+                out=out,
+                stats=stats,
+                target_bytes=target_bytes,
+                repeat_element=repeat_element,
+                growing=target_bytes is not None,
+            )
+            out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            root = _Particle(kind="element", min_occurs=1, max_occurs=1, name=self.root, node=self._schema.elements[self.root])
+            self._write_element(run, root, 0, top=True)
+            out.write("\n")
+        if run.growing:
+            Path(path).unlink(missing_ok=True)
+            which = f"llamado {repeat_element}" if repeat_element else "repetible"
+            raise GeneratorError(f"El documento no tiene ningun elemento {which} con el que alcanzar el tamano pedido.")
+        stats.bytes_written = out.bytes_written
+        return stats
+
+    def write_corpus(
+        self,
+        directory: Union[str, Path],
+        count: int,
+        *,
+        prefix: str = "doc",
+        target_bytes: Optional[int] = None,
+        repeat_element: Optional[str] = None,
+    ) -> GenerationStats:
+        """Write ``count`` documents named ``<prefix>_000001.xml`` and so on."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        width = max(6, len(str(count)))
+        stats = GenerationStats()
+        for index in range(count):
+            stats.add(
+                self.write(
+                    directory / f"{prefix}_{index + 1:0{width}d}.xml",
+                    target_bytes=target_bytes,
+                    repeat_element=repeat_element,
+                    index=index,
+                )
+            )
+        return stats
+
+    # -- schema loading ---------------------------------------------------
+
+    def _load(self, path: Path) -> _Schema:
+        try:
+            main = etree.parse(str(path)).getroot()
+        except (OSError, etree.XMLSyntaxError) as exc:
+            raise GeneratorError(f"No se pudo leer el XSD {path}: {exc}") from exc
+        schema = _Schema(target_namespace=main.get("targetNamespace"))
+        pending = [(path.resolve(), main)]
+        seen = {path.resolve()}
+        while pending:
+            current, root = pending.pop(0)
+            self._index(schema, root)
+            for include in root.iterchildren(_XSD + "include", _XSD + "redefine"):
+                location = include.get("schemaLocation")
+                if not location:
+                    continue
+                included = (current.parent / location).resolve()
+                if included in seen:
+                    continue
+                seen.add(included)
+                try:
+                    pending.append((included, etree.parse(str(included)).getroot()))
+                except (OSError, etree.XMLSyntaxError) as exc:
+                    raise GeneratorError(f"No se pudo leer el XSD incluido {location}: {exc}") from exc
+        return schema
+
+    @staticmethod
+    def _index(schema: _Schema, root: etree._Element) -> None:
+        qualified = root.get("elementFormDefault") == "qualified"
+        tables = {
+            _XSD + "element": schema.elements,
+            _XSD + "complexType": schema.complex_types,
+            _XSD + "simpleType": schema.simple_types,
+            _XSD + "group": schema.groups,
+            _XSD + "attributeGroup": schema.attribute_groups,
+            _XSD + "attribute": schema.attributes,
+        }
+        for child in root:
+            table = tables.get(child.tag)
+            name = child.get("name")
+            if table is None or name is None:
+                continue
+            table.setdefault(name, child)
+            if child.tag != _XSD + "element":
+                continue
+            if schema.first_element is None and child.get("abstract") != "true":
+                schema.first_element = name
+            group = child.get("substitutionGroup")
+            if group:
+                schema.substitutes.setdefault(_local(group), []).append(child)
+        for element in root.iter(_XSD + "element"):
+            if element.getparent() is root or element.get("ref"):
+                continue
+            form = element.get("form")
+            if form == "unqualified" or (form is None and not qualified):
+                schema.unqualified_locals = True
+        if (
+            root.get("attributeFormDefault") == "qualified"
+            or root.find(_XSD + "attribute") is not None
+            or any(attribute.get("form") == "qualified" for attribute in root.iter(_XSD + "attribute"))
+        ):
+            schema.qualified_attributes = True
+
+    # -- type resolution --------------------------------------------------
+
+    def _type_ref(self, node: etree._Element, qname: str) -> Tuple[Optional[_ComplexType], Optional[_SimpleType]]:
+        namespace, name = _resolve_qname(node, qname)
+        if namespace == XSD_NS:
+            if name == "anyType":
+                return _ComplexType(), None
+            return None, self._builtin(name)
+        if namespace != self._schema.target_namespace:
+            raise GeneratorError(f"Tipo de otro espacio de nombres no soportado: {qname}")
+        if name in self._schema.simple_types:
+            return None, self._simple_type(self._schema.simple_types[name])
+        if name in self._schema.complex_types:
+            return self._complex_type(self._schema.complex_types[name]), None
+        raise GeneratorError(f"Tipo no declarado: {qname}")
+
+    def _builtin(self, name: str) -> _SimpleType:
+        simple = self._builtins.get(name)
+        if simple is None:
+            simple = self._builtins[name] = _SimpleType(builtin=name)
+        return simple
+
+    def _simple_ref(self, node: etree._Element, qname: str) -> _SimpleType:
+        complex_type, simple = self._type_ref(node, qname)
+        if simple is None:
+            assert complex_type is not None
+            if complex_type.simple is None:
+                raise GeneratorError(f"Se esperaba un tipo simple: {qname}")
+            return complex_type.simple
+        return simple
+
+    def _simple_type(self, node: etree._Element) -> _SimpleType:
+        cached = self._simple_cache.get(node)
+        if cached is not None:
+            return cached
+        restriction = node.find(_XSD + "restriction")
+        list_node = node.find(_XSD + "list")
+        union = node.find(_XSD + "union")
+        if restriction is not None:
+            simple = self._restrict(restriction)
+        elif list_node is not None:
+            simple = _SimpleType(builtin="list", item=self._inline_or_ref(list_node, "itemType"))
+        elif union is not None:
+            members = [self._simple_ref(union, qname) for qname in (union.get("memberTypes") or "").split()]
+            members.extend(self._simple_type(child) for child in union.iterchildren(_XSD + "simpleType"))
+            if not members:
+                raise GeneratorError("Union sin tipos miembro.")
+            simple = _SimpleType(builtin="union", members=members)
+        else:
+            raise GeneratorError(f"Tipo simple no soportado: {node.get('name') or 'anonimo'}")
+        self._simple_cache[node] = simple
+        return simple
+
+    def _inline_or_ref(self, node: etree._Element, attribute: str) -> _SimpleType:
+        inline = node.find(_XSD + "simpleType")
+        if inline is not None:
+            return self._simple_type(inline)
+        qname = node.get(attribute)
+        if not qname:
+            return self._builtin("anySimpleType")
+        return self._simple_ref(node, qname)
+
+    def _restrict(self, restriction: etree._Element) -> _SimpleType:
+        simple = self._inline_or_ref(restriction, "base").derive()
+        enumeration: List[str] = []
+        patterns: List[str] = []
+        for facet in restriction:
+            if not isinstance(facet.tag, str) or not facet.tag.startswith(_XSD):
+                continue
+            name = facet.tag[len(_XSD) :]
+            value = facet.get("value")
+            if value is None:
+                continue
+            if name == "enumeration":
+                enumeration.append(value)
+            elif name == "pattern":
+                patterns.append(value)
+            elif name in ("length", "minLength", "maxLength", "totalDigits", "fractionDigits"):
+                setattr(simple, _snake(name), int(value))
+            elif name in ("minInclusive", "maxInclusive", "minExclusive", "maxExclusive"):
+                setattr(simple, _snake(name), value)
+        if enumeration:
+            simple.enumeration = enumeration
+        if patterns:
+            simple.patterns.append(patterns)
+        return simple
+
+    def _complex_type(self, node: etree._Element) -> _ComplexType:
+        cached = self._complex_cache.get(node)
+        if cached is not None:
+            return cached
+        complex_type = _ComplexType()
+        # Registered before resolving the content so recursive types terminate.
+        self._complex_cache[node] = complex_type
+
+        simple_content = node.find(_XSD + "simpleContent")
+        complex_content = node.find(_XSD + "complexContent")
+        if simple_content is not None:
+            derivation = _derivation(simple_content)
+            base_complex, base_simple = self._type_ref(derivation, derivation.get("base") or "xs:string")
+            if base_complex is not None:
+                complex_type.attributes = list(base_complex.attributes)
+                base_simple = base_complex.simple
+            if derivation.tag == _XSD + "restriction" and base_simple is not None:
+                base_simple = self._restrict(derivation)
+            complex_type.simple = base_simple or self._builtin("string")
+            self._merge_attributes(complex_type, derivation)
+        elif complex_content is not None:
+            derivation = _derivation(complex_content)
+            base_complex, _ = self._type_ref(derivation, derivation.get("base") or "xs:anyType")
+            if base_complex is None:
+                raise GeneratorError(f"complexContent con base simple: {derivation.get('base')}")
+            complex_type.attributes = list(base_complex.attributes)
+            complex_type.content = self._particles(derivation)[:1]
+            if derivation.tag == _XSD + "extension":
+                complex_type.content = base_complex.content + complex_type.content
+            self._merge_attributes(complex_type, derivation)
+        else:
+            # A content model has a single particle; extensions append theirs to the base's.
+            complex_type.content = self._particles(node)[:1]
+            self._merge_attributes(complex_type, node)
+        return complex_type
+
+    def _merge_attributes(self, complex_type: _ComplexType, node: etree._Element) -> None:
+        for attribute in self._attributes(node):
+            complex_type.attributes = [a for a in complex_type.attributes if a.name != attribute.name]
+            if attribute.simple is not None:
+                complex_type.attributes.append(attribute)
+
+    def _attributes(self, node: etree._Element, seen: Optional[set] = None) -> List[_Attribute]:
+        seen = seen if seen is not None else set()
+        qualified_default = _schema_root(node).get("attributeFormDefault") == "qualified"
+        result: List[_Attribute] = []
+        for child in node:
+            if child.tag == _XSD + "attributeGroup" and child.get("ref"):
+                name = _local(child.get("ref", ""))
+                group = self._schema.attribute_groups.get(name)
+                if group is None:
+                    raise GeneratorError(f"Grupo de atributos no declarado: {name}")
+                if name not in seen:
+                    seen.add(name)
+                    result.extend(self._attributes(group, seen))
+            elif child.tag == _XSD + "attribute":
+                declaration = child
+                ref = child.get("ref")
+                if ref:
+                    namespace, name = _resolve_qname(child, ref)
+                    if namespace == "http://www.w3.org/XML/1998/namespace":
+                        continue
+                    declaration = self._schema.attributes.get(name)
+                    if declaration is None:
+                        raise GeneratorError(f"Atributo no declarado: {ref}")
+                    qualified = self._schema.target_namespace is not None
+                else:
+                    name = child.get("name", "")
+                    form = child.get("form")
+                    qualified = bool(self._schema.target_namespace) and (
+                        form == "qualified" or (form is None and qualified_default)
+                    )
+                use = child.get("use", "optional")
+                simple = None
+                if use != "prohibited":
+                    simple = self._inline_or_ref(declaration, "type")
+                result.append(
+                    _Attribute(
+                        name=name,
+                        qualified=qualified,
+                        simple=simple,
+                        required=use == "required",
+                        fixed=child.get("fixed") or declaration.get("fixed"),
+                    )
+                )
+        return result
+
+    # -- writing ----------------------------------------------------------
+
+    def _write_element(self, run: _Run, particle: "_Particle", depth: int, top: bool = False) -> None:
+        if depth > _HARD_DEPTH:
+            raise GeneratorError(f"Recursion obligatoria demasiado profunda en {particle.name}")
+        assert particle.node is not None
+        declaration = self._declaration(particle.node)
+        while declaration.substitutes:
+            declaration = self._declaration(run.rng.choice(declaration.substitutes))
+
+        complex_type = declaration.complex_type
+        tag = declaration.tag
+        out = run.out
+        out.write(f"<{tag}" if top else f"\n{'  ' * depth}<{tag}")
+        if top and self._schema.target_namespace:
+            namespace = quoteattr(self._schema.target_namespace)
+            if not self._schema.unqualified_locals:
+                out.write(f" xmlns={namespace}")
+            if self._schema.unqualified_locals or self._schema.qualified_attributes:
+                out.write(f" xmlns:t={namespace}")
+        if complex_type is not None:
+            for attribute in complex_type.attributes:
+                if not attribute.required and attribute.fixed is None and run.rng.random() >= self.optional_rate:
+                    continue
+                assert attribute.simple is not None
+                value = attribute.fixed if attribute.fixed is not None else self._value(run, attribute.simple)
+                out.write(f" {self._tag(attribute.name, attribute.qualified, attribute=True)}={quoteattr(value)}")
+        run.stats.elements += 1
+
+        if declaration.simple is None:
+            assert complex_type is not None
+            if not complex_type.content:
+                out.write("/>")
+                return
+            out.write(">")
+            for child in complex_type.content:
+                self._write_particle(run, child, depth + 1)
+            out.write(f"\n{'  ' * depth}</{tag}>")
+            return
+        fixed = declaration.fixed
+        value = fixed if fixed is not None else self._value(run, declaration.simple)
+        out.write(f">{escape(value)}</{tag}>")
+
+    def _declaration(self, node: etree._Element) -> "_Declaration":
+        cached = self._declarations.get(node)
+        if cached is not None:
+            return cached
+        ref = node.get("ref")
+        if ref:
+            name = _local(ref)
+            declaration = self._schema.elements.get(name)
+            if declaration is None:
+                raise GeneratorError(f"Elemento no declarado: {ref}")
+            result = self._declaration(declaration)
+        else:
+            name = node.get("name", "")
+            root = _schema_root(node)
+            form = node.get("form")
+            qualified = bool(self._schema.target_namespace) and (
+                node.getparent() is root
+                or form == "qualified"
+                or (form is None and root.get("elementFormDefault") == "qualified")
+            )
+            substitutes: List[etree._Element] = []
+            complex_type: Optional[_ComplexType] = None
+            simple: Optional[_SimpleType] = None
+            if node.get("abstract") == "true":
+                substitutes = self._schema.substitutes.get(name, [])
+                if not substitutes:
+                    raise GeneratorError(f"Elemento abstracto sin sustitutos: {name}")
+            else:
+                complex_type, simple = self._declared_type(node)
+                if simple is None and complex_type is not None:
+                    simple = complex_type.simple
+            result = _Declaration(
+                tag=self._tag(name, qualified),
+                complex_type=complex_type,
+                simple=simple,
+                fixed=node.get("fixed"),
+                substitutes=substitutes,
+            )
+        self._declarations[node] = result
+        return result
+
+    def _declared_type(self, declaration: etree._Element) -> Tuple[Optional[_ComplexType], Optional[_SimpleType]]:
+        inline_complex = declaration.find(_XSD + "complexType")
+        if inline_complex is not None:
+            return self._complex_type(inline_complex), None
+        inline_simple = declaration.find(_XSD + "simpleType")
+        if inline_simple is not None:
+            return None, self._simple_type(inline_simple)
+        type_name = declaration.get("type")
+        if type_name:
+            return self._type_ref(declaration, type_name)
+        group = declaration.get("substitutionGroup")
+        if group and _local(group) in self._schema.elements:
+            return self._declared_type(self._schema.elements[_local(group)])
+        return _ComplexType(), None
+
+    def _tag(self, name: str, qualified: bool, attribute: bool = False) -> str:
+        if qualified and (attribute or self._schema.unqualified_locals):
+            return f"t:{name}"
+        return name
+
+    def _particles(self, node: etree._Element) -> List["_Particle"]:
+        """The particles among the children of ``node``, group references expanded."""
+        particles = []
+        for child in node:
+            if child.tag not in _PARTICLE_TAGS or child.tag == _XSD + "any":
+                continue
+            particle = _Particle(
+                kind=child.tag[len(_XSD) :],
+                min_occurs=int(child.get("minOccurs", "1")),
+                max_occurs=None if child.get("maxOccurs") == "unbounded" else int(child.get("maxOccurs", "1")),
+            )
+            if particle.kind == "element":
+                particle.node = child
+                particle.name = child.get("name") or _local(child.get("ref", ""))
+            elif particle.kind == "group":
+                name = _local(child.get("ref", ""))
+                group = self._schema.groups.get(name)
+                if group is None:
+                    raise GeneratorError(f"Grupo no declarado: {name}")
+                model = next((item for item in group if item.tag in _PARTICLE_TAGS), None)
+                if model is None:
+                    continue
+                particle.kind = model.tag[len(_XSD) :]
+                particle.children = self._particles(model)
+            else:
+                particle.children = self._particles(child)
+            particles.append(particle)
+        return particles
+
+    def _write_particle(self, run: _Run, particle: "_Particle", depth: int) -> None:
+        if particle.kind == "element":
+            if run.growing and particle.repeatable and run.repeat_element in (None, particle.name):
+                run.growing = False
+                assert run.target_bytes is not None
+                written = 0
+                while written < max(1, particle.min_occurs) or run.out.bytes_written < run.target_bytes:
+                    self._write_element(run, particle, depth)
+                    written += 1
+                return
+            for _ in range(self._occurrences(run, particle, depth)):
+                self._write_element(run, particle, depth)
+            return
+        for _ in range(self._occurrences(run, particle, depth)):
+            if particle.kind == "choice":
+                if particle.children:
+                    self._write_particle(run, run.rng.choice(particle.children), depth)
+                continue
+            for child in particle.children:
+                self._write_particle(run, child, depth)
+
+    def _occurrences(self, run: _Run, particle: "_Particle", depth: int) -> int:
+        low = particle.min_occurs
+        high = particle.max_occurs
+        if depth >= self.max_depth:
+            return low
+        if high == 1:
+            return 1 if low == 1 or run.rng.random() < self.optional_rate else 0
+        upper = self.max_occurs if high is None else min(high, self.max_occurs)
+        return run.rng.randint(low, max(low, upper))
+
+    # -- values -----------------------------------------------------------
+
+    def _value(self, run: _Run, simple: _SimpleType) -> str:
+        if self.fault_rate and run.rng.random() < self.fault_rate:
+            invalid = self._invalid(run, simple)
+            if invalid is not None:
+                run.stats.violations += 1
+                return invalid
+        return self._valid(run, simple)
+
+    def _valid(self, run: _Run, simple: _SimpleType) -> str:
+        rng = run.rng
+        if simple.enumeration:
+            return rng.choice(simple.enumeration)
+        if simple.builtin == "list":
+            assert simple.item is not None
+            return " ".join(self._valid(run, simple.item) for _ in range(rng.randint(1, 3)))
+        if simple.builtin == "union":
+            return self._valid(run, rng.choice(simple.members))
+        if simple.patterns:
+            samplers = self._samplers(simple)
+            # Sample the most derived step and check the value against the rest.
+            for _ in range(64):
+                value = samplers[-1].sample(rng)
+                if all(sampler.matches(value) for sampler in samplers[:-1]):
+                    return value
+            raise GeneratorError(f"Los patrones {simple.patterns} no admiten un valor comun.")
+        builtin = simple.builtin
+        if builtin in _INTEGER_BOUNDS or builtin in _DECIMAL_TYPES:
+            return self._number(rng, simple)
+        if builtin == "ID":
+            run.ids += 1
+            return f"id{run.ids}"
+        if builtin in ("IDREF", "IDREFS"):
+            return f"id{max(1, run.ids)}"
+        if builtin == "date":
+            return f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        if builtin == "dateTime":
+            return f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+        if builtin == "time":
+            return f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+        if builtin in _FIXED_SAMPLES:
+            return rng.choice(_FIXED_SAMPLES[builtin])
+        if builtin in _STRING_TYPES or builtin in ("NMTOKENS", "ENTITY", "ENTITIES"):
+            return _text(rng, simple)
+        raise GeneratorError(f"Tipo base no soportado: xs:{builtin}")
+
+    def _invalid(self, run: _Run, simple: _SimpleType) -> Optional[str]:
+        if simple.enumeration:
+            return "__fuera_de_lista__"
+        if simple.patterns:
+            return self._samplers(simple)[-1].invalid(self._valid(run, simple))
+        limit = simple.length if simple.length is not None else simple.max_length
+        if limit is not None:
+            return "x" * (limit + 1)
+        if simple.min_length:
+            return ""
+        builtin = simple.builtin
+        if builtin in _INTEGER_BOUNDS or builtin in _DECIMAL_TYPES:
+            low, high = _bounds(simple)
+            if high is not None:
+                return _format_number(high + 1, _fraction_digits(simple))
+            if low is not None:
+                return _format_number(low - 1, _fraction_digits(simple))
+            if simple.fraction_digits is not None:
+                return "1." + "5" * (simple.fraction_digits + 1)
+            return "no-numerico"
+        return _INVALID_SAMPLES.get(builtin)
+
+    def _samplers(self, simple: _SimpleType) -> List[PatternSampler]:
+        if not simple.samplers:
+            low = simple.length if simple.length is not None else simple.min_length or 0
+            high = simple.length if simple.length is not None else simple.max_length
+            try:
+                simple.samplers = [PatternSampler(step, low, high) for step in simple.patterns]
+            except PatternError as exc:
+                raise GeneratorError(str(exc)) from exc
+        return simple.samplers
+
+    def _number(self, rng: random.Random, simple: _SimpleType) -> str:
+        if simple.number_range is None:
+            simple.number_range = _number_range(simple)
+        low, steps, digits = simple.number_range
+        units = low + rng.randint(0, steps)
+        if not digits:
+            return str(units)
+        whole, fraction = divmod(abs(units), 10**digits)
+        return f"{'-' if units < 0 else ''}{whole}.{fraction:0{digits}d}"
+
+
+def _number_range(simple: _SimpleType) -> Tuple[int, int, int]:
+    """The valid values of a numeric type as (lowest, count - 1, fraction digits) in units of its last digit."""
+    digits = _fraction_digits(simple)
+    step = Decimal(1).scaleb(-digits)
+    low, high = _bounds(simple)
+    # Open ranges get a span of 1000, which keeps amounts plausible.
+    if low is None and high is None:
+        low, high = Decimal(0), Decimal(1000)
+    elif low is None:
+        assert high is not None
+        low = high - 1000
+    elif high is None:
+        high = low + 1000
+    assert low is not None and high is not None
+    if simple.total_digits is not None:
+        largest = Decimal(10) ** (simple.total_digits - digits) - step
+        low, high = max(low, -largest), min(high, largest)
+    low_units = int(low.scaleb(digits).to_integral_value(rounding=ROUND_CEILING))
+    high_units = int(high.scaleb(digits).to_integral_value(rounding=ROUND_FLOOR))
+    if high_units < low_units:
+        raise GeneratorError(f"Rango vacio [{low}, {high}] en un tipo xs:{simple.builtin}")
+    return low_units, high_units - low_units, digits
+
+
+def _bounds(simple: _SimpleType) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+    step = Decimal(1).scaleb(-_fraction_digits(simple))
+    builtin_low, builtin_high = _INTEGER_BOUNDS.get(simple.builtin, (None, None))
+    low = Decimal(builtin_low) if builtin_low is not None else None
+    high = Decimal(builtin_high) if builtin_high is not None else None
+    try:
+        if simple.min_inclusive is not None:
+            low = _tighter(low, Decimal(simple.min_inclusive), max)
+        if simple.min_exclusive is not None:
+            low = _tighter(low, Decimal(simple.min_exclusive) + step, max)
+        if simple.max_inclusive is not None:
+            high = _tighter(high, Decimal(simple.max_inclusive), min)
+        if simple.max_exclusive is not None:
+            high = _tighter(high, Decimal(simple.max_exclusive) - step, min)
+    except InvalidOperation as exc:
+        raise GeneratorError(f"Limite numerico no valido en un tipo xs:{simple.builtin}") from exc
+    return low, high
+
+
+def _tighter(current: Optional[Decimal], value: Decimal, pick) -> Decimal:
+    return value if current is None else pick(current, value)
+
+
+def _fraction_digits(simple: _SimpleType) -> int:
+    if simple.builtin in _INTEGER_BOUNDS:
+        return 0
+    return 2 if simple.fraction_digits is None else simple.fraction_digits
+
+
+def _format_number(value: Decimal, digits: int) -> str:
+    return f"{value:.{digits}f}"
+
+
+def _text(rng: random.Random, simple: _SimpleType) -> str:
+    if simple.length is not None:
+        low = high = simple.length
+    else:
+        low = simple.min_length or 1
+        high = simple.max_length if simple.max_length is not None else max(low, 12)
+        high = min(high, max(low, 12))
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(low, high)))
+
+
+def _derivation(content: etree._Element) -> etree._Element:
+    derivation = content.find(_XSD + "extension")
+    if derivation is None:
+        derivation = content.find(_XSD + "restriction")
+    if derivation is None:
+        raise GeneratorError("Contenido sin extension ni restriccion.")
+    return derivation
+
+
+def _schema_root(node: etree._Element) -> etree._Element:
+    return node.getroottree().getroot()
+
+
+def _resolve_qname(node: etree._Element, qname: str) -> Tuple[Optional[str], str]:
+    prefix, _, name = qname.rpartition(":")
+    return node.nsmap.get(prefix or None), name
+
+
+def _local(qname: str) -> str:
+    return qname.rpartition(":")[2]
+
+
+def _snake(name: str) -> str:
+    return "".join("_" + char.lower() if char.isupper() else char for char in name)
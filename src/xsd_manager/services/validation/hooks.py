@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from ...domain.models import ValidationReport, ValidationRequest
+
+
+class ValidationHook:
+    """Observer of finished validations, for forwarding timings to metrics.
+
+    ``on_report`` receives every report the use case returns, cached ones
+    included (their metadata says so), and ``on_error`` every ValidatorError
+    before it propagates. Per-stage timings, bytes and element counts are in
+    ``report.metadata``. Hooks run in the process that validates: with a
+    process pool each worker calls its own pickled copy, so a hook that
+    aggregates in memory only sees that worker's share. Exceptions raised by
+    a hook are not caught.
+    """
+
+    def on_report(self, request: ValidationRequest, report: ValidationReport) -> None:
+        del request, report
+
+    def on_error(self, request: ValidationRequest, error: Exception) -> None:
+        del request, error
+
@@ -0,0 +1,475 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socketserver
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from ...domain.models import ValidationMetadata, ValidationRequest
+from ...infra.reporting import encode_report
+from ..validators.base import ValidatorError
+from ..validators.schema_cache import get_schema_cache
+from .use_case import ValidationUseCase, failure_message
+
+
+DEFAULT_MAX_BODY_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_PENDING = 64
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+OUTCOME_VALID = "valid"
+OUTCOME_INVALID = "invalid"
+OUTCOME_FAILED = "failed"
+
+
+class ServiceBusy(RuntimeError):
+    """Raised when the service already holds ``max_pending`` requests."""
+
+
+class UnknownSchema(KeyError):
+    """Raised for a schema name that was never registered."""
+
+
+class WorkerDied(RuntimeError):
+    """Raised when a pool worker died while validating; the pool is replaced."""
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed buckets, in seconds."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """``(upper bound, observations <= bound)`` pairs, ending with ``+Inf``."""
+        total = 0
+        pairs = []
+        for bound, count in zip((*map(repr, self.buckets), "+Inf"), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class ServiceMetrics:
+    """Request counters and per-schema latency histograms, safe across handler threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._requests: Dict[Tuple[str, str], int] = {}
+        self._stages: Dict[Tuple[str, str], float] = {}
+        self._bytes: Dict[str, int] = {}
+        self._rejected = 0
+        self.in_flight = 0
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(
+        self,
+        schema: str,
+        outcome: str,
+        seconds: float,
+        metadata: Optional[ValidationMetadata] = None,
+    ) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            histogram = self._histograms.get(schema)
+            if histogram is None:
+                histogram = self._histograms[schema] = LatencyHistogram()
+            histogram.observe(seconds)
+            key = (schema, outcome)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if metadata is not None:
+                for stage, elapsed_ms in metadata.stages.items():
+                    key = (schema, stage)
+                    self._stages[key] = self._stages.get(key, 0.0) + elapsed_ms / 1000.0
+                if metadata.bytes_read is not None:
+                    self._bytes[schema] = self._bytes.get(schema, 0) + metadata.bytes_read
+
+    def abandoned(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def rejected(self) -> None:
+        with self._lock:
+            self._rejected += 1
+
+    def render_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                "# HELP xsd_validation_duration_seconds Time to answer a validation request.",
+                "# TYPE xsd_validation_duration_seconds histogram",
+            ]
+            for schema, histogram in sorted(self._histograms.items()):
+                label = _label(schema)
+                for bound, count in histogram.cumulative():
+                    lines.append(f'xsd_validation_duration_seconds_bucket{{schema="{label}",le="{bound}"}} {count}')
+                lines.append(f'xsd_validation_duration_seconds_sum{{schema="{label}"}} {histogram.sum:.6f}')
+                lines.append(f'xsd_validation_duration_seconds_count{{schema="{label}"}} {histogram.count}')
+            lines.append("# HELP xsd_validation_requests_total Validation requests by schema and outcome.")
+            lines.append("# TYPE xsd_validation_requests_total counter")
+            for (schema, outcome), count in sorted(self._requests.items()):
+                lines.append(f'xsd_validation_requests_total{{schema="{_label(schema)}",outcome="{outcome}"}} {count}')
+            lines.append("# HELP xsd_validation_stage_seconds_total Time spent in each validation stage.")
+            lines.append("# TYPE xsd_validation_stage_seconds_total counter")
+            for (schema, stage), seconds in sorted(self._stages.items()):
+                lines.append(
+                    f'xsd_validation_stage_seconds_total{{schema="{_label(schema)}",stage="{_label(stage)}"}} '
+                    f"{seconds:.6f}"
+                )
+            lines.append("# HELP xsd_validation_bytes_total XML bytes validated.")
+            lines.append("# TYPE xsd_validation_bytes_total counter")
+            for schema, count in sorted(self._bytes.items()):
+                lines.append(f'xsd_validation_bytes_total{{schema="{_label(schema)}"}} {count}')
+            lines.append("# HELP xsd_validation_rejected_total Requests rejected because the queue was full.")
+            lines.append("# TYPE xsd_validation_rejected_total counter")
+            lines.append(f"xsd_validation_rejected_total {self._rejected}")
+            lines.append("# HELP xsd_validation_in_flight Requests being validated or waiting for a worker.")
+            lines.append("# TYPE xsd_validation_in_flight gauge")
+            lines.append(f"xsd_validation_in_flight {self.in_flight}")
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass(frozen=True)
+class RegisteredSchema:
+    name: str
+    xsd_paths: Tuple[Path, ...]
+
+
+class SchemaRegistry:
+    """Named schema sets, compiled when registered so errors show up at startup."""
+
+    def __init__(self) -> None:
+        self._schemas: Dict[str, RegisteredSchema] = {}
+
+    def register(self, name: str, xsd_paths: Sequence[str | Path]) -> RegisteredSchema:
+        if not name or "/" in name:
+            raise ValueError(f"Nombre de esquema no valido: {name!r}")
+        paths = tuple(Path(p).resolve() for p in xsd_paths)
+        get_schema_cache().get_many(paths)
+        schema = RegisteredSchema(name=name, xsd_paths=paths)
+        self._schemas[name] = schema
+        return schema
+
+    def get(self, name: str) -> RegisteredSchema:
+        try:
+            return self._schemas[name]
+        except KeyError:
+            raise UnknownSchema(name) from None
+
+    def __iter__(self):
+        return iter(self._schemas.values())
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+
+class ValidationService:
+    """Validate XML bodies against registered schemas on a bounded pool.
+
+    With ``workers=1`` requests are validated on the calling (handler)
+    thread; otherwise on a process pool whose workers compile every
+    registered schema at startup and keep them warm, and which also encode
+    the JSON answer so the server process only moves bytes. At most
+    ``max_pending`` requests are accepted at a time; beyond that
+    ``validate`` raises ServiceBusy instead of queueing without bound. A
+    worker that dies mid-request fails that request with WorkerDied and the
+    pool is replaced, so later requests are served again.
+    """
+
+    def __init__(
+        self,
+        registry: SchemaRegistry,
+        use_case: ValidationUseCase,
+        workers: int = 1,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending debe ser mayor que cero.")
+        if workers < 0:
+            raise ValueError("workers no puede ser negativo.")
+        self.registry = registry
+        self.use_case = use_case
+        self.workers = workers or os.cpu_count() or 1
+        self.metrics = ServiceMetrics()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._pool_lock:
+            if self.workers > 1 and self._executor is None:
+                self._executor = self._start_pool()
+
+    def close(self) -> None:
+        with self._pool_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def validate(self, schema_name: str, body: bytes, **options: Any) -> bytes:
+        """Validate ``body`` and return the ValidationReport encoded as JSON."""
+        schema = self.registry.get(schema_name)
+        if not self._slots.acquire(blocking=False):
+            self.metrics.rejected()
+            raise ServiceBusy(schema_name)
+        start = time.perf_counter()
+        self.metrics.started()
+        try:
+            request = ValidationRequest.from_bytes(
+                body,
+                list(schema.xsd_paths),
+                name=f"{schema.name}.xml",
+                columnar=True,
+                **options,
+            )
+            executor = self._executor
+            if executor is None:
+                payload, outcome, metadata = _validate_encoded(self.use_case, request)
+            else:
+                payload, outcome, metadata = self._run_pooled(executor, request)
+        except WorkerDied:
+            self.metrics.finished(schema.name, OUTCOME_FAILED, time.perf_counter() - start)
+            raise
+        except BaseException:
+            self.metrics.abandoned()
+            raise
+        finally:
+            self._slots.release()
+        self.metrics.finished(schema.name, outcome, time.perf_counter() - start, metadata)
+        return payload
+
+    def _run_pooled(self, executor: ProcessPoolExecutor, request: ValidationRequest) -> EncodedResult:
+        try:
+            return executor.submit(_run_encoded, request).result()
+        except BrokenProcessPool as exc:
+            self._replace_pool(executor)
+            raise WorkerDied(str(exc)) from exc
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        # Every request in flight on the broken pool lands here; only the
+        # first one replaces it, the rest find the new pool already in place.
+        with self._pool_lock:
+            if self._executor is not broken:
+                return
+            self._executor = self._start_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_service_worker,
+            initargs=(self.use_case, [schema.xsd_paths for schema in self.registry]),
+        )
+
+
+EncodedResult = Tuple[bytes, str, Optional[ValidationMetadata]]
+
+
+def _validate_encoded(use_case: ValidationUseCase, request: ValidationRequest) -> EncodedResult:
+    report = use_case.run_safe(request)
+    if failure_message(report) is not None:
+        outcome = OUTCOME_FAILED
+    elif report.has_errors:
+        outcome = OUTCOME_INVALID
+    else:
+        outcome = OUTCOME_VALID
+    return encode_report(report), outcome, report.metadata
+
+
+_service_use_case: Optional[ValidationUseCase] = None
+
+
+def _init_service_worker(use_case: ValidationUseCase, schemas: List[Tuple[Path, ...]]) -> None:
+    global _service_use_case
+    # Shutdown is driven by the server process; workers finish their request.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _service_use_case = use_case
+    cache = get_schema_cache()
+    for paths in schemas:
+        try:
+            cache.get_many(paths)
+        except ValidatorError:
+            # Reported again, per request, if the schema is still broken.
+            pass
+
+
+def _run_encoded(request: ValidationRequest) -> EncodedResult:
+    assert _service_use_case is not None
+    return _validate_encoded(_service_use_case, request)
+
+
+def _parse_options(query: str) -> Dict[str, Any]:
+    params = parse_qs(query)
+    options: Dict[str, Any] = {}
+    for name in ("max_issues", "max_issues_per_code"):
+        if name in params:
+            value = int(params[name][-1])
+            if value < 1:
+                raise ValueError(f"{name} debe ser mayor que cero.")
+            options[name] = value
+    if "fail_fast" in params:
+        options["fail_fast"] = params["fail_fast"][-1].lower() in ("1", "true", "si", "yes")
+    return options
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a ValidationService.
+
+    ``POST /validate/<schema>`` with the XML as body (query parameters
+    ``max_issues``, ``max_issues_per_code`` and ``fail_fast``) answers with
+    the report as JSON. ``GET /schemas`` lists registered schemas,
+    ``GET /metrics`` exposes Prometheus metrics and ``GET /health`` is a
+    liveness probe.
+    """
+
+    server_version = "XsdManager/1"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> ValidationService:
+        return self.server.service  # type: ignore[attr-defined]
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif path == "/schemas":
+            schemas = [
+                {"name": schema.name, "xsd_paths": [str(p) for p in schema.xsd_paths]}
+                for schema in self.service.registry
+            ]
+            self._send_json(HTTPStatus.OK, {"schemas": schemas})
+        elif path == "/metrics":
+            body = self.service.metrics.render_prometheus().encode("utf-8")
+            self._send(HTTPStatus.OK, body, "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "Ruta desconocida.")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        prefix = "/validate/"
+        if not url.path.startswith(prefix):
+            self._send_error(HTTPStatus.NOT_FOUND, "Ruta desconocida.")
+            return
+        schema_name = unquote(url.path[len(prefix):])
+
+        length_header = self.headers.get("Content-Length")
+        if length_header is None:
+            self._send_error(HTTPStatus.LENGTH_REQUIRED, "Falta la cabecera Content-Length.")
+            return
+        try:
+            length = int(length_header)
+            options = _parse_options(url.query)
+        except ValueError as exc:
+            # The body is left unread, so the connection cannot be reused.
+            self.close_connection = True
+            self._send_error(HTTPStatus.BAD_REQUEST, str(exc))
+            return
+        if length < 0:
+            self.close_connection = True
+            self._send_error(HTTPStatus.BAD_REQUEST, "Content-Length no valido.")
+            return
+        if length > self.server.max_body_bytes:  # type: ignore[attr-defined]
+            self.close_connection = True
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "El XML supera el tamano maximo.")
+            return
+        body = self.rfile.read(length)
+
+        try:
+            payload = self.service.validate(schema_name, body, **options)
+        except UnknownSchema:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Esquema no registrado: {schema_name}")
+            return
+        except ServiceBusy:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, "Demasiadas validaciones en curso.")
+            return
+        except WorkerDied:
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "El proceso de validacion termino de forma inesperada.")
+            return
+        self._send(HTTPStatus.OK, payload, "application/json; charset=utf-8")
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not getattr(self.server, "quiet", True):
+            super().log_message(format, *args)
+
+    def _send_json(self, status: HTTPStatus, data: Any) -> None:
+        self._send(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(status, {"error": message})
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _ValidationHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class _ValidationUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+def create_server(
+    service: ValidationService,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    socket_path: Optional[str | Path] = None,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    quiet: bool = True,
+) -> socketserver.BaseServer:
+    """Bind an HTTP server for ``service`` on ``host:port`` or on a Unix socket."""
+    server: socketserver.BaseServer
+    if socket_path is not None:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise ValueError("Los sockets Unix no estan disponibles en este sistema.")
+        path = Path(socket_path)
+        if path.is_socket():
+            path.unlink()
+        server = _ValidationUnixServer(str(path), ValidationRequestHandler)
+    else:
+        server = _ValidationHTTPServer((host, port), ValidationRequestHandler)
+    server.service = service  # type: ignore[attr-defined]
+    server.max_body_bytes = max_body_bytes  # type: ignore[attr-defined]
+    server.quiet = quiet  # type: ignore[attr-defined]
+    return server
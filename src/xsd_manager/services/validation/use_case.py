@@ -1,26 +1,324 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from ...domain.models import ValidationIssue, ValidationRequest, ValidationReport
-from ..validators.base import BaseValidator
+from ...domain.models import (
+    IssueColumns,
+    IssueSequence,
+    Severity,
+    ValidationIssue,
+    ValidationMetadata,
+    ValidationRequest,
+    ValidationReport,
+)
+from ...infra.result_cache import ResultCache
+from ..validators.base import BaseValidator, ValidatorError
+from ..validators.document import DocumentContext
+from .hooks import ValidationHook
+
+
+VALIDATOR_ERROR_CODE = "VALIDATOR_ERROR"
+
+RequestChunk = List[ValidationRequest]
+ChunkResult = List[Tuple[ValidationRequest, ValidationReport]]
 
 
 class ValidationUseCase:
-    """Run one or more validators over a validation request."""
+    """Run one or more validators over a validation request.
+
+    With a ``result_cache`` a request whose XML content, options and
+    validator cache keys match an earlier run is answered from the cache.
+    Runs that raise ValidatorError are never stored, so re-running a batch
+    after a partial failure only validates the files that did not finish.
+    Every ``hooks`` entry is told about each report and error.
+
+    When several validators support a request they run at the same time on
+    a thread pool of up to ``max_threads`` threads (by default, one per
+    validator); lxml releases the GIL while parsing and validating. Their
+    issues are merged in validator order and the report metadata keeps each
+    validator's own metadata in ``parts``. Requests with ``fail_fast`` run
+    the validators one after another, so the first failure stops the rest.
+    All validators of a run share one DocumentContext, so the XML is parsed
+    once; it is closed as soon as the last validator returns.
+    """
 
-    def __init__(self, validators: Iterable[BaseValidator]) -> None:
+    def __init__(
+        self,
+        validators: Iterable[BaseValidator],
+        result_cache: Optional[ResultCache] = None,
+        hooks: Iterable[ValidationHook] = (),
+        max_threads: Optional[int] = None,
+    ) -> None:
         self.validators = list(validators)
+        self.result_cache = result_cache
+        self.hooks = list(hooks)
+        if max_threads is not None and max_threads < 1:
+            raise ValueError("max_threads debe ser mayor que cero.")
+        self.max_threads = max_threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # Threads stay in their process; workers start their own pool on demand.
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        state["_executor_lock"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._executor_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Stop the validator thread pool, if one was started."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
     def run(self, request: ValidationRequest) -> ValidationReport:
-        issues: List[ValidationIssue] = []
-        ok = True
+        try:
+            report = self._run_cached(request)
+        except ValidatorError as exc:
+            for hook in self.hooks:
+                hook.on_error(request, exc)
+            raise
+        for hook in self.hooks:
+            hook.on_report(request, report)
+        return report
+
+    def _run_cached(self, request: ValidationRequest) -> ValidationReport:
+        key = self._cache_key(request)
+        if key is not None:
+            assert self.result_cache is not None
+            cached = self.result_cache.get(key, columnar=request.columnar)
+            if cached is not None:
+                return cached
 
+        report = self._run_validators(request)
+        if key is not None:
+            assert self.result_cache is not None
+            self.result_cache.put(key, report)
+        return report
+
+    def _cache_key(self, request: ValidationRequest) -> Optional[str]:
+        if self.result_cache is None:
+            return None
+        parts = [
+            f"streaming={request.streaming}:{request.record_tag}",
+            f"strict={request.strict}:columnar={request.columnar}",
+            f"limits={request.fail_fast}:{request.max_issues}:{request.max_issues_per_code}",
+            f"count_elements={request.count_elements}",
+        ]
         for validator in self.validators:
             if not validator.supports(request):
                 continue
-            report = validator.validate(request)
-            issues.extend(report.issues)
-            ok = ok and report.ok
+            validator_key = validator.cache_key(request)
+            if validator_key is None:
+                return None
+            parts.append(validator_key)
+        content_digest = self.result_cache.content_digest(request)
+        if content_digest is None:
+            return None
+        return self.result_cache.make_key(content_digest, parts)
+
+    def _run_validators(self, request: ValidationRequest) -> ValidationReport:
+        start = time.perf_counter()
+        validators = [validator for validator in self.validators if validator.supports(request)]
+        with DocumentContext(request, shared=len(validators) > 1) as document:
+            if len(validators) > 1 and not request.fail_fast:
+                executor = self._thread_pool()
+                futures = [executor.submit(validator.validate, request, document) for validator in validators]
+                # Wait for every validator before raising, so none outlives the document.
+                wait(futures)
+                reports = [future.result() for future in futures]
+            else:
+                reports = []
+                for validator in validators:
+                    reports.append(validator.validate(request, document))
+                    if request.fail_fast and not reports[-1].ok:
+                        break
+
+        # Each validator applies the limit on its own; the merge applies it to the total.
+        limit = request.issue_limit
+        issues: IssueSequence = IssueColumns() if request.columnar else []
+        metadata: List[ValidationMetadata] = []
+        truncated = any(report.truncated for report in reports)
+        for report in reports:
+            if limit is None:
+                issues.extend(report.issues)
+            else:
+                room = limit - len(issues)
+                if len(report.issues) > room:
+                    truncated = True
+                issues.extend(islice(report.issues, max(room, 0)))
+            if report.metadata is not None:
+                metadata.append(report.metadata)
+        ok = all(report.ok for report in reports)
+        if len(reports) < len(validators):
+            # fail_fast skipped the remaining validators.
+            truncated = True
+
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        return ValidationReport(
+            ok=ok,
+            issues=issues,
+            metadata=_merge_metadata(metadata, elapsed_ms),
+            truncated=truncated,
+        )
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_threads or len(self.validators),
+                    thread_name_prefix="validator",
+                )
+            return self._executor
+
+    def run_safe(self, request: ValidationRequest) -> ValidationReport:
+        """Like run(), but turn a ValidatorError into a failed report."""
+        try:
+            return self.run(request)
+        except ValidatorError as exc:
+            return failure_report(exc)
+
+    def run_many(
+        self,
+        requests: Iterable[ValidationRequest],
+        workers: Optional[int] = None,
+        *,
+        ordered: bool = True,
+        chunksize: int = 16,
+    ) -> Iterator[Tuple[ValidationRequest, ValidationReport]]:
+        """Validate many requests on a process pool, yielding (request, report) pairs.
+
+        Each worker process receives a pickled copy of this use case and keeps
+        its own compiled-schema cache for its whole lifetime. Requests are sent
+        in chunks and only a bounded window of chunks is in flight, so very
+        large request iterables are consumed lazily. With ``ordered=True``
+        results follow submission order, otherwise completion order.
+        A ValidatorError never aborts the batch; it becomes a failed report
+        whose single issue carries ``VALIDATOR_ERROR_CODE``.
+        """
+        if workers is not None and workers < 0:
+            raise ValueError("workers no puede ser negativo.")
+        workers = workers or os.cpu_count() or 1
+        if chunksize < 1:
+            raise ValueError("chunksize debe ser mayor que cero.")
+
+        source = iter(requests)
+        if workers == 1:
+            for request in source:
+                yield request, self.run_safe(request)
+            return
+
+        max_in_flight = workers * 2
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(self,),
+        ) as executor:
+
+            def submit_next() -> Optional[Future[ChunkResult]]:
+                chunk = list(islice(source, chunksize))
+                if not chunk:
+                    return None
+                return executor.submit(run_chunk, chunk)
+
+            if ordered:
+                queue: Deque[Future[ChunkResult]] = deque()
+                while len(queue) < max_in_flight:
+                    future = submit_next()
+                    if future is None:
+                        break
+                    queue.append(future)
+                while queue:
+                    yield from queue.popleft().result()
+                    future = submit_next()
+                    if future is not None:
+                        queue.append(future)
+                return
+
+            pending: Set[Future[ChunkResult]] = set()
+            while len(pending) < max_in_flight:
+                future = submit_next()
+                if future is None:
+                    break
+                pending.add(future)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+                    replacement = submit_next()
+                    if replacement is not None:
+                        pending.add(replacement)
+
+
+def failure_report(error: Exception) -> ValidationReport:
+    return ValidationReport(
+        ok=False,
+        issues=[
+            ValidationIssue(
+                line=0,
+                column=0,
+                message=str(error),
+                severity=Severity.ERROR,
+                code=VALIDATOR_ERROR_CODE,
+            )
+        ],
+    )
+
+
+def _merge_metadata(metadata: List[ValidationMetadata], elapsed_ms: float) -> Optional[ValidationMetadata]:
+    """Combine per-validator metadata; ``elapsed_ms`` is the wall time of the run.
+
+    Stage times are summed over validators, so with concurrent validators
+    they can add up to more than ``elapsed_ms``.
+    """
+    if not metadata:
+        return None
+    if len(metadata) == 1:
+        return metadata[0]
+    stages: Dict[str, float] = {}
+    for item in metadata:
+        for stage, stage_ms in item.stages.items():
+            stages[stage] = stages.get(stage, 0.0) + stage_ms
+    # Every validator reads the same document; keep the first known size.
+    return ValidationMetadata(
+        validator="+".join(item.validator for item in metadata),
+        elapsed_ms=elapsed_ms,
+        stages=stages,
+        parts=list(metadata),
+        bytes_read=next((item.bytes_read for item in metadata if item.bytes_read is not None), None),
+        elements=next((item.elements for item in metadata if item.elements is not None), None),
+    )
+
+
+def failure_message(report: ValidationReport) -> Optional[str]:
+    """The error of a report built by failure_report(), or None for a regular report."""
+    issues = report.issues
+    if len(issues) == 1 and issues[0].code == VALIDATOR_ERROR_CODE:
+        return issues[0].message
+    return None
+
+
+_worker_use_case: Optional[ValidationUseCase] = None
+
+
+def init_worker(use_case: ValidationUseCase) -> None:
+    """Process pool initializer: bind the worker to its copy of ``use_case``."""
+    global _worker_use_case
+    _worker_use_case = use_case
+
 
-        return ValidationReport(ok=ok, issues=issues)
+def run_chunk(chunk: RequestChunk) -> ChunkResult:
+    """Validate a chunk in a worker set up by init_worker(); never raises ValidatorError."""
+    assert _worker_use_case is not None
+    return [(request, _worker_use_case.run_safe(request)) for request in chunk]
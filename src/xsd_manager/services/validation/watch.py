@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from ...domain.models import (
+    IssueSequence,
+    Severity,
+    ValidationMetadata,
+    ValidationReport,
+    ValidationRequest,
+)
+from ...infra.reporting import JsonWriter
+from ..validators.base import ValidatorError
+from .use_case import ChunkResult, ValidationUseCase, failure_message, failure_report, init_worker, run_chunk
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_SETTLE_SECONDS = 2.0
+WATCH_SUFFIXES = (".xml",)
+
+FileSignature = Tuple[int, int]
+
+
+@dataclass
+class WatchConfig:
+    """Where to look, how to decide a file is complete and what to do with it.
+
+    A file is validated once its size and mtime have not changed for
+    ``settle_seconds``, so files still being copied are left alone. After
+    validation it is moved to ``ok_dir`` (no errors) or ``failed_dir``
+    (errors, or it could not be validated) when those are set, and a JSON
+    report is written to ``report_dir`` when set. Without ``ok_dir`` and
+    ``failed_dir`` files stay in place and are validated again when they
+    change. ``request_options`` are passed to every ValidationRequest.
+    """
+
+    directories: Sequence[Path]
+    xsd_paths: Sequence[Path]
+    recursive: bool = False
+    suffixes: Tuple[str, ...] = WATCH_SUFFIXES
+    poll_interval: float = DEFAULT_POLL_INTERVAL
+    settle_seconds: float = DEFAULT_SETTLE_SECONDS
+    ok_dir: Optional[Path] = None
+    failed_dir: Optional[Path] = None
+    report_dir: Optional[Path] = None
+    workers: int = 1
+    request_options: Dict[str, object] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.poll_interval <= 0:
+            raise ValueError("poll_interval debe ser mayor que cero.")
+        if self.settle_seconds < 0:
+            raise ValueError("settle_seconds no puede ser negativo.")
+        if self.workers < 0:
+            raise ValueError("workers no puede ser negativo.")
+
+
+@dataclass
+class WatchedFile:
+    """Outcome for one file; ``destination`` is where it was moved, if anywhere."""
+
+    xml_path: Path
+    report: ValidationReport
+    size: int = 0
+    destination: Optional[Path] = None
+    failure: Optional[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.failure = failure_message(self.report)
+
+    @property
+    def issues(self) -> IssueSequence:
+        return [] if self.failure is not None else self.report.issues
+
+    @property
+    def truncated(self) -> bool:
+        return self.report.truncated
+
+    @property
+    def elapsed_ms(self) -> Optional[float]:
+        return self.report.metadata.elapsed_ms if self.report.metadata is not None else None
+
+    @property
+    def metadata(self) -> Optional[ValidationMetadata]:
+        return self.report.metadata
+
+    @property
+    def errors(self) -> int:
+        return 0 if self.failure is not None else self.report.counts[Severity.ERROR]
+
+    @property
+    def warnings(self) -> int:
+        return 0 if self.failure is not None else self.report.counts[Severity.WARNING]
+
+    @property
+    def passed(self) -> bool:
+        return self.failure is None and self.errors == 0
+
+
+@dataclass(frozen=True)
+class WatchStats:
+    started: float
+    uptime_s: float
+    files: int
+    passed: int
+    failed: int
+    cached: int
+    bytes: int
+    validation_ms: float
+    pending: int
+    in_flight: int
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.uptime_s if self.uptime_s > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.uptime_s if self.uptime_s > 0 else 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.validation_ms / self.files if self.files else 0.0
+
+
+class FolderScanner:
+    """Poll directories and report files that are complete and not yet validated."""
+
+    def __init__(self, config: WatchConfig) -> None:
+        self.config = config
+        self._excluded = {
+            path.resolve() for path in (config.ok_dir, config.failed_dir, config.report_dir) if path is not None
+        }
+        # Last signature seen for files still settling, with the time it was first seen.
+        self._settling: Dict[Path, Tuple[FileSignature, float]] = {}
+        # Signature at the time each file was handed out for validation.
+        self._seen: Dict[Path, FileSignature] = {}
+
+    def scan(self, now: Optional[float] = None) -> List[Tuple[Path, int]]:
+        """Return ``(path, size)`` for every file that settled since the last scan."""
+        now = time.monotonic() if now is None else now
+        present: Set[Path] = set()
+        ready: List[Tuple[Path, int]] = []
+        for path, stat in self._iter_files():
+            present.add(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._seen.get(path) == signature:
+                continue
+            previous = self._settling.get(path)
+            if previous is None or previous[0] != signature:
+                self._settling[path] = (signature, now)
+                if self.config.settle_seconds > 0:
+                    continue
+            elif now - previous[1] < self.config.settle_seconds:
+                continue
+            del self._settling[path]
+            self._seen[path] = signature
+            ready.append((path, stat.st_size))
+
+        # Forget files that were moved or deleted so the maps do not grow forever.
+        for stale in [p for p in self._seen if p not in present]:
+            del self._seen[stale]
+        for stale in [p for p in self._settling if p not in present]:
+            del self._settling[stale]
+        return ready
+
+    @property
+    def settling(self) -> int:
+        return len(self._settling)
+
+    def _iter_files(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        suffixes = tuple(s.lower() for s in self.config.suffixes)
+        pending = [Path(d) for d in self.config.directories]
+        while pending:
+            directory = pending.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.config.recursive and Path(entry.path).resolve() not in self._excluded:
+                            pending.append(Path(entry.path))
+                        continue
+                    if not entry.name.lower().endswith(suffixes):
+                        continue
+                    yield Path(entry.path), entry.stat()
+                except OSError:
+                    continue
+
+
+class FolderWatcher:
+    """Long-running validation of files dropped into watched folders.
+
+    Directories are polled every ``poll_interval`` seconds; inotify is not
+    used so the same code runs on every platform and on network shares.
+    Settled files are validated in this process (``workers=1``) or on a
+    process pool that lives as long as the watcher, so each worker compiles
+    a schema once and keeps it warm. ``results()`` yields a WatchedFile per
+    validated file, in completion order, until ``stop()`` is called; files
+    already submitted are still finished and yielded after that. If a worker
+    dies (a crash in libxml2, the OOM killer), the files in flight are
+    reported as failed and a new pool takes over.
+    """
+
+    def __init__(
+        self,
+        use_case: ValidationUseCase,
+        config: WatchConfig,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.use_case = use_case
+        self.config = config
+        self.scanner = FolderScanner(config)
+        self._clock = clock
+        self._stop = threading.Event()
+        self._queue: Deque[Tuple[Path, int]] = deque()
+        self._started = time.time()
+        self._started_clock = clock()
+        self._files = 0
+        self._passed = 0
+        self._failed = 0
+        self._cached = 0
+        self._bytes = 0
+        self._validation_ms = 0.0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def stats(self) -> WatchStats:
+        with self._lock:
+            return WatchStats(
+                started=self._started,
+                uptime_s=self._clock() - self._started_clock,
+                files=self._files,
+                passed=self._passed,
+                failed=self._failed,
+                cached=self._cached,
+                bytes=self._bytes,
+                validation_ms=self._validation_ms,
+                pending=len(self._queue) + self.scanner.settling,
+                in_flight=self._in_flight,
+            )
+
+    def results(self) -> Iterator[WatchedFile]:
+        for directory in (self.config.ok_dir, self.config.failed_dir, self.config.report_dir):
+            if directory is not None:
+                directory.mkdir(parents=True, exist_ok=True)
+        if self.config.workers == 1:
+            yield from self._run_inline()
+        else:
+            yield from self._run_pool()
+
+    def _run_inline(self) -> Iterator[WatchedFile]:
+        while not self._stop.is_set():
+            self._poll()
+            while self._queue and not self._stop.is_set():
+                path, size = self._queue.popleft()
+                request = self._request(path)
+                yield self._finish(path, size, self.use_case.run_safe(request))
+            self._stop.wait(self.config.poll_interval)
+
+    def _run_pool(self) -> Iterator[WatchedFile]:
+        workers = self.config.workers or os.cpu_count() or 1
+        max_in_flight = workers * 2
+        submitted: Dict[Future[ChunkResult], Tuple[Path, int]] = {}
+        executor = self._start_pool(workers)
+        try:
+            while not self._stop.is_set() or submitted:
+                if not self._stop.is_set():
+                    self._poll()
+                    while self._queue and len(submitted) < max_in_flight:
+                        path, size = self._queue.popleft()
+                        submitted[executor.submit(run_chunk, [self._request(path)])] = (path, size)
+                with self._lock:
+                    self._in_flight = len(submitted)
+                if not submitted:
+                    self._stop.wait(self.config.poll_interval)
+                    continue
+                done, _ = wait(list(submitted), timeout=self.config.poll_interval, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    path, size = submitted.pop(future)
+                    broken = broken or isinstance(future.exception(), BrokenProcessPool)
+                    yield from self._collect(future, path, size)
+                if broken:
+                    # A broken pool fails every pending future: finish the
+                    # files still in flight, then replace the pool.
+                    executor.shutdown(wait=True)
+                    for future, (path, size) in submitted.items():
+                        yield from self._collect(future, path, size)
+                    submitted.clear()
+                    executor = self._start_pool(workers)
+        finally:
+            executor.shutdown(wait=True)
+            with self._lock:
+                self._in_flight = 0
+
+    def _collect(self, future: Future[ChunkResult], path: Path, size: int) -> Iterator[WatchedFile]:
+        try:
+            results = future.result()
+        except BrokenProcessPool as exc:
+            yield self._finish(path, size, _worker_died(exc))
+            return
+        for _, report in results:
+            yield self._finish(path, size, report)
+
+    def _start_pool(self, workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_watch_worker,
+            initargs=(self.use_case,),
+        )
+
+    def _poll(self) -> None:
+        self._queue.extend(self.scanner.scan(self._clock()))
+
+    def _request(self, path: Path) -> ValidationRequest:
+        return ValidationRequest(
+            xml_path=path,
+            xsd_paths=list(self.config.xsd_paths),
+            **self.config.request_options,  # type: ignore[arg-type]
+        )
+
+    def _finish(self, path: Path, size: int, report: ValidationReport) -> WatchedFile:
+        result = WatchedFile(xml_path=path, report=report, size=size)
+        target_dir = self.config.ok_dir if result.passed else self.config.failed_dir
+        if target_dir is not None:
+            result.destination = _move(path, target_dir)
+        if self.config.report_dir is not None:
+            _write_json_report(result, self.config.report_dir)
+
+        metadata = report.metadata
+        with self._lock:
+            self._files += 1
+            self._bytes += size
+            if result.passed:
+                self._passed += 1
+            else:
+                self._failed += 1
+            if metadata is not None:
+                self._validation_ms += metadata.elapsed_ms
+                self._cached += metadata.cached
+        return result
+
+
+def _unique_target(directory: Path, name: str) -> Path:
+    target = directory / name
+    stem, suffix = os.path.splitext(name)
+    counter = 1
+    while target.exists():
+        target = directory / f"{stem}.{counter}{suffix}"
+        counter += 1
+    return target
+
+
+def _move(path: Path, directory: Path) -> Optional[Path]:
+    try:
+        target = _unique_target(directory, path.name)
+        return Path(shutil.move(str(path), str(target)))
+    except OSError:
+        return None
+
+
+def _write_json_report(result: WatchedFile, directory: Path) -> None:
+    name = (result.destination or result.xml_path).name
+    try:
+        with open(_unique_target(directory, f"{name}.json"), "wb") as stream:
+            writer = JsonWriter(stream)
+            writer.start()
+            writer.write(result)
+            writer.finish()
+    except OSError as exc:
+        logger.warning("No se pudo escribir el informe de %s: %s", result.xml_path, exc)
+
+
+def _worker_died(error: BrokenProcessPool) -> ValidationReport:
+    return failure_report(ValidatorError(f"El proceso de validacion termino de forma inesperada: {error}"))
+
+
+def _init_watch_worker(use_case: ValidationUseCase) -> None:
+    # Ctrl+C is for the watcher; workers finish their file and exit with the pool.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    init_worker(use_case)
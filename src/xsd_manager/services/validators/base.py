@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 from ...domain.models import ValidationIssue, ValidationRequest, ValidationReport
 
+if TYPE_CHECKING:
+    from .document import DocumentContext
+
 
 class ValidatorError(RuntimeError):
     """Domain-level validation error."""
@@ -13,14 +17,30 @@ class BaseValidator(ABC):
     """Interface for all validators."""
 
     name = "base"
+    version = "1"
 
     @abstractmethod
     def supports(self, request: ValidationRequest) -> bool:
         """Return True when this validator can handle the request."""
 
     @abstractmethod
-    def validate(self, request: ValidationRequest) -> ValidationReport:
-        """Validate request and return a report."""
+    def validate(self, request: ValidationRequest, document: "DocumentContext | None" = None) -> ValidationReport:
+        """Validate request and return a report.
+
+        ``document`` is the parsed XML shared by all validators of a run; read
+        the document through it instead of from the request. When None the
+        validator opens its own context for the call.
+        """
+
+    def cache_key(self, request: ValidationRequest) -> str | None:
+        """Identify everything besides the XML that determines this validator's report.
+
+        Two requests with the same XML content and equal keys must produce the
+        same report. Return None when results cannot be cached; that is the
+        default, so validators have to opt in.
+        """
+        del request
+        return None
 
     def classify_exception(self, error: Exception) -> list[ValidationIssue]:
         del error
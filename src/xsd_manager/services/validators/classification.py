@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from ...domain.models import Severity
+
+
+WARNING_KEYS = (
+    "pattern",
+    "length",
+    "minlength",
+    "maxlength",
+    "datatype",
+    "type",
+    "fractiondigits",
+    "totaldigits",
+    "mininclusive",
+    "maxinclusive",
+    "minexclusive",
+    "maxexclusive",
+)
+
+ERROR_KEYS = (
+    "missing child element",
+    "attribute",
+    "is required",
+    "not expected",
+    "no matching global declaration",
+)
+
+MESSAGE_CACHE_SIZE = 4096
+
+
+def _compact(keys: Iterable[str]) -> Tuple[str, ...]:
+    """Lowercase and deduplicate ``keys``, dropping those that contain a shorter key.
+
+    A message containing "maxlength" also contains "length", so the longer
+    key can never change the outcome and only costs one more scan.
+    """
+    unique = sorted({key.lower() for key in keys if key}, key=len)
+    kept: list[str] = []
+    for key in unique:
+        if not any(shorter in key for shorter in kept):
+            kept.append(key)
+    return tuple(kept)
+
+
+def _severity(value: Any) -> Severity:
+    if isinstance(value, Severity):
+        return value
+    text = str(value).strip().upper()
+    for severity in Severity:
+        if text in (severity.name, severity.value):
+            return severity
+    raise ValueError(f"Severidad desconocida en la clasificacion: {value!r}")
+
+
+class MessageClassifier:
+    """Map validator messages to a Severity.
+
+    A message is an ERROR if it contains any error key, otherwise a WARNING
+    if it contains any warning key, otherwise ``default``; matching is
+    case-insensitive. Key tables are compacted once at construction.
+    Results are memoized per message text, because on broken files the same
+    message repeats for every offending record. ``code_severities`` maps
+    lxml ``type_name`` codes to a fixed severity and takes precedence over
+    the keys.
+    """
+
+    def __init__(
+        self,
+        error_keys: Iterable[str] = ERROR_KEYS,
+        warning_keys: Iterable[str] = WARNING_KEYS,
+        code_severities: Optional[Mapping[str, Severity | str]] = None,
+        default: Severity = Severity.ERROR,
+        cache_size: int = MESSAGE_CACHE_SIZE,
+    ) -> None:
+        self.error_keys = tuple(error_keys)
+        self.warning_keys = tuple(warning_keys)
+        self.code_severities: Dict[str, Severity] = {
+            code: _severity(severity) for code, severity in (code_severities or {}).items()
+        }
+        self.default = default
+        self.cache_size = cache_size
+        self._error_matchers = _compact(self.error_keys)
+        self._warning_matchers = _compact(self.warning_keys)
+        self._cache: Dict[str, Severity] = {}
+        self.fingerprint = self._fingerprint()
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "MessageClassifier":
+        """Build a classifier from a config mapping; missing tables keep the defaults."""
+        unknown = set(data) - {"error_keys", "warning_keys", "code_severities", "default"}
+        if unknown:
+            raise ValueError(f"Claves desconocidas en la clasificacion: {', '.join(sorted(unknown))}")
+        return cls(
+            error_keys=data.get("error_keys", ERROR_KEYS),
+            warning_keys=data.get("warning_keys", WARNING_KEYS),
+            code_severities=data.get("code_severities"),
+            default=_severity(data.get("default", Severity.ERROR)),
+        )
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "MessageClassifier":
+        """Load a JSON file with ``error_keys``, ``warning_keys``, ``code_severities`` and ``default``."""
+        with open(path, "r", encoding="utf-8") as file:
+            try:
+                data = json.load(file)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Clasificacion no valida en {path}: {exc}") from exc
+        if not isinstance(data, dict):
+            raise ValueError(f"Clasificacion no valida en {path}: se esperaba un objeto JSON.")
+        return cls.from_mapping(data)
+
+    def classify(self, message: str, code: Optional[str] = None) -> Severity:
+        if code is not None and self.code_severities:
+            severity = self.code_severities.get(code)
+            if severity is not None:
+                return severity
+
+        severity = self._cache.get(message)
+        if severity is None:
+            severity = self._match(message)
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[message] = severity
+        return severity
+
+    def _fingerprint(self) -> str:
+        """Hash of the tables that decide the outcome, for result cache keys."""
+        tables = {
+            "error": sorted(self._error_matchers),
+            "warning": sorted(self._warning_matchers),
+            "codes": sorted((code, severity.name) for code, severity in self.code_severities.items()),
+            "default": self.default.name,
+        }
+        return hashlib.sha256(json.dumps(tables).encode("utf-8")).hexdigest()[:16]
+
+    def _match(self, message: str) -> Severity:
+        # Plain substring scans: CPython's re has no multi-literal matcher, and
+        # an alternation regex measured slower than this loop even at 100+ keys.
+        text = message.lower()
+        for key in self._error_matchers:
+            if key in text:
+                return Severity.ERROR
+        for key in self._warning_matchers:
+            if key in text:
+                return Severity.WARNING
+        return self.default
+
+    def __getstate__(self) -> dict:
+        # The memo is a per-process cache; do not ship it to worker processes.
+        state = self.__dict__.copy()
+        state["_cache"] = {}
+        return state
+
+
+_default_classifier = MessageClassifier()
+
+
+def get_default_classifier() -> MessageClassifier:
+    return _default_classifier
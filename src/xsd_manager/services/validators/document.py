@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+import lxml.etree as etree
+
+from ...domain.models import ValidationRequest
+from ...infra.files import BufferReader, MappedFile
+from .base import ValidatorError
+
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class DocumentContext:
+    """The XML of one validation run, shared by every validator of the run.
+
+    ``tree()`` parses the document on first use and hands the same
+    ``_ElementTree`` to later callers, so several validators cost a single
+    parse; concurrent callers wait for the parse in progress instead of
+    starting their own. ``data()`` returns the source bytes without copying:
+    the request content as is, or a memory map of the file. A one-shot stream
+    is read into memory once, but only when the context is ``shared`` by
+    several validators; a single validator gets to parse it directly.
+
+    ``close()`` (or leaving the ``with`` block) drops the tree and unmaps the
+    file, so memory is released when the run ends rather than whenever the
+    garbage collector gets to it. Validators must not keep the tree or the
+    buffer after ``validate()`` returns.
+    """
+
+    def __init__(self, request: ValidationRequest, shared: bool = False) -> None:
+        self.request = request
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._tree: Optional[etree._ElementTree] = None
+        self._error: Optional[ValidatorError] = None
+        self._mapped: Optional[MappedFile] = None
+        self._buffered: Optional[bytes] = None
+        self._stream_taken = False
+        self._closed = False
+
+    def __enter__(self) -> "DocumentContext":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def size(self) -> Optional[int]:
+        """Size of the XML in bytes, or None for a stream that was not read."""
+        content = self.request.xml_content
+        if content is None:
+            try:
+                return self.request.xml_path.stat().st_size
+            except OSError:
+                return None
+        if isinstance(content, (bytes, bytearray)):
+            return len(content)
+        if isinstance(content, memoryview):
+            return content.nbytes
+        return len(self._buffered) if self._buffered is not None else None
+
+    def tree(self) -> etree._ElementTree:
+        """The parsed document; raises ValidatorError if it is not well-formed."""
+        with self._lock:
+            self._check_open()
+            if self._tree is None and self._error is None:
+                try:
+                    self._tree = self._parse()
+                except ValidatorError as exc:
+                    self._error = exc
+            if self._error is not None:
+                raise self._error
+            assert self._tree is not None
+            return self._tree
+
+    def data(self) -> Buffer:
+        """The raw XML bytes, valid until the context is closed."""
+        with self._lock:
+            self._check_open()
+            return self._data()
+
+    def source(self) -> Union[Path, BinaryIO, BufferReader]:
+        """Something iterparse can read the document from, without a full parse."""
+        with self._lock:
+            self._check_open()
+            content = self.request.xml_content
+            if content is None:
+                return self.request.xml_path
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                return BufferReader(content)
+            if self._buffered is None and not self._stream_taken and not self.shared:
+                self._stream_taken = True
+                return content
+            return BufferReader(self._data())
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._tree = None
+            self._buffered = None
+            if self._mapped is not None:
+                self._mapped.close()
+                self._mapped = None
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValidatorError("El documento de la validacion ya se libero.")
+
+    def _data(self) -> Buffer:
+        content = self.request.xml_content
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return content
+        if content is not None:
+            if self._buffered is None:
+                if self._stream_taken:
+                    raise ValidatorError("El XML se recibio como flujo y ya se leyo.")
+                try:
+                    self._buffered = content.read()
+                except OSError as exc:
+                    raise ValidatorError(f"XML mal formateado o inaccesible: {exc}") from exc
+            return self._buffered
+        if self._mapped is None:
+            try:
+                mapped = MappedFile(self.request.xml_path)
+                mapped.open()
+            except (OSError, ValueError) as exc:
+                raise ValidatorError(f"XML mal formateado o inaccesible: {exc}") from exc
+            self._mapped = mapped
+        return self._mapped.buffer()
+
+    def _parse(self) -> etree._ElementTree:
+        content = self.request.xml_content
+        base_url = str(self.request.xml_path)
+        try:
+            if isinstance(content, bytes):
+                return etree.fromstring(content, base_url=base_url).getroottree()
+            if content is not None and not isinstance(content, (bytearray, memoryview)):
+                if not self.shared and self._buffered is None:
+                    self._stream_taken = True
+                    return etree.parse(content, base_url=base_url)
+            # Read through slices instead of bytes(content): older lxml releases
+            # only take bytes in fromstring() and a full copy would double memory.
+            # Files are parsed from the memory map that data() also serves, so
+            # the content is read from disk once per run; shared streams are
+            # buffered first so other validators can read them.
+            reader = BufferReader(self._data())
+            try:
+                return etree.parse(reader, base_url=base_url)
+            finally:
+                reader.release()
+        except etree.XMLSyntaxError as exc:
+            raise ValidatorError(f"XML mal formado: {exc}") from exc
+        except OSError as exc:
+            raise ValidatorError(f"XML mal formateado o inaccesible: {exc}") from exc
@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+import lxml.etree as etree
+
+from .base import ValidatorError
+
+
+T = TypeVar("T")
+
+XSD_NS = "http://www.w3.org/2001/XMLSchema"
+COMPOSE_SCHEME = "xsdmanager-compose"
+
+_DEPENDENCY_TAGS = tuple(
+    f"{{{XSD_NS}}}{name}" for name in ("include", "import", "redefine", "override")
+)
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    path: Path
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+@dataclass
+class CompiledSchema:
+    """Compiled XMLSchema plus the fingerprints of every file it was built from.
+
+    ``sources`` are the XSDs that were requested; more than one means the
+    schema is a composition of all of them.
+    """
+
+    schema: etree.XMLSchema
+    sources: Tuple[Path, ...]
+    fingerprints: Tuple[FileFingerprint, ...]
+    lock: threading.Lock
+    variants: Dict[Hashable, Any] = field(default_factory=dict)
+    variants_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def variant(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Return a schema (or a fact read from the XSDs) derived from this one, building it on first use.
+
+        Variants live and die with the entry, so they are invalidated together
+        with the source files. Each one is built once even when several threads
+        ask for it together. Callers validating with a variant must hold
+        ``lock`` just like for ``schema``.
+        """
+        with self.variants_lock:
+            if key not in self.variants:
+                self.variants[key] = build()
+            return self.variants[key]
+
+
+@dataclass(frozen=True)
+class SchemaCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    max_entries: int
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fingerprint(path: Path) -> FileFingerprint:
+    stat = path.stat()
+    return FileFingerprint(
+        path=path,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        digest=_file_digest(path),
+    )
+
+
+def _read_fingerprinted(path: Path) -> Tuple[bytes, FileFingerprint]:
+    """Read a file and fingerprint exactly the bytes that were read."""
+    stat = path.stat()
+    with open(path, "rb") as file:
+        data = file.read()
+    fingerprint = FileFingerprint(
+        path=path,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        digest=hashlib.sha256(data).hexdigest(),
+    )
+    return data, fingerprint
+
+
+def _refresh(fingerprints: Tuple[FileFingerprint, ...]) -> Optional[Tuple[FileFingerprint, ...]]:
+    """Fingerprints updated for touched but identical files, or None if any file changed."""
+    refreshed: List[FileFingerprint] = []
+    for fingerprint in fingerprints:
+        try:
+            stat = fingerprint.path.stat()
+        except OSError:
+            return None
+        if stat.st_mtime_ns == fingerprint.mtime_ns and stat.st_size == fingerprint.size:
+            refreshed.append(fingerprint)
+            continue
+        if stat.st_size != fingerprint.size:
+            return None
+        try:
+            if _file_digest(fingerprint.path) != fingerprint.digest:
+                return None
+        except OSError:
+            return None
+        # Touched but identical content: remember the new mtime to skip rehashing.
+        refreshed.append(
+            FileFingerprint(
+                path=fingerprint.path,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                digest=fingerprint.digest,
+            )
+        )
+    return tuple(refreshed)
+
+
+def _is_remote(location: str) -> bool:
+    return "://" in location and not location.lower().startswith("file://")
+
+
+def _local_dependencies(doc: etree._ElementTree, base: Path) -> List[Path]:
+    paths: List[Path] = []
+    for node in doc.getroot().iter(*_DEPENDENCY_TAGS):
+        location = node.get("schemaLocation")
+        if not location or _is_remote(location):
+            continue
+        if location.lower().startswith("file://"):
+            location = location[len("file://"):]
+        candidate = (base.parent / location).resolve()
+        if candidate.is_file():
+            paths.append(candidate)
+    return paths
+
+
+def collect_schema_files(root_path: Path, root_doc: Optional[etree._ElementTree] = None) -> List[Path]:
+    """Return the root XSD and every local file reachable through include/import."""
+    root_path = root_path.resolve()
+    seen: Dict[Path, None] = {root_path: None}
+    pending = [(root_path, root_doc)]
+
+    while pending:
+        path, doc = pending.pop()
+        if doc is None:
+            try:
+                doc = etree.parse(str(path))
+            except (etree.XMLSyntaxError, OSError):
+                continue
+        for dependency in _local_dependencies(doc, path):
+            if dependency not in seen:
+                seen[dependency] = None
+                pending.append((dependency, None))
+
+    return list(seen)
+
+
+def _target_namespace(doc: etree._ElementTree) -> Optional[str]:
+    return doc.getroot().get("targetNamespace") or None
+
+
+class _ComposeResolver(etree.Resolver):
+    def __init__(self, documents: Dict[str, bytes]) -> None:
+        super().__init__()
+        self.documents = documents
+
+    def resolve(self, system_url, public_id, context):  # type: ignore[override]
+        document = self.documents.get(system_url)
+        if document is None:
+            return None
+        return self.resolve_string(document, context, base_url=system_url)
+
+
+def _wrapper_schema(target_namespace: Optional[str] = None) -> etree._Element:
+    root = etree.Element(f"{{{XSD_NS}}}schema", nsmap={"xs": XSD_NS})
+    if target_namespace:
+        root.set("targetNamespace", target_namespace)
+    return root
+
+
+def compose_schema(paths: Sequence[Path], docs: Sequence[etree._ElementTree]) -> etree.XMLSchema:
+    """Compile several XSDs, possibly with different target namespaces, as one schema.
+
+    A generated wrapper includes the no-namespace schemas and imports one
+    location per target namespace. When several files share a namespace, the
+    import points to a virtual wrapper that includes all of them, since
+    libxml2 honours only the first import of a given namespace.
+    """
+    groups: Dict[Optional[str], List[Path]] = {}
+    for path, doc in zip(paths, docs):
+        groups.setdefault(_target_namespace(doc), []).append(path)
+
+    wrapper = _wrapper_schema()
+    virtual: Dict[str, bytes] = {}
+    for index, (namespace, members) in enumerate(groups.items()):
+        if namespace is None:
+            for member in members:
+                etree.SubElement(wrapper, f"{{{XSD_NS}}}include", schemaLocation=member.as_uri())
+            continue
+
+        if len(members) == 1:
+            location = members[0].as_uri()
+        else:
+            location = f"{COMPOSE_SCHEME}:{index}"
+            group_wrapper = _wrapper_schema(namespace)
+            for member in members:
+                etree.SubElement(group_wrapper, f"{{{XSD_NS}}}include", schemaLocation=member.as_uri())
+            virtual[location] = etree.tostring(group_wrapper)
+        etree.SubElement(
+            wrapper,
+            f"{{{XSD_NS}}}import",
+            namespace=namespace,
+            schemaLocation=location,
+        )
+    parser = etree.XMLParser()
+    parser.resolvers.add(_ComposeResolver(virtual))
+    document = etree.fromstring(etree.tostring(wrapper), parser, base_url=f"{COMPOSE_SCHEME}:root")
+    return etree.XMLSchema(document)
+
+
+class SchemaCache:
+    """Process-wide LRU cache of compiled XSD schemas.
+
+    Entries are keyed by the resolved XSD path, or by the tuple of paths for a
+    composed multi-XSD schema. On every lookup the stored fingerprints of the
+    schema and its include/import dependencies are checked against the
+    filesystem; a change in mtime or size triggers a content hash comparison,
+    and only a different hash forces a recompile.
+
+    Compilation runs outside the cache lock, so a slow schema only blocks
+    the threads asking for that same schema; they wait for the compile in
+    progress instead of starting their own.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser mayor que cero.")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Path, ...], CompiledSchema]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._compiling: Dict[Tuple[Path, ...], threading.Event] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, xsd_path: str | Path) -> CompiledSchema:
+        return self.get_many([xsd_path])
+
+    def get_many(self, xsd_paths: Iterable[str | Path]) -> CompiledSchema:
+        """Return one compiled schema covering all ``xsd_paths`` (duplicates ignored)."""
+        key = tuple(dict.fromkeys(Path(p).resolve() for p in xsd_paths))
+        if not key:
+            raise ValidatorError("Debe indicar al menos un XSD.")
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and self._is_fresh(entry):
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry
+                pending = self._compiling.get(key)
+                if pending is None:
+                    done = self._compiling[key] = threading.Event()
+                    self._misses += 1
+                    break
+            # Another thread is compiling this schema: use its result, or retry if it failed.
+            pending.wait()
+
+        try:
+            entry = self._compile(key)
+        except BaseException:
+            with self._lock:
+                del self._compiling[key]
+            done.set()
+            raise
+        with self._lock:
+            del self._compiling[key]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        done.set()
+        return entry
+
+    def digest(self, xsd_paths: Iterable[str | Path]) -> str:
+        """Content hash of a schema set, including its include/import dependencies.
+
+        A cached entry supplies its fingerprints without rehashing; otherwise
+        the files are read and hashed but not compiled.
+        """
+        key = tuple(dict.fromkeys(Path(p).resolve() for p in xsd_paths))
+        if not key:
+            raise ValidatorError("Debe indicar al menos un XSD.")
+        fingerprints: Optional[Tuple[FileFingerprint, ...]] = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry):
+                fingerprints = entry.fingerprints
+        if fingerprints is None:
+            files: Dict[Path, None] = {}
+            for path in key:
+                files.update(dict.fromkeys(collect_schema_files(path)))
+            try:
+                fingerprints = tuple(_fingerprint(p) for p in files)
+            except OSError as exc:
+                raise ValidatorError(f"XSD inaccesible: {exc}") from exc
+        digest = hashlib.sha256()
+        for fingerprint in fingerprints:
+            digest.update(fingerprint.digest.encode("ascii"))
+        return digest.hexdigest()
+
+    def invalidate(self, xsd_path: str | Path) -> None:
+        """Drop every entry built from ``xsd_path``, directly or as a dependency."""
+        path = Path(xsd_path).resolve()
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if any(fingerprint.path == path for fingerprint in entry.fingerprints)
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> SchemaCacheStats:
+        with self._lock:
+            return SchemaCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+            )
+
+    def _compile(self, paths: Tuple[Path, ...], attempts: int = 3) -> CompiledSchema:
+        # Fingerprint before compiling and check again afterwards: a file saved
+        # mid-compile must not leave a stale schema stored under its new hash.
+        for _ in range(attempts):
+            try:
+                loaded = [_read_fingerprinted(path) for path in paths]
+                docs = [
+                    etree.fromstring(data, base_url=str(path)).getroottree()
+                    for path, (data, _) in zip(paths, loaded)
+                ]
+                roots = {fingerprint.path: fingerprint for _, fingerprint in loaded}
+                files: Dict[Path, None] = {}
+                for path, doc in zip(paths, docs):
+                    files.update(dict.fromkeys(collect_schema_files(path, doc)))
+                fingerprints = tuple(roots.get(p) or _fingerprint(p) for p in files)
+                if len(paths) == 1:
+                    schema = etree.XMLSchema(docs[0])
+                else:
+                    schema = compose_schema(paths, docs)
+            except (etree.XMLSyntaxError, etree.XMLSchemaParseError) as exc:
+                raise ValidatorError(f"No se pudo cargar el XSD: {exc}") from exc
+            except OSError as exc:
+                raise ValidatorError(f"XSD inaccesible: {exc}") from exc
+
+            checked = _refresh(fingerprints)
+            if checked is not None:
+                return CompiledSchema(
+                    schema=schema,
+                    sources=paths,
+                    fingerprints=checked,
+                    lock=threading.Lock(),
+                )
+        raise ValidatorError("El XSD cambio mientras se compilaba; vuelva a intentarlo.")
+
+    def _is_fresh(self, entry: CompiledSchema) -> bool:
+        refreshed = _refresh(entry.fingerprints)
+        if refreshed is None:
+            return False
+        entry.fingerprints = refreshed
+        return True
+
+
+_default_cache = SchemaCache()
+
+
+def get_schema_cache() -> SchemaCache:
+    return _default_cache
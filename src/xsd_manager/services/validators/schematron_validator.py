@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import lxml.etree as etree
+from lxml import isoschematron
+
+from ...domain.models import (
+    STAGE_CONVERT,
+    STAGE_PARSE,
+    STAGE_SCHEMA,
+    STAGE_VALIDATE,
+    IssueColumns,
+    IssueSequence,
+    Severity,
+    ValidationIssue,
+    ValidationMetadata,
+    ValidationReport,
+    ValidationRequest,
+)
+from .base import BaseValidator, ValidatorError
+from .document import DocumentContext
+
+
+SVRL_NS = "http://purl.oclc.org/dsdl/svrl"
+XSLT_NS = "http://www.w3.org/1999/XSL/Transform"
+LINE_NS = "urn:xsd-manager:schematron"
+ASSERT_CODE = "SCHEMATRON_ASSERT"
+REPORT_CODE = "SCHEMATRON_REPORT"
+
+_FAILED_ASSERT = f"{{{SVRL_NS}}}failed-assert"
+_SUCCESSFUL_REPORT = f"{{{SVRL_NS}}}successful-report"
+_FIRED_RULE = f"{{{SVRL_NS}}}fired-rule"
+_TEXT = f"{{{SVRL_NS}}}text"
+
+_ROLE_SEVERITIES = {
+    "fatal": Severity.ERROR,
+    "error": Severity.ERROR,
+    "warning": Severity.WARNING,
+    "warn": Severity.WARNING,
+    "aviso": Severity.WARNING,
+    "info": Severity.INFO,
+    "information": Severity.INFO,
+}
+
+@dataclass
+class CompiledRules:
+    """A compiled Schematron rule set; apply ``transform`` under ``lock``.
+
+    ``transform`` is the validator XSLT generated by the ISO skeleton; its
+    output is the SVRL report of the document.
+    """
+
+    transform: etree.XSLT
+    source: Path
+    digest: str
+    lock: threading.Lock
+
+
+@dataclass(frozen=True)
+class SchematronCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    max_entries: int
+
+
+class SchematronCache:
+    """Process-wide LRU cache of compiled Schematron rule sets.
+
+    Compiling a rule set runs the ISO skeleton XSLT pipeline and is far more
+    expensive than validating a document, so rule sets are compiled once and
+    kept by content hash: a touched but identical file, or the same rules
+    under another path, reuse the compiled XSLT. File hashes are remembered
+    by path, mtime and size. Only the main file is hashed; edit it (or clear
+    the cache) after changing a file it includes. Compilation runs outside
+    the cache lock; callers asking for rules being compiled wait for them.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser mayor que cero.")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CompiledRules]" = OrderedDict()
+        self._digests: Dict[Path, Tuple[int, int, str]] = {}
+        self._lock = threading.RLock()
+        self._compiling: Dict[str, threading.Event] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def digest(self, path: str | Path) -> str:
+        resolved = Path(path).resolve()
+        try:
+            stat = resolved.stat()
+        except OSError as exc:
+            raise ValidatorError(f"Schematron inaccesible: {exc}") from exc
+        with self._lock:
+            known = self._digests.get(resolved)
+            if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                return known[2]
+        digest = hashlib.sha256()
+        try:
+            with open(resolved, "rb") as file:
+                for chunk in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(chunk)
+        except OSError as exc:
+            raise ValidatorError(f"Schematron inaccesible: {exc}") from exc
+        value = digest.hexdigest()
+        with self._lock:
+            self._digests[resolved] = (stat.st_mtime_ns, stat.st_size, value)
+        return value
+
+    def get(self, path: str | Path) -> CompiledRules:
+        resolved = Path(path).resolve()
+        digest = self.digest(resolved)
+        while True:
+            with self._lock:
+                entry = self._entries.get(digest)
+                if entry is not None:
+                    self._entries.move_to_end(digest)
+                    self._hits += 1
+                    return entry
+                pending = self._compiling.get(digest)
+                if pending is None:
+                    done = self._compiling[digest] = threading.Event()
+                    self._misses += 1
+                    break
+            # Another thread is compiling these rules: use its result, or retry if it failed.
+            pending.wait()
+
+        try:
+            entry = self._compile(resolved, digest)
+        except BaseException:
+            with self._lock:
+                del self._compiling[digest]
+            done.set()
+            raise
+        with self._lock:
+            del self._compiling[digest]
+            self._entries[digest] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        done.set()
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> SchematronCacheStats:
+        with self._lock:
+            return SchematronCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+            )
+
+    @staticmethod
+    def _compile(path: Path, digest: str) -> CompiledRules:
+        try:
+            schematron = isoschematron.Schematron(etree.parse(str(path)), store_xslt=True)
+            transform = etree.XSLT(
+                _line_locations(schematron.validator_xslt),
+                extensions={(LINE_NS, "line"): _source_line},
+            )
+        except (etree.XMLSyntaxError, etree.SchematronParseError, etree.XSLTParseError) as exc:
+            raise ValidatorError(f"No se pudo cargar el Schematron {path.name}: {exc}") from exc
+        except OSError as exc:
+            raise ValidatorError(f"Schematron inaccesible: {exc}") from exc
+        return CompiledRules(transform=transform, source=path, digest=digest, lock=threading.Lock())
+
+
+def _line_locations(validator_xslt: etree._ElementTree) -> etree._ElementTree:
+    """Make the skeleton write source lines instead of XPaths as ``location``.
+
+    The skeleton builds each location by counting the preceding siblings of
+    every ancestor, which is quadratic in the length of a sibling list: on a
+    document with thousands of failing lines it costs far more than the rules
+    themselves. Calling back into ``_source_line`` is constant per failure.
+    """
+    for attribute in validator_xslt.getroot().iter(f"{{{XSLT_NS}}}attribute"):
+        if attribute.get("name") != "location":
+            continue
+        for child in list(attribute):
+            attribute.remove(child)
+        value = etree.SubElement(attribute, f"{{{XSLT_NS}}}value-of", nsmap={"line": LINE_NS})
+        value.set("select", "line:line(.)")
+    return validator_xslt
+
+
+def _source_line(context, nodes) -> int:
+    if not nodes:
+        return 0
+    node = nodes[0]
+    if not isinstance(node, etree._Element):
+        # Attribute and text nodes arrive as smart strings that know their element.
+        node = node.getparent()
+    return (node.sourceline or 0) if node is not None else 0
+
+
+_default_cache = SchematronCache()
+
+
+def get_schematron_cache() -> SchematronCache:
+    return _default_cache
+
+
+class SchematronValidator(BaseValidator):
+    """Business rules in ISO Schematron, applied to the request's ``schematron_paths``.
+
+    Rule sets come from a SchematronCache and are evaluated on the parsed
+    document shared with the other validators, so streaming requests still
+    build the whole tree here. Failed assertions and successful reports
+    become issues with the line of their context node, the
+    assert/report ``id`` (or that of the rule that fired) as ``rule`` and a
+    severity from their ``role``: asserts default to ERROR, reports to AVISO.
+    """
+
+    name = "schematron"
+    version = "1"
+
+    def __init__(self, cache: Optional[SchematronCache] = None) -> None:
+        self.cache = cache if cache is not None else get_schematron_cache()
+
+    def __getstate__(self) -> dict:
+        # Compiled XSLT stays in its process; unpickled copies use that process's cache.
+        state = self.__dict__.copy()
+        state.pop("cache", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.cache = get_schematron_cache()
+
+    def supports(self, request: ValidationRequest) -> bool:
+        return bool(request.schematron_paths)
+
+    def cache_key(self, request: ValidationRequest) -> Optional[str]:
+        try:
+            digests = [self.cache.digest(path) for path in request.schematron_paths]
+        except ValidatorError:
+            return None
+        engine = ".".join(map(str, etree.LXML_VERSION)) + "/" + ".".join(map(str, etree.LIBXSLT_VERSION))
+        return f"{self.name}:{self.version}:{engine}:{','.join(digests)}"
+
+    def validate(self, request: ValidationRequest, document: Optional[DocumentContext] = None) -> ValidationReport:
+        if document is None:
+            with DocumentContext(request) as document:
+                return self.validate(request, document)
+
+        start = time.perf_counter()
+        rule_sets = [self.cache.get(path) for path in request.schematron_paths]
+        stages = {STAGE_SCHEMA: (time.perf_counter() - start) * 1000.0}
+
+        parse_start = time.perf_counter()
+        tree = document.tree()
+        stages[STAGE_PARSE] = (time.perf_counter() - parse_start) * 1000.0
+
+        reports: List[etree._ElementTree] = []
+        validate_start = time.perf_counter()
+        for rules in rule_sets:
+            with rules.lock:
+                try:
+                    reports.append(rules.transform(tree))
+                except etree.XSLTApplyError as exc:
+                    raise ValidatorError(f"Error al aplicar {rules.source.name}: {exc}") from exc
+        stages[STAGE_VALIDATE] = (time.perf_counter() - validate_start) * 1000.0
+
+        convert_start = time.perf_counter()
+        limit = request.issue_limit
+        per_code = request.max_issues_per_code
+        per_code_counts: Dict[str, int] = {}
+        collected: List[ValidationIssue] = []
+        truncated = False
+        for report in reports:
+            for issue in _svrl_issues(report):
+                if per_code is not None:
+                    seen = per_code_counts.get(issue.code or "", 0)
+                    if seen >= per_code:
+                        truncated = True
+                        continue
+                    per_code_counts[issue.code or ""] = seen + 1
+                collected.append(issue)
+                if limit is not None and len(collected) >= limit:
+                    truncated = True
+                    break
+            if limit is not None and len(collected) >= limit:
+                break
+        collected.sort(key=lambda issue: (issue.line, issue.column))
+        issues: IssueSequence = IssueColumns(collected) if request.columnar else collected
+        stages[STAGE_CONVERT] = (time.perf_counter() - convert_start) * 1000.0
+
+        return ValidationReport(
+            ok=not issues,
+            issues=issues,
+            metadata=ValidationMetadata(
+                validator=self.name,
+                elapsed_ms=(time.perf_counter() - start) * 1000.0,
+                stages=stages,
+                bytes_read=document.size,
+            ),
+            truncated=truncated,
+        )
+
+
+def _svrl_issues(report: etree._ElementTree) -> Iterator[ValidationIssue]:
+    fired_rule: Optional[str] = None
+    for node in report.getroot():
+        tag = node.tag
+        if tag == _FIRED_RULE:
+            fired_rule = node.get("id")
+            continue
+        if tag == _FAILED_ASSERT:
+            code, default = ASSERT_CODE, Severity.ERROR
+        elif tag == _SUCCESSFUL_REPORT:
+            code, default = REPORT_CODE, Severity.WARNING
+        else:
+            continue
+        role = (node.get("role") or node.get("flag") or "").strip().lower()
+        text = node.findtext(_TEXT) or node.get("test") or ""
+        # Compiled rule sets write the source line as the location (see _line_locations).
+        location = node.get("location") or ""
+        yield ValidationIssue(
+            line=int(location) if location.isdigit() else 0,
+            column=0,
+            message=" ".join(text.split()),
+            severity=_ROLE_SEVERITIES.get(role, default),
+            code=code,
+            rule=node.get("id") or fired_rule,
+        )
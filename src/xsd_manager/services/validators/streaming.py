@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import copy
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import lxml.etree as etree
+
+from ...infra.files import BufferReader
+from .base import ValidatorError
+from .schema_cache import XSD_NS, CompiledSchema, collect_schema_files
+
+
+_ELEMENT = f"{{{XSD_NS}}}element"
+_OCCURRENCE_ATTRS = ("minOccurs", "maxOccurs", "form")
+
+
+def _split_tag(tag: str) -> tuple[Optional[str], str]:
+    if tag.startswith("{"):
+        namespace, _, local = tag[1:].partition("}")
+        return namespace or None, local
+    return None, tag
+
+
+def build_record_schema(xsd_paths: Sequence[Path], record_tag: str) -> Optional[etree.XMLSchema]:
+    """Compile a schema that accepts ``record_tag`` as a validation root.
+
+    Returns None when one of the schemas already declares the element
+    globally, in which case the base schema can validate the record directly.
+    Otherwise the first local declaration with that name is promoted to a
+    global one in a copy of the XSD that holds it, keeping its type reference
+    or inline type.
+    """
+    _, local = _split_tag(record_tag)
+    found: Optional[tuple[Path, etree._Element, etree._Element]] = None
+
+    for xsd_path in xsd_paths:
+        try:
+            xsd_doc = etree.parse(str(xsd_path))
+        except (etree.XMLSyntaxError, OSError) as exc:
+            raise ValidatorError(f"No se pudo cargar el XSD: {exc}") from exc
+
+        root = xsd_doc.getroot()
+        for child in root.iterchildren(_ELEMENT):
+            if child.get("name") == local:
+                return None
+        if found is None:
+            declaration = next(
+                (node for node in root.iter(_ELEMENT) if node.get("name") == local),
+                None,
+            )
+            if declaration is not None:
+                found = (xsd_path, root, declaration)
+
+    if found is None:
+        raise ValidatorError(f"El XSD no declara el elemento de registro '{local}'.")
+
+    xsd_path, root, declaration = found
+    promoted = copy.deepcopy(declaration)
+    for attr in _OCCURRENCE_ATTRS:
+        promoted.attrib.pop(attr, None)
+    root.append(promoted)
+
+    # Re-parse with the original base URL so relative include/import keep resolving.
+    derived = etree.fromstring(etree.tostring(root), base_url=xsd_path.as_uri())
+    try:
+        return etree.XMLSchema(derived)
+    except etree.XMLSchemaParseError as exc:
+        raise ValidatorError(f"No se pudo derivar el esquema del registro '{local}': {exc}") from exc
+
+
+def record_min_occurs(xsd_paths: Sequence[Path], record_tag: str) -> int:
+    """Largest minOccurs among the declarations and references of ``record_tag``.
+
+    Looks at every element particle with that local name in the XSDs and
+    their include/import dependencies; 1 when none sets a larger minimum.
+    """
+    _, local = _split_tag(record_tag)
+    files: Dict[Path, None] = {}
+    for xsd_path in xsd_paths:
+        files.update(dict.fromkeys(collect_schema_files(Path(xsd_path))))
+    minimum = 1
+    for path in files:
+        try:
+            xsd_doc = etree.parse(str(path))
+        except (etree.XMLSyntaxError, OSError) as exc:
+            raise ValidatorError(f"No se pudo cargar el XSD: {exc}") from exc
+        for node in xsd_doc.getroot().iter(_ELEMENT):
+            name = node.get("name") or node.get("ref", "").rpartition(":")[2]
+            if name != local:
+                continue
+            try:
+                minimum = max(minimum, int(node.get("minOccurs", "1")))
+            except ValueError:
+                continue
+    return minimum
+
+
+@dataclass
+class StreamStats:
+    """Counters filled in by stream_validate() while it runs."""
+
+    elements: int = 0
+    records: int = 0
+    validate_s: float = 0.0
+
+
+class _RecordSchemas:
+    def __init__(self, compiled: CompiledSchema, strict: bool) -> None:
+        self.compiled = compiled
+        self.strict = strict
+        self._resolved: Dict[str, Optional[etree.XMLSchema]] = {}
+        self._keep: Dict[str, int] = {}
+
+    def get(self, tag: str) -> Optional[etree.XMLSchema]:
+        """Return the schema for records with ``tag``, or None if it has no declaration."""
+        if tag not in self._resolved:
+            try:
+                schema = self.compiled.variant(
+                    ("record", tag),
+                    lambda: build_record_schema(self.compiled.sources, tag) or self.compiled.schema,
+                )
+            except ValidatorError:
+                if self.strict:
+                    raise
+                schema = None
+            self._resolved[tag] = schema
+        return self._resolved[tag]
+
+    def keep(self, tag: str) -> int:
+        """How many records with ``tag`` each parent keeps for the final skeleton check."""
+        if tag not in self._keep:
+            self._keep[tag] = self.compiled.variant(
+                ("min_occurs", tag),
+                lambda: record_min_occurs(self.compiled.sources, tag),
+            )
+        return self._keep[tag]
+
+
+def stream_validate(
+    source: Union[Path, BinaryIO, BufferReader],
+    compiled: CompiledSchema,
+    record_tag: Optional[str] = None,
+    stats: Optional[StreamStats] = None,
+) -> Iterator[etree._LogEntry]:
+    """Validate a large XML with bounded memory, yielding schema error log entries.
+
+    Records are the direct children of the root, or every element matching
+    ``record_tag`` (Clark notation or local name) when given. Each record is
+    validated on its own as soon as it is fully parsed and then removed from
+    the tree. Under every parent the first records of each tag are kept, as
+    many as the largest minOccurs the XSDs give that tag, so the remaining
+    skeleton can be checked against the full schema at the end; that pass
+    covers the envelope structure, attributes and minimum counts. maxOccurs
+    of the streamed records is not checked, since the surplus records are
+    gone by then.
+
+    When ``stats`` is given it counts the elements parsed and the records
+    validated, and accumulates the time spent inside the schema validator.
+    """
+    stats = stats if stats is not None else StreamStats()
+    records = _RecordSchemas(compiled, strict=record_tag is not None)
+    match_local = record_tag is not None and not record_tag.startswith("{")
+    kept: Dict[Tuple[Optional[etree._Element], str], int] = {}
+    depth = 0
+    root: Optional[etree._Element] = None
+
+    try:
+        for event, elem in etree.iterparse(
+            str(source) if isinstance(source, Path) else source,
+            events=("start", "end"),
+            huge_tree=True,
+        ):
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+
+            depth -= 1
+            stats.elements += 1
+            if record_tag is None:
+                is_record = depth == 1
+            elif match_local:
+                is_record = _split_tag(elem.tag)[1] == record_tag
+            else:
+                is_record = elem.tag == record_tag
+            if not is_record:
+                continue
+
+            parent = elem.getparent()
+            slot = (parent, elem.tag)
+            count = kept.get(slot, 0)
+            if count < records.keep(elem.tag):
+                kept[slot] = count + 1
+                continue
+
+            schema = records.get(elem.tag)
+            if schema is not None:
+                start = time.perf_counter()
+                with compiled.lock:
+                    schema.validate(elem)
+                    entries = list(schema.error_log)
+                stats.validate_s += time.perf_counter() - start
+                stats.records += 1
+                yield from entries
+
+            elem.clear()
+            if parent is not None:
+                parent.remove(elem)
+    except etree.XMLSyntaxError as exc:
+        raise ValidatorError(f"XML mal formado: {exc}") from exc
+    except OSError as exc:
+        raise ValidatorError(f"XML mal formateado o inaccesible: {exc}") from exc
+
+    if root is None:
+        return
+
+    start = time.perf_counter()
+    with compiled.lock:
+        compiled.schema.validate(root.getroottree())
+        entries = list(compiled.schema.error_log)
+    stats.validate_s += time.perf_counter() - start
+    yield from entries
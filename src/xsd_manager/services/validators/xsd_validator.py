@@ -2,10 +2,18 @@ from __future__ import annotations
 
 import time
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import lxml.etree as etree
 
 from ...domain.models import (
+    STAGE_CLASSIFY,
+    STAGE_CONVERT,
+    STAGE_PARSE,
+    STAGE_SCHEMA,
+    STAGE_VALIDATE,
+    IssueColumns,
+    IssueSequence,
     Severity,
     ValidationIssue,
     ValidationMetadata,
@@ -13,53 +21,61 @@ from ...domain.models import (
     ValidationRequest,
 )
 from .base import BaseValidator, ValidatorError
-
-
-WARNING_KEYS = (
-    "pattern",
-    "length",
-    "minlength",
-    "maxlength",
-    "datatype",
-    "type",
-    "fractiondigits",
-    "totaldigits",
-    "mininclusive",
-    "maxinclusive",
-    "minexclusive",
-    "maxexclusive",
-)
-
-ERROR_KEYS = (
-    "missing child element",
-    "attribute",
-    "is required",
-    "not expected",
-    "no matching global declaration",
-)
+from .classification import ERROR_KEYS, WARNING_KEYS, MessageClassifier, get_default_classifier  # noqa: F401
+from .document import DocumentContext
+from .schema_cache import CompiledSchema, SchemaCache, get_schema_cache
+from .streaming import StreamStats, stream_validate
 
 
 def classify_message(message: str) -> Severity:
-    text = message.lower()
-    for key in ERROR_KEYS:
-        if key in text:
-            return Severity.ERROR
-    for key in WARNING_KEYS:
-        if key in text:
-            return Severity.WARNING
-    return Severity.ERROR
+    return get_default_classifier().classify(message)
 
 
 class XsdValidator(BaseValidator):
     name = "xsd"
+    version = "1"
+
+    def __init__(
+        self,
+        schema_cache: Optional[SchemaCache] = None,
+        classifier: Optional[MessageClassifier] = None,
+    ) -> None:
+        self.schema_cache = schema_cache if schema_cache is not None else get_schema_cache()
+        self.classifier = classifier if classifier is not None else get_default_classifier()
+
+    def __getstate__(self) -> dict:
+        # Compiled schemas cannot cross process boundaries; a pickled validator
+        # binds to the process-wide cache of whichever process unpickles it.
+        state = self.__dict__.copy()
+        state.pop("schema_cache", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.schema_cache = get_schema_cache()
 
     def supports(self, request: ValidationRequest) -> bool:
         return bool(request.xml_path and request.xsd_paths)
 
-    def validate(self, request: ValidationRequest) -> ValidationReport:
+    def cache_key(self, request: ValidationRequest) -> Optional[str]:
+        existing_xsds = [Path(p) for p in request.xsd_paths if Path(p).exists()]
+        if not existing_xsds:
+            return None
+        try:
+            schema_digest = self.schema_cache.digest(existing_xsds)
+        except ValidatorError:
+            return None
+        engine = ".".join(map(str, etree.LXML_VERSION)) + "/" + ".".join(map(str, etree.LIBXML_VERSION))
+        return f"{self.name}:{self.version}:{engine}:{self.classifier.fingerprint}:{schema_digest}"
+
+    def validate(self, request: ValidationRequest, document: Optional[DocumentContext] = None) -> ValidationReport:
+        if document is None:
+            with DocumentContext(request) as document:
+                return self.validate(request, document)
+
         start = time.perf_counter()
 
-        if not request.xml_path.exists():
+        if request.xml_content is None and not request.xml_path.exists():
             raise ValidatorError(f"XML no encontrado: {request.xml_path}")
         if not request.xsd_paths:
             raise ValidatorError("Debe indicar al menos un XSD.")
@@ -68,36 +84,172 @@ class XsdValidator(BaseValidator):
         if not existing_xsds:
             raise ValidatorError("No se encontro ningun XSD valido.")
 
-        try:
-            xsd_doc = etree.parse(str(existing_xsds[0]))
-            schema = etree.XMLSchema(xsd_doc)
-        except (etree.XMLSyntaxError, etree.XMLSchemaParseError) as exc:
-            raise ValidatorError(f"No se pudo cargar el XSD: {exc}") from exc
+        schema_start = time.perf_counter()
+        compiled = self.schema_cache.get_many(existing_xsds)
+        metadata = ValidationMetadata(
+            validator=self.name,
+            elapsed_ms=0.0,
+            stages={STAGE_SCHEMA: (time.perf_counter() - schema_start) * 1000.0},
+            bytes_read=document.size,
+        )
+        limiter = _IssueLimiter(request)
 
-        try:
-            xml_doc = etree.parse(str(request.xml_path))
-        except etree.XMLSyntaxError as exc:
-            raise ValidatorError(f"XML mal formado: {exc}") from exc
-        except OSError as exc:
-            raise ValidatorError(f"XML mal formateado o inaccesible: {exc}") from exc
-
-        schema.validate(xml_doc)
-
-        issues = []
-        for entry in schema.error_log:
-            issues.append(
-                ValidationIssue(
-                    line=entry.line,
-                    column=entry.column,
-                    message=entry.message,
-                    code=entry.type_name,
-                    severity=classify_message(entry.message),
-                )
-            )
+        # In streaming mode the limiter closes the iterparse generator, so the
+        # rest of the document is never read. A tree validation always runs to
+        # the end inside libxml2; there the limits only cut the log conversion.
+        if request.streaming:
+            issues = self._validate_stream(request, document, compiled, limiter, metadata)
+        else:
+            issues = self._validate_tree(request, document, compiled, limiter, metadata)
 
-        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        metadata.elapsed_ms = (time.perf_counter() - start) * 1000.0
         return ValidationReport(
             ok=not issues,
             issues=issues,
-            metadata=ValidationMetadata(validator=self.name, elapsed_ms=elapsed_ms),
+            metadata=metadata,
+            truncated=limiter.truncated,
+        )
+
+    def _validate_stream(
+        self,
+        request: ValidationRequest,
+        document: DocumentContext,
+        compiled: CompiledSchema,
+        limiter: "_IssueLimiter",
+        metadata: ValidationMetadata,
+    ) -> IssueSequence:
+        stats = StreamStats()
+        converter = _IssueConverter(self.classifier, columnar=False)
+        convert_s = 0.0
+        start = time.perf_counter()
+        entries = stream_validate(document.source(), compiled, request.record_tag, stats)
+        try:
+            for entry in limiter.filter(entries):
+                convert_start = time.perf_counter()
+                converter.add(entry)
+                convert_s += time.perf_counter() - convert_start
+        finally:
+            entries.close()
+        stream_s = time.perf_counter() - start
+
+        convert_start = time.perf_counter()
+        collected: List[ValidationIssue] = converter.issues  # type: ignore[assignment]
+        collected.sort(key=lambda issue: (issue.line, issue.column))
+        issues: IssueSequence = IssueColumns(collected) if request.columnar else collected
+        convert_s += time.perf_counter() - convert_start
+
+        # Parsing and validation interleave; whatever the loop spent outside
+        # the validator and the conversion went to iterparse.
+        metadata.stages[STAGE_PARSE] = max(stream_s - stats.validate_s - convert_s, 0.0) * 1000.0
+        metadata.stages[STAGE_VALIDATE] = stats.validate_s * 1000.0
+        metadata.stages[STAGE_CONVERT] = (convert_s - converter.classify_s) * 1000.0
+        metadata.stages[STAGE_CLASSIFY] = converter.classify_s * 1000.0
+        metadata.elements = stats.elements
+        return issues
+
+    def _validate_tree(
+        self,
+        request: ValidationRequest,
+        document: DocumentContext,
+        compiled: CompiledSchema,
+        limiter: "_IssueLimiter",
+        metadata: ValidationMetadata,
+    ) -> IssueSequence:
+        stages = metadata.stages
+        # Parses on first use; later validators of the run get the same tree,
+        # so for them this stage is the wait for another validator's parse.
+        start = time.perf_counter()
+        xml_doc = document.tree()
+        stages[STAGE_PARSE] = (time.perf_counter() - start) * 1000.0
+        if request.count_elements:
+            metadata.elements = int(xml_doc.xpath("count(//*)"))
+
+        # The error log lives on the shared schema object, so read it under its lock.
+        converter = _IssueConverter(self.classifier, request.columnar)
+        with compiled.lock:
+            start = time.perf_counter()
+            compiled.schema.validate(xml_doc)
+            stages[STAGE_VALIDATE] = (time.perf_counter() - start) * 1000.0
+            start = time.perf_counter()
+            for entry in limiter.filter(compiled.schema.error_log):
+                converter.add(entry)
+            convert_s = time.perf_counter() - start
+        stages[STAGE_CONVERT] = (convert_s - converter.classify_s) * 1000.0
+        stages[STAGE_CLASSIFY] = converter.classify_s * 1000.0
+        return converter.issues
+
+    def _to_issue(self, entry: etree._LogEntry) -> ValidationIssue:
+        message = entry.message
+        code = entry.type_name
+        return ValidationIssue(
+            line=entry.line,
+            column=entry.column,
+            message=message,
+            code=code,
+            severity=self.classifier.classify(message, code),
         )
+
+
+class _IssueConverter:
+    """Build issues from log entries, timing classification on its own.
+
+    Severities are remembered per (message, code) for the run, so only the
+    first occurrence of a message is timed and handed to the classifier.
+    """
+
+    def __init__(self, classifier: MessageClassifier, columnar: bool) -> None:
+        self.classifier = classifier
+        self.columnar = columnar
+        self.issues: IssueSequence = IssueColumns() if columnar else []
+        self.classify_s = 0.0
+        self._severities: Dict[Tuple[str, Optional[str]], Severity] = {}
+
+    def add(self, entry: etree._LogEntry) -> None:
+        message = entry.message
+        code = entry.type_name
+        severity = self._severities.get((message, code))
+        if severity is None:
+            start = time.perf_counter()
+            severity = self.classifier.classify(message, code)
+            self.classify_s += time.perf_counter() - start
+            self._severities[(message, code)] = severity
+        if self.columnar:
+            self.issues.add(entry.line, entry.column, message, severity, code)  # type: ignore[union-attr]
+        else:
+            self.issues.append(  # type: ignore[union-attr]
+                ValidationIssue(line=entry.line, column=entry.column, message=message, code=code, severity=severity)
+            )
+
+
+class _IssueLimiter:
+    """Apply the issue limits of a request to a stream of log entries.
+
+    ``truncated`` is set once an entry is dropped by the per-code limit or
+    the overall limit is reached, since validation stops there and later
+    issues are never looked for.
+    """
+
+    def __init__(self, request: ValidationRequest) -> None:
+        self.limit = request.issue_limit
+        self.per_code = request.max_issues_per_code
+        self.truncated = False
+        self._accepted = 0
+        self._per_code_counts: Dict[str, int] = {}
+
+    def filter(self, entries: Iterable[etree._LogEntry]) -> Iterator[etree._LogEntry]:
+        if self.limit is None and self.per_code is None:
+            yield from entries
+            return
+        for entry in entries:
+            if self.per_code is not None:
+                seen = self._per_code_counts.get(entry.type_name, 0)
+                if seen >= self.per_code:
+                    self.truncated = True
+                    continue
+                self._per_code_counts[entry.type_name] = seen + 1
+            self._accepted += 1
+            yield entry
+            if self.limit is not None and self._accepted >= self.limit:
+                # Stop right away: the rest of the document is never read.
+                self.truncated = True
+                return
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLES = ROOT / "samples"
+
+# The CLI and the GUI import the package from src/, the tests do the same.
+sys.path.insert(0, str(ROOT / "src"))
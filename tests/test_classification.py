@@ -0,0 +1,112 @@
+import json
+import pickle
+
+import pytest
+
+from xsd_manager.domain.models import Severity
+from xsd_manager.services.validators import classification
+from xsd_manager.services.validators.classification import MessageClassifier
+
+
+@pytest.mark.parametrize(
+    "message, severity",
+    [
+        ("Element 'Linea': Missing child element(s). Expected is ( Cantidad ).", Severity.ERROR),
+        ("Element 'Total': This element is not expected.", Severity.ERROR),
+        ("Element 'NIF': [facet 'pattern'] The value 'X' is not accepted by the pattern '[A-Z][0-9]{8}'.", Severity.WARNING),
+        ("Element 'Nombre': [facet 'maxLength'] The value has a length of '300'.", Severity.WARNING),
+        ("Element 'Cantidad': 'x' is not a valid value of the atomic type 'xs:decimal'.", Severity.WARNING),
+        # An error key wins over a warning key in the same message.
+        ("Element 'Linea', attribute 'tipo': [facet 'pattern'] no valido.", Severity.ERROR),
+        ("Algo completamente distinto", Severity.ERROR),
+    ],
+)
+def test_default_tables(message, severity):
+    assert MessageClassifier().classify(message) is severity
+
+
+def test_matching_ignores_case_and_uses_default():
+    classifier = MessageClassifier(error_keys=["FATAL"], warning_keys=["Aviso"], default=Severity.INFO)
+    assert classifier.classify("fallo fatal") is Severity.ERROR
+    assert classifier.classify("un AVISO") is Severity.WARNING
+    assert classifier.classify("nada") is Severity.INFO
+
+
+def test_compacted_keys_keep_the_shortest():
+    assert classification._compact(["maxLength", "length", "LENGTH", "", "pattern"]) == ("length", "pattern")
+
+
+def test_messages_are_memoized(monkeypatch):
+    classifier = MessageClassifier(cache_size=2)
+    calls = []
+    match = classifier._match
+
+    def counting_match(message):
+        calls.append(message)
+        return match(message)
+
+    monkeypatch.setattr(classifier, "_match", counting_match)
+    for _ in range(3):
+        classifier.classify("not expected")
+    assert calls == ["not expected"]
+    classifier.classify("b")
+    classifier.classify("c")
+    # The memo is cleared once full, so it never grows past cache_size.
+    assert len(classifier._cache) <= 2
+
+
+def test_memo_is_not_pickled():
+    classifier = MessageClassifier()
+    classifier.classify("not expected")
+    copy = pickle.loads(pickle.dumps(classifier))
+    assert copy._cache == {}
+    assert copy.fingerprint == classifier.fingerprint
+
+
+def test_code_severities_take_precedence():
+    classifier = MessageClassifier(code_severities={"SCHEMAV_ELEMENT_CONTENT": "info", "SCHEMAV_CVC_PATTERN_VALID": Severity.ERROR})
+    message = "Element 'Total': This element is not expected."
+    assert classifier.classify(message, code="SCHEMAV_ELEMENT_CONTENT") is Severity.INFO
+    assert classifier.classify("[facet 'pattern']", code="SCHEMAV_CVC_PATTERN_VALID") is Severity.ERROR
+    assert classifier.classify(message, code="OTRO") is Severity.ERROR
+    assert classifier.classify(message) is Severity.ERROR
+
+
+def test_unknown_severity_is_rejected():
+    with pytest.raises(ValueError, match="Severidad desconocida"):
+        MessageClassifier(code_severities={"X": "grave"})
+
+
+def test_from_mapping():
+    classifier = MessageClassifier.from_mapping({"warning_keys": ["obsoleto"], "default": "AVISO"})
+    assert classifier.error_keys == classification.ERROR_KEYS
+    assert classifier.classify("campo obsoleto") is Severity.WARNING
+    assert classifier.default is Severity.WARNING
+    with pytest.raises(ValueError, match="Claves desconocidas"):
+        MessageClassifier.from_mapping({"errores": []})
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "clasificacion.json"
+    path.write_text(json.dumps({"error_keys": ["roto"], "code_severities": {"C1": "INFO"}}), encoding="utf-8")
+    classifier = MessageClassifier.from_file(path)
+    assert classifier.classify("esta roto") is Severity.ERROR
+    assert classifier.classify("no expected", code="C1") is Severity.INFO
+    path.write_text("[1, 2]", encoding="utf-8")
+    with pytest.raises(ValueError, match="objeto JSON"):
+        MessageClassifier.from_file(path)
+    path.write_text("{roto", encoding="utf-8")
+    with pytest.raises(ValueError, match="Clasificacion no valida"):
+        MessageClassifier.from_file(path)
+
+
+def test_fingerprint_follows_the_outcome_tables():
+    base = MessageClassifier()
+    assert MessageClassifier().fingerprint == base.fingerprint
+    # Redundant or reordered keys do not change how messages are classified.
+    reordered = MessageClassifier(error_keys=reversed(classification.ERROR_KEYS))
+    assert reordered.fingerprint == base.fingerprint
+    assert MessageClassifier(warning_keys=[*classification.WARNING_KEYS, "maxLength"]).fingerprint == base.fingerprint
+    assert MessageClassifier(error_keys=["otra"]).fingerprint != base.fingerprint
+    assert MessageClassifier(code_severities={"C": "INFO"}).fingerprint != base.fingerprint
+    assert MessageClassifier(default=Severity.WARNING).fingerprint != base.fingerprint
@@ -0,0 +1,85 @@
+import os
+
+import lxml.etree as etree
+
+from xsd_manager.services.validators.schema_cache import SchemaCache, compose_schema
+
+
+def _xsd(body, namespace=None):
+    target = f' targetNamespace="{namespace}" xmlns="{namespace}" elementFormDefault="qualified"' if namespace else ""
+    return f'<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"{target}>{body}</xs:schema>'
+
+
+def _element(name, type_name="xs:string"):
+    return f'<xs:element name="{name}" type="{type_name}"/>'
+
+
+def _write(tmp_path, name, body, namespace=None):
+    path = tmp_path / name
+    path.write_text(_xsd(body, namespace))
+    return path
+
+
+def _compose(*paths):
+    return compose_schema(paths, [etree.parse(str(path)) for path in paths])
+
+
+def _valid(schema, xml):
+    return schema.validate(etree.fromstring(xml))
+
+
+def test_two_no_namespace_schemas(tmp_path):
+    schema = _compose(
+        _write(tmp_path, "a.xsd", _element("a")),
+        _write(tmp_path, "b.xsd", _element("b", "xs:int")),
+    )
+    assert _valid(schema, "<a>text</a>")
+    assert _valid(schema, "<b>3</b>")
+    assert not _valid(schema, "<b>x</b>")
+    assert not _valid(schema, "<c/>")
+
+
+def test_schemas_sharing_a_namespace_use_virtual_wrapper(tmp_path):
+    # libxml2 honours only the first import per namespace: both members must still count.
+    schema = _compose(
+        _write(tmp_path, "a.xsd", _element("a"), "urn:shared"),
+        _write(tmp_path, "b.xsd", _element("b", "xs:int"), "urn:shared"),
+    )
+    assert _valid(schema, '<a xmlns="urn:shared">text</a>')
+    assert _valid(schema, '<b xmlns="urn:shared">3</b>')
+    assert not _valid(schema, '<b xmlns="urn:shared">x</b>')
+    assert not _valid(schema, "<a>text</a>")
+
+
+def test_mixed_namespaces(tmp_path):
+    schema = _compose(
+        _write(tmp_path, "plain.xsd", _element("plain")),
+        _write(tmp_path, "one.xsd", _element("one", "xs:int"), "urn:one"),
+        _write(tmp_path, "two.xsd", _element("two", "xs:boolean"), "urn:two"),
+        _write(tmp_path, "two-extra.xsd", _element("extra"), "urn:two"),
+    )
+    assert _valid(schema, "<plain>x</plain>")
+    assert _valid(schema, '<one xmlns="urn:one">1</one>')
+    assert _valid(schema, '<two xmlns="urn:two">true</two>')
+    assert _valid(schema, '<extra xmlns="urn:two">x</extra>')
+    assert not _valid(schema, '<one xmlns="urn:two">1</one>')
+    assert not _valid(schema, '<two xmlns="urn:two">maybe</two>')
+
+
+def test_composite_key_invalidated_when_one_member_changes(tmp_path):
+    cache = SchemaCache()
+    first_path = _write(tmp_path, "a.xsd", _element("a"), "urn:shared")
+    second_path = _write(tmp_path, "b.xsd", _element("b", "xs:int"), "urn:shared")
+    first = cache.get_many([first_path, second_path])
+    assert cache.get_many([str(first_path), str(second_path)]) is first
+    # A single-XSD entry for the unchanged member is a separate key.
+    single = cache.get(first_path)
+
+    second_path.write_text(_xsd(_element("b"), "urn:shared"))
+    stat = second_path.stat()
+    os.utime(second_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    second = cache.get_many([first_path, second_path])
+    assert second is not first
+    assert _valid(second.schema, '<b xmlns="urn:shared">x</b>')
+    assert cache.get(first_path) is single
@@ -0,0 +1,43 @@
+import pytest
+
+from xsd_manager.domain.models import ValidationRequest
+from xsd_manager.infra import files
+from xsd_manager.services.validators.base import ValidatorError
+from xsd_manager.services.validators.document import DocumentContext
+
+
+def _request(path):
+    return ValidationRequest(xml_path=path, xsd_paths=[])
+
+
+def test_path_is_parsed_from_the_mapping(tmp_path, monkeypatch):
+    path = tmp_path / "doc.xml"
+    path.write_bytes(b"<root>\n  <a>1</a>\n</root>\n")
+    opened = []
+    original_open = files.MappedFile.open
+
+    def counting_open(self):
+        opened.append(self.path)
+        return original_open(self)
+
+    monkeypatch.setattr(files.MappedFile, "open", counting_open)
+    with DocumentContext(_request(path)) as document:
+        tree = document.tree()
+        assert tree.getroot()[0].sourceline == 2
+        assert bytes(document.data()) == path.read_bytes()
+        assert document.tree() is tree
+    assert len(opened) == 1
+
+
+def test_path_syntax_error(tmp_path):
+    path = tmp_path / "bad.xml"
+    path.write_bytes(b"<root><a></root>")
+    with DocumentContext(_request(path)) as document:
+        with pytest.raises(ValidatorError, match="mal formado"):
+            document.tree()
+
+
+def test_missing_path(tmp_path):
+    with DocumentContext(_request(tmp_path / "missing.xml")) as document:
+        with pytest.raises(ValidatorError, match="inaccesible"):
+            document.tree()
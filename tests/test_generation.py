@@ -0,0 +1,227 @@
+import random
+import re
+
+import pytest
+
+from conftest import SAMPLES
+from xsd_manager.domain.models import Severity, ValidationRequest
+from xsd_manager.services.generation.patterns import PatternError, PatternSampler, translate
+from xsd_manager.services.generation.xml_generator import GeneratorError, XmlGenerator
+from xsd_manager.services.validators.schema_cache import SchemaCache
+from xsd_manager.services.validators.xsd_validator import XsdValidator
+
+
+SAMPLE_XSD = SAMPLES / "xsd_ejemplo_1.xsd"
+
+SHAPES_XSD = """<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="urn:test:shapes"
+           xmlns="urn:test:shapes" elementFormDefault="qualified">
+  <xs:simpleType name="Code">
+    <xs:restriction base="xs:string">
+      <xs:pattern value="[A-Z]{2}-\\d{3}"/>
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:simpleType name="Color">
+    <xs:restriction base="xs:token">
+      <xs:enumeration value="rojo"/>
+      <xs:enumeration value="verde"/>
+    </xs:restriction>
+  </xs:simpleType>
+  <xs:complexType name="Node">
+    <xs:sequence>
+      <xs:element name="label" type="xs:string"/>
+      <xs:element name="node" type="Node" minOccurs="0" maxOccurs="2"/>
+    </xs:sequence>
+  </xs:complexType>
+  <xs:element name="shapes">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="shape" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:choice>
+                <xs:element name="circle">
+                  <xs:complexType>
+                    <xs:attribute name="radius" type="xs:positiveInteger" use="required"/>
+                  </xs:complexType>
+                </xs:element>
+                <xs:element name="square">
+                  <xs:complexType>
+                    <xs:attribute name="side" use="required">
+                      <xs:simpleType>
+                        <xs:restriction base="xs:decimal">
+                          <xs:minExclusive value="0"/>
+                          <xs:maxInclusive value="99.5"/>
+                          <xs:fractionDigits value="1"/>
+                        </xs:restriction>
+                      </xs:simpleType>
+                    </xs:attribute>
+                  </xs:complexType>
+                </xs:element>
+              </xs:choice>
+              <xs:element name="color" type="Color"/>
+              <xs:element name="code" type="Code" minOccurs="2" maxOccurs="4"/>
+              <xs:element name="name" minOccurs="0">
+                <xs:simpleType>
+                  <xs:restriction base="xs:string">
+                    <xs:minLength value="3"/>
+                    <xs:maxLength value="5"/>
+                  </xs:restriction>
+                </xs:simpleType>
+              </xs:element>
+              <xs:element name="tree" type="Node" minOccurs="0"/>
+            </xs:sequence>
+            <xs:attribute name="id" type="xs:ID" use="required"/>
+            <xs:attribute name="made" type="xs:date"/>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>
+"""
+
+
+@pytest.fixture
+def shapes_xsd(tmp_path):
+    path = tmp_path / "shapes.xsd"
+    path.write_text(SHAPES_XSD)
+    return path
+
+
+def _validate(xml_path, xsd_path):
+    request = ValidationRequest(xml_path=xml_path, xsd_paths=[xsd_path])
+    return XsdValidator(schema_cache=SchemaCache()).validate(request)
+
+
+# -- patterns ---------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "pattern, valid, invalid",
+    [
+        (r"[A-Z]{3}", "EUR", "EURO"),
+        (r"\d{2}-\d{2}", "12-34", "1234"),
+        (r"a^b$", "a^b$", "ab"),
+        (r"\i\c*", "_x-1", "1x"),
+        (r"\p{Lu}\p{Ll}+", "Ab", "ab"),
+        (r"[^0-9]+", "abc", "a1"),
+    ],
+)
+def test_translate(pattern, valid, invalid):
+    compiled = re.compile(translate(pattern))
+    assert compiled.match(valid)
+    assert not compiled.match(invalid)
+
+
+@pytest.mark.parametrize("pattern", [r"[a-z-[aeiou]]", r"\p{Xx}", r"[\I]", r"\p"])
+def test_unsupported_patterns(pattern):
+    with pytest.raises(PatternError):
+        PatternSampler([pattern])
+
+
+@pytest.mark.parametrize(
+    "patterns, min_length, max_length",
+    [
+        ([r"[A-Za-z0-9\-/]{1,30}"], 0, None),
+        ([r"[A-Z]\d{8}", r"\d{8}[A-Z]"], 0, None),
+        ([r"[a-z]+"], 3, 5),
+        ([r"(ab|cd)*x?"], 0, 4),
+        ([r"\w\s\S"], 0, None),
+    ],
+)
+def test_samples_match(patterns, min_length, max_length):
+    sampler = PatternSampler(patterns, min_length=min_length, max_length=max_length)
+    rng = random.Random(7)
+    for _ in range(50):
+        value = sampler.sample(rng)
+        assert sampler.matches(value)
+        assert len(value) >= min_length
+        assert max_length is None or len(value) <= max_length
+        assert not sampler.matches(sampler.invalid(value))
+
+
+def test_no_invalid_value_for_anything():
+    assert PatternSampler([r".*"]).invalid("x") is None
+
+
+def test_impossible_length():
+    with pytest.raises(PatternError):
+        PatternSampler([r"[a-z]{2}"], min_length=5).sample(random.Random(0))
+
+
+def test_samples_are_seeded():
+    sampler = PatternSampler([r"[A-Z]{2}\d{4}"])
+    assert sampler.sample(random.Random(3)) == sampler.sample(random.Random(3))
+
+
+# -- generator --------------------------------------------------------------
+
+
+def test_generated_invoices_are_valid(tmp_path):
+    generator = XmlGenerator(SAMPLE_XSD)
+    stats = generator.write_corpus(tmp_path, 5, prefix="factura")
+    paths = sorted(tmp_path.glob("factura_*.xml"))
+    assert [path.name for path in paths][0] == "factura_000001.xml"
+    assert stats.documents == len(paths) == 5
+    assert stats.violations == 0
+    assert stats.bytes_written == sum(path.stat().st_size for path in paths)
+    for path in paths:
+        assert _validate(path, SAMPLE_XSD).ok, path.name
+
+
+def test_generated_shapes_are_valid(tmp_path, shapes_xsd):
+    for seed in range(10):
+        path = tmp_path / f"shapes_{seed}.xml"
+        XmlGenerator(shapes_xsd, seed=seed, optional_rate=0.7).write(path)
+        report = _validate(path, shapes_xsd)
+        assert report.ok, [issue.message for issue in report.issues]
+
+
+def test_same_seed_same_document(tmp_path):
+    first, second, other = tmp_path / "a.xml", tmp_path / "b.xml", tmp_path / "c.xml"
+    XmlGenerator(SAMPLE_XSD, seed=11).write(first)
+    XmlGenerator(SAMPLE_XSD, seed=11).write(second)
+    XmlGenerator(SAMPLE_XSD, seed=11).write(other, index=1)
+    assert first.read_bytes() == second.read_bytes()
+    assert first.read_bytes() != other.read_bytes()
+
+
+def test_target_bytes(tmp_path):
+    path = tmp_path / "grande.xml"
+    stats = XmlGenerator(SAMPLE_XSD).write(path, target_bytes=50_000, repeat_element="Linea")
+    assert 50_000 <= path.stat().st_size < 55_000
+    assert stats.bytes_written == path.stat().st_size
+    assert _validate(path, SAMPLE_XSD).ok
+
+
+def test_target_bytes_needs_a_repeatable_element(tmp_path):
+    path = tmp_path / "grande.xml"
+    with pytest.raises(GeneratorError):
+        XmlGenerator(SAMPLE_XSD).write(path, target_bytes=50_000, repeat_element="Emisor")
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("fault_rate", [0.2, 1.0])
+def test_fault_injection(tmp_path, fault_rate):
+    generator = XmlGenerator(SAMPLE_XSD, fault_rate=fault_rate)
+    for index in range(3):
+        path = tmp_path / f"roto_{index}.xml"
+        stats = generator.write(path, index=index)
+        report = _validate(path, SAMPLE_XSD)
+        assert stats.violations > 0
+        # Each injected value breaks exactly one facet or type.
+        assert len(report.issues) == stats.violations
+        for issue in report.issues:
+            # The classifier makes attribute issues errors; broken values are warnings.
+            expected = Severity.ERROR if ", attribute '" in issue.message else Severity.WARNING
+            assert issue.severity is expected, issue.message
+
+
+def test_unknown_root(tmp_path):
+    with pytest.raises(GeneratorError):
+        XmlGenerator(SAMPLE_XSD, root="NoExiste")
+    with pytest.raises(GeneratorError):
+        XmlGenerator(tmp_path / "falta.xsd")
+    with pytest.raises(ValueError):
+        XmlGenerator(SAMPLE_XSD, fault_rate=2.0)
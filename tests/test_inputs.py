@@ -0,0 +1,112 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from conftest import SAMPLES
+from xsd_manager.domain.models import IN_MEMORY_XML_NAME, ValidationRequest
+from xsd_manager.services.validation.use_case import ValidationUseCase, failure_message
+from xsd_manager.services.validators.base import ValidatorError
+from xsd_manager.services.validators.document import DocumentContext
+from xsd_manager.services.validators.schema_cache import SchemaCache
+from xsd_manager.services.validators.schematron_validator import SchematronValidator
+from xsd_manager.services.validators.xsd_validator import XsdValidator
+
+
+XSD = SAMPLES / "xsd_ejemplo_1.xsd"
+INVALID = (SAMPLES / "EJEM_2.XML").read_bytes()
+
+modes = pytest.mark.parametrize("streaming", [False, True], ids=["tree", "streaming"])
+
+CONTENT_TYPES = {
+    "bytes": bytes,
+    "bytearray": bytearray,
+    "memoryview": memoryview,
+    "stream": io.BytesIO,
+}
+content_types = pytest.mark.parametrize("make_content", CONTENT_TYPES.values(), ids=CONTENT_TYPES.keys())
+
+
+def _issues(report):
+    return [(issue.line, issue.column, issue.code, issue.message) for issue in report.issues]
+
+
+def _validate(request):
+    return XsdValidator(schema_cache=SchemaCache()).validate(request)
+
+
+@modes
+@content_types
+def test_content_matches_file(streaming, make_content):
+    from_file = _validate(ValidationRequest(xml_path=SAMPLES / "EJEM_2.XML", xsd_paths=[XSD], streaming=streaming))
+    request = ValidationRequest(
+        xml_path=SAMPLES / "EJEM_2.XML",
+        xsd_paths=[XSD],
+        xml_content=make_content(INVALID),
+        streaming=streaming,
+    )
+    report = _validate(request)
+    assert _issues(report) == _issues(from_file)
+    # A one-shot stream is parsed as it is read, so its size is never known.
+    expected_size = None if make_content is io.BytesIO else len(INVALID)
+    assert report.metadata.bytes_read == expected_size
+
+
+@modes
+@content_types
+def test_valid_content(streaming, make_content):
+    data = (SAMPLES / "EJEM_1.XML").read_bytes()
+    request = ValidationRequest(xml_path=Path("a.xml"), xsd_paths=[XSD], xml_content=make_content(data), streaming=streaming)
+    assert _validate(request).ok
+
+
+@modes
+@content_types
+def test_malformed_content(streaming, make_content):
+    data = (SAMPLES / "EJEM_3.XML").read_bytes()
+    request = ValidationRequest(xml_path=Path("a.xml"), xsd_paths=[XSD], xml_content=make_content(data), streaming=streaming)
+    report = ValidationUseCase([XsdValidator(schema_cache=SchemaCache())]).run_safe(request)
+    assert failure_message(report)
+
+
+def test_from_bytes():
+    data = bytearray(INVALID)
+    request = ValidationRequest.from_bytes(data, [XSD], max_issues=3)
+    assert request.xml_content is data
+    assert request.xml_path == Path(IN_MEMORY_XML_NAME)
+    assert request.in_memory and request.max_issues == 3
+    assert ValidationRequest.from_bytes(b"<a/>", [XSD], name="factura.xml").xml_path == Path("factura.xml")
+
+
+def test_from_stream_label(tmp_path):
+    stream = io.BytesIO(INVALID)
+    assert ValidationRequest.from_stream(stream, [XSD]).xml_path == Path(IN_MEMORY_XML_NAME)
+    assert ValidationRequest.from_stream(stream, [XSD], name="x.xml").xml_path == Path("x.xml")
+    path = tmp_path / "factura.xml"
+    path.write_bytes(INVALID)
+    with open(path, "rb") as file:
+        request = ValidationRequest.from_stream(file, [XSD], streaming=True)
+        assert request.xml_path == path
+        assert len(_validate(request).issues) == 15
+
+
+@modes
+def test_stream_is_read_once_for_several_validators(streaming):
+    stream = io.BytesIO(INVALID)
+    request = ValidationRequest.from_stream(
+        stream,
+        [XSD],
+        schematron_paths=[SAMPLES / "reglas_factura.sch"],
+        streaming=streaming,
+    )
+    report = ValidationUseCase([XsdValidator(schema_cache=SchemaCache()), SchematronValidator()]).run(request)
+    assert [part.validator for part in report.metadata.parts] == ["xsd", "schematron"]
+    assert len(report.issues) == 15 + 7
+
+
+def test_stream_cannot_be_read_twice():
+    request = ValidationRequest.from_stream(io.BytesIO(INVALID), [XSD])
+    with DocumentContext(request) as document:
+        document.source()
+        with pytest.raises(ValidatorError, match="ya se leyo"):
+            document.data()
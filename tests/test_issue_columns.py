@@ -0,0 +1,57 @@
+import pickle
+
+import pytest
+
+from xsd_manager.domain.models import IssueColumns, Severity, ValidationIssue, count_severities
+
+
+ISSUES = [
+    ValidationIssue(1, 2, "Falta el elemento", Severity.ERROR, code="SCHEMAV_A"),
+    ValidationIssue(3, 0, "Valor raro", Severity.WARNING, rule="r1"),
+    ValidationIssue(5, 4, "Falta el elemento", Severity.ERROR, code="SCHEMAV_A"),
+    ValidationIssue(8, 1, "Nota", Severity.INFO),
+]
+
+
+def test_equal_to_list_form():
+    columns = IssueColumns(ISSUES)
+    assert columns == ISSUES
+    assert list(columns) == ISSUES
+    assert columns != ISSUES[:-1]
+    assert columns != ISSUES[::-1]
+
+
+def test_negative_indexing():
+    columns = IssueColumns(ISSUES)
+    assert columns[-1] == ISSUES[-1]
+    assert columns[-len(ISSUES)] == ISSUES[0]
+    with pytest.raises(IndexError):
+        columns[-len(ISSUES) - 1]
+    with pytest.raises(IndexError):
+        columns[len(ISSUES)]
+
+
+@pytest.mark.parametrize("index", [slice(1, 3), slice(None, None, -1), slice(-2, None), slice(0, 10, 2), slice(5, 9)])
+def test_slicing(index):
+    assert IssueColumns(ISSUES)[index] == ISSUES[index]
+
+
+def test_counts_totals():
+    columns = IssueColumns(ISSUES)
+    counts = columns.counts()
+    assert counts == count_severities(ISSUES)
+    assert sum(counts.values()) == len(columns)
+    assert counts[Severity.ERROR] == 2
+    columns.add(9, 0, "Otro", Severity.WARNING)
+    assert columns.counts()[Severity.WARNING] == 2
+
+
+def test_pickle_round_trip():
+    columns = IssueColumns(ISSUES)
+    restored = pickle.loads(pickle.dumps(columns))
+    assert isinstance(restored, IssueColumns)
+    assert restored == ISSUES
+    assert restored.counts() == columns.counts()
+    # Intern tables still deduplicate after the round trip.
+    restored.add(10, 0, "Falta el elemento")
+    assert len(set(restored.message_ids)) == 3
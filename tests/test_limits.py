@@ -0,0 +1,96 @@
+from collections import Counter
+
+import pytest
+
+from conftest import SAMPLES
+from xsd_manager.domain.models import ValidationRequest
+from xsd_manager.services.validators.schema_cache import SchemaCache
+from xsd_manager.services.validators.xsd_validator import XsdValidator
+
+
+# EJEM_2.XML has 15 XSD issues, five of them SCHEMAV_CVC_PATTERN_VALID.
+SAMPLE_ISSUES = 15
+PATTERN_CODE = "SCHEMAV_CVC_PATTERN_VALID"
+
+modes = pytest.mark.parametrize("streaming", [False, True], ids=["tree", "streaming"])
+
+
+def _validate(streaming, **options):
+    request = ValidationRequest(
+        xml_path=SAMPLES / "EJEM_2.XML",
+        xsd_paths=[SAMPLES / "xsd_ejemplo_1.xsd"],
+        streaming=streaming,
+        **options,
+    )
+    return XsdValidator(schema_cache=SchemaCache()).validate(request)
+
+
+@modes
+def test_unlimited(streaming):
+    report = _validate(streaming)
+    assert len(report.issues) == SAMPLE_ISSUES
+    assert not report.truncated
+
+
+@modes
+@pytest.mark.parametrize("columnar", [False, True])
+def test_max_issues(streaming, columnar):
+    full = _validate(streaming)
+    report = _validate(streaming, max_issues=4, columnar=columnar)
+    assert list(report.issues) == list(full.issues)[:4]
+    assert report.truncated and not report.ok
+
+
+@modes
+def test_max_issues_reached_or_not(streaming):
+    # Validation stops once the limit is reached, so later issues are never
+    # looked for and the report counts as truncated even if none follow.
+    assert _validate(streaming, max_issues=SAMPLE_ISSUES).truncated
+    report = _validate(streaming, max_issues=SAMPLE_ISSUES + 1)
+    assert len(report.issues) == SAMPLE_ISSUES
+    assert not report.truncated
+
+
+@modes
+def test_max_issues_per_code(streaming):
+    full = _validate(streaming)
+    report = _validate(streaming, max_issues_per_code=2)
+    counts = Counter(issue.code for issue in report.issues)
+    assert counts[PATTERN_CODE] == 2
+    assert max(counts.values()) == 2
+    assert set(counts) == {issue.code for issue in full.issues}
+    assert report.truncated
+
+
+@modes
+def test_max_issues_per_code_not_reached(streaming):
+    report = _validate(streaming, max_issues_per_code=5)
+    assert len(report.issues) == SAMPLE_ISSUES
+    assert not report.truncated
+
+
+@modes
+def test_fail_fast(streaming):
+    full = _validate(streaming)
+    report = _validate(streaming, fail_fast=True)
+    assert list(report.issues) == list(full.issues)[:1]
+    assert report.truncated and not report.ok
+
+
+@modes
+def test_fail_fast_on_valid_document(streaming):
+    request = ValidationRequest(
+        xml_path=SAMPLES / "EJEM_1.XML",
+        xsd_paths=[SAMPLES / "xsd_ejemplo_1.xsd"],
+        streaming=streaming,
+        fail_fast=True,
+    )
+    report = XsdValidator(schema_cache=SchemaCache()).validate(request)
+    assert report.ok and not report.issues and not report.truncated
+
+
+def test_limits_must_be_positive():
+    with pytest.raises(ValueError):
+        ValidationRequest(xml_path=SAMPLES / "EJEM_2.XML", xsd_paths=[], max_issues=0)
+    with pytest.raises(ValueError):
+        ValidationRequest(xml_path=SAMPLES / "EJEM_2.XML", xsd_paths=[], max_issues_per_code=0)
@@ -0,0 +1,98 @@
+import io
+import json
+from pathlib import Path
+
+import lxml.etree as etree
+import pytest
+
+from xsd_manager.domain.models import Severity, ValidationIssue, ValidationMetadata, ValidationReport
+from xsd_manager.infra import reporting
+from xsd_manager.infra.reporting import REPORT_WRITERS, ReportWriter, create_report_writer
+from xsd_manager.services.validation.use_case import failure_report
+from xsd_manager.services.validation.watch import WatchedFile
+from xsd_manager.services.validators.base import ValidatorError
+
+
+def _results():
+    metadata = ValidationMetadata(validator="xsd", elapsed_ms=2.0)
+    return [
+        WatchedFile(Path("ok.xml"), ValidationReport(ok=True, issues=[], metadata=metadata)),
+        WatchedFile(
+            Path("dir/bad.xml"),
+            ValidationReport(
+                ok=False,
+                issues=[
+                    ValidationIssue(4, 7, "Elemento \"x\" no esperado", Severity.ERROR, code="SCHEMAV_ELEMENT"),
+                    ValidationIssue(9, 0, "Aviso ñ", Severity.WARNING),
+                    ValidationIssue(0, 0, "Nota", Severity.INFO),
+                ],
+                metadata=metadata,
+            ),
+        ),
+        WatchedFile(Path("broken.xml"), failure_report(ValidatorError("XML mal formado"))),
+    ]
+
+
+def _render(format_name):
+    stream = io.BytesIO()
+    writer = create_report_writer(format_name, stream)
+    writer.start()
+    for result in _results():
+        writer.write(result)
+    exit_code = writer.finish()
+    return stream.getvalue(), exit_code
+
+
+@pytest.mark.parametrize("format_name", sorted(REPORT_WRITERS))
+def test_output_parses(format_name):
+    data, exit_code = _render(format_name)
+    assert exit_code != 0
+    if format_name == "junit":
+        root = etree.fromstring(data)
+        assert root.tag == "testsuites"
+        assert len(root.findall("testsuite/testcase")) == 3
+    elif format_name == "jsonl":
+        records = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+        assert [r["type"] for r in records].count("file") == 3
+        assert [r["type"] for r in records].count("issue") == 3
+        assert records[-1]["type"] == "summary"
+    else:
+        document = json.loads(data)
+        assert document
+
+
+def test_json_structure():
+    document = json.loads(_render("json")[0])
+    assert [len(item["issues"]) for item in document["files"]] == [0, 3, 0]
+    assert document["summary"]["files"] == 3
+
+
+def test_sarif_shape():
+    log = json.loads(_render("sarif")[0])
+    assert log["version"] == "2.1.0"
+    assert "sarif-2.1.0" in log["$schema"]
+    assert len(log["runs"]) == 1
+    run = log["runs"][0]
+    assert run["tool"]["driver"]["name"]
+    assert [artifact["location"]["uri"] for artifact in run["artifacts"]] == ["ok.xml", "dir/bad.xml", "broken.xml"]
+    assert [result["level"] for result in run["results"]] == ["error", "warning", "note"]
+    for result in run["results"]:
+        assert result["ruleId"] and result["message"]["text"]
+        location = result["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"] == {"uri": "dir/bad.xml", "index": 1}
+    assert run["results"][0]["locations"][0]["physicalLocation"]["region"] == {"startLine": 4, "startColumn": 7}
+    assert "region" not in run["results"][2]["locations"][0]["physicalLocation"]
+    invocation = run["invocations"][0]
+    assert invocation["executionSuccessful"] is False
+    assert invocation["toolExecutionNotifications"][0]["message"]["text"] == "XML mal formado"
+
+
+def test_sarif_spools_to_disk(monkeypatch):
+    in_memory = json.loads(_render("sarif")[0])
+    monkeypatch.setattr(reporting, "SARIF_SPOOL_BYTES", 16)
+    assert json.loads(_render("sarif")[0]) == in_memory
+
+
+def test_report_writer_is_abstract():
+    with pytest.raises(TypeError):
+        ReportWriter(io.BytesIO())
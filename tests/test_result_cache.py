@@ -0,0 +1,110 @@
+import sqlite3
+import zlib
+
+from conftest import SAMPLES
+from xsd_manager.domain.models import (
+    IssueColumns,
+    Severity,
+    ValidationIssue,
+    ValidationMetadata,
+    ValidationReport,
+    ValidationRequest,
+)
+from xsd_manager.infra.files import MappedFile
+from xsd_manager.infra.reporting import decode_report, encode_report
+from xsd_manager.infra.result_cache import ResultCache
+
+
+def _report() -> ValidationReport:
+    return ValidationReport(
+        ok=False,
+        issues=[
+            ValidationIssue(3, 7, "Fallo", Severity.ERROR, code="SCHEMAV_X", rule="r1"),
+            ValidationIssue(9, 0, "Aviso ñ", Severity.WARNING),
+        ],
+        metadata=ValidationMetadata(validator="xsd", elapsed_ms=1.5, stages={"parse": 0.25}, bytes_read=10),
+        truncated=True,
+    )
+
+
+def test_decode_report_round_trip():
+    report = _report()
+    decoded = decode_report(encode_report(report))
+    assert decoded.issues == report.issues
+    assert decoded.ok is False and decoded.truncated is True
+    assert decoded.metadata == report.metadata
+    assert decoded.counts == report.counts
+
+
+def test_decode_report_columnar():
+    decoded = decode_report(encode_report(_report()), columnar=True)
+    assert isinstance(decoded.issues, IssueColumns)
+    assert decoded.issues == _report().issues
+
+
+def test_cache_stores_json_not_pickle(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3")
+    cache.put("k", _report())
+    cached = cache.get("k")
+    assert cached is not None and cached.issues == _report().issues
+    assert cached.metadata is not None and cached.metadata.cached
+    cache.close()
+
+    with sqlite3.connect(tmp_path / "cache.sqlite3") as connection:
+        blob = connection.execute("SELECT report FROM results").fetchone()[0]
+    assert zlib.decompress(blob).startswith(b"{")
+
+
+def test_unreadable_entry_is_dropped(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3")
+    cache.put("k", _report())
+    cache._execute("UPDATE results SET report = ?", (zlib.compress(b"\x80\x04garbage"),))
+    assert cache.get("k") is None
+    assert cache.stats().entries == 0
+
+
+def test_mapped_content_uses_file_digest_table(tmp_path):
+    xml = tmp_path / "a.xml"
+    xml.write_bytes((SAMPLES / "EJEM_1.XML").read_bytes())
+    cache = ResultCache(tmp_path / "cache.sqlite3")
+    from_path = cache.content_digest(ValidationRequest(xml_path=xml, xsd_paths=[]))
+    with MappedFile(xml) as mapped:
+        request = ValidationRequest(xml_path=xml, xsd_paths=[], xml_content=mapped.buffer(), content_is_file=True)
+        assert cache.content_digest(request) == from_path
+    edited = ValidationRequest(xml_path=xml, xsd_paths=[], xml_content=b"<otro/>")
+    assert cache.content_digest(edited) != from_path
+
+
+def test_mapping_of_another_file_is_hashed(tmp_path):
+    xml = tmp_path / "a.xml"
+    other = tmp_path / "b.xml"
+    xml.write_bytes(b"<a>1</a>")
+    other.write_bytes(b"<a>2</a>")
+    cache = ResultCache(tmp_path / "cache.sqlite3")
+    from_path = cache.content_digest(ValidationRequest(xml_path=xml, xsd_paths=[]))
+    # Same size as xml_path, but not its content: the file table must not answer.
+    with MappedFile(other) as mapped:
+        request = ValidationRequest(xml_path=xml, xsd_paths=[], xml_content=mapped.buffer())
+        assert cache.content_digest(request) != from_path
+
+
+def test_eviction_keeps_size_under_limit(tmp_path):
+    cache = ResultCache(tmp_path / "cache.sqlite3", max_bytes=2000)
+    for index in range(40):
+        cache.put(f"k{index}", _report())
+        stats = cache.stats()
+        assert stats.size_bytes <= cache.max_bytes
+        assert cache._size == stats.size_bytes
+    assert stats.evictions > 0
+    assert cache.get("k39") is not None and cache.get("k0") is None
+
+
+def test_eviction_sees_other_writers(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    first = ResultCache(path, max_bytes=2000)
+    second = ResultCache(path, max_bytes=2000)
+    first.put("mine", _report())
+    for index in range(40):
+        second.put(f"k{index}", _report())
+    first.put("last", _report())
+    assert first.stats().size_bytes <= first.max_bytes
@@ -0,0 +1,176 @@
+import os
+import threading
+
+import lxml.etree as etree
+import pytest
+
+from xsd_manager.services.validators import schema_cache as schema_cache_module
+from xsd_manager.services.validators.base import ValidatorError
+from xsd_manager.services.validators.schema_cache import SchemaCache
+
+
+ROOT_XSD = """<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:include schemaLocation="types.xsd"/>
+  <xs:element name="root" type="{type}"/>
+</xs:schema>
+"""
+
+TYPES_XSD = """<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:simpleType name="Code">
+    <xs:restriction base="xs:string"><xs:maxLength value="{length}"/></xs:restriction>
+  </xs:simpleType>
+</xs:schema>
+"""
+
+
+def _write_schema(directory, type_name="Code", length=3):
+    root = directory / "root.xsd"
+    root.write_text(ROOT_XSD.format(type=type_name))
+    (directory / "types.xsd").write_text(TYPES_XSD.format(length=length))
+    return root
+
+
+def _bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _accepts(entry, text):
+    return entry.schema.validate(etree.fromstring(f"<root>{text}</root>"))
+
+
+def test_hit_returns_same_entry(tmp_path):
+    cache = SchemaCache()
+    xsd = _write_schema(tmp_path)
+    first = cache.get(xsd)
+    assert cache.get(str(xsd)) is first
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_touch_with_identical_content_does_not_recompile(tmp_path):
+    cache = SchemaCache()
+    xsd = _write_schema(tmp_path)
+    first = cache.get(xsd)
+    _bump_mtime(xsd)
+    _bump_mtime(tmp_path / "types.xsd")
+    assert cache.get(xsd) is first
+    assert cache.stats().misses == 1
+    # The new mtime is remembered, so the next lookup skips the hash.
+    assert {f.mtime_ns for f in first.fingerprints} == {
+        (tmp_path / name).stat().st_mtime_ns for name in ("root.xsd", "types.xsd")
+    }
+
+
+def test_changed_content_recompiles(tmp_path):
+    cache = SchemaCache()
+    xsd = _write_schema(tmp_path)
+    first = cache.get(xsd)
+    xsd.write_text(ROOT_XSD.format(type="xs:string"))
+    _bump_mtime(xsd)
+    second = cache.get(xsd)
+    assert second is not first
+    assert cache.stats().misses == 2
+    assert _accepts(second, "LONGER")
+
+
+def test_changed_include_recompiles(tmp_path):
+    cache = SchemaCache()
+    xsd = _write_schema(tmp_path, length=3)
+    first = cache.get(xsd)
+    assert not _accepts(first, "ABCDE")
+    digest = cache.digest([xsd])
+    (tmp_path / "types.xsd").write_text(TYPES_XSD.format(length=10))
+    _bump_mtime(tmp_path / "types.xsd")
+    second = cache.get(xsd)
+    assert second is not first
+    assert _accepts(second, "ABCDE")
+    assert cache.digest([xsd]) != digest
+
+
+def test_lru_eviction(tmp_path):
+    cache = SchemaCache(max_entries=2)
+    paths = []
+    for name in ("a", "b", "c"):
+        directory = tmp_path / name
+        directory.mkdir()
+        paths.append(_write_schema(directory))
+    first = cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])  # "a" becomes the most recently used
+    cache.get(paths[2])  # evicts "b"
+    stats = cache.stats()
+    assert (stats.entries, stats.evictions) == (2, 1)
+    assert cache.get(paths[0]) is first
+    cache.get(paths[1])
+    assert cache.stats().misses == 4
+
+
+def test_invalidate_drops_entries_using_dependency(tmp_path):
+    cache = SchemaCache()
+    xsd = _write_schema(tmp_path)
+    first = cache.get(xsd)
+    cache.invalidate(tmp_path / "types.xsd")
+    assert cache.stats().entries == 0
+    assert cache.get(xsd) is not first
+    assert cache.stats().misses == 2
+
+
+def test_missing_dependency_is_validator_error(tmp_path):
+    xsd = _write_schema(tmp_path)
+    (tmp_path / "types.xsd").unlink()
+    with pytest.raises(ValidatorError):
+        SchemaCache().get(xsd)
+
+
+def test_change_during_compile_is_not_cached_as_fresh(tmp_path, monkeypatch):
+    cache = SchemaCache()
+    xsd = _write_schema(tmp_path, length=3)
+    types = tmp_path / "types.xsd"
+    compile_schema = etree.XMLSchema
+    calls = []
+
+    def edit_while_compiling(doc):
+        schema = compile_schema(doc)
+        if not calls:
+            types.write_text(TYPES_XSD.format(length=10))
+            _bump_mtime(types)
+        calls.append(doc)
+        return schema
+
+    monkeypatch.setattr(schema_cache_module.etree, "XMLSchema", edit_while_compiling)
+    entry = cache.get(xsd)
+    assert len(calls) == 2
+    assert _accepts(entry, "ABCDE")
+
+
+def test_concurrent_misses_compile_once(tmp_path, monkeypatch):
+    cache = SchemaCache()
+    xsd = _write_schema(tmp_path)
+    compile_schema = etree.XMLSchema
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_compile(doc):
+        calls.append(doc)
+        started.set()
+        release.wait(5)
+        return compile_schema(doc)
+
+    monkeypatch.setattr(schema_cache_module.etree, "XMLSchema", slow_compile)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(xsd))) for _ in range(3)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # The cache lock stays free while the compile runs.
+    assert cache.stats().entries == 0
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert len(results) == 3 and all(entry is results[0] for entry in results)
@@ -0,0 +1,179 @@
+import shutil
+import threading
+
+import lxml.etree as etree
+import pytest
+
+from conftest import SAMPLES
+from xsd_manager.domain.models import Severity, ValidationRequest
+from xsd_manager.services.validators import schematron_validator
+from xsd_manager.services.validators.base import ValidatorError
+from xsd_manager.services.validators.schematron_validator import (
+    ASSERT_CODE,
+    LINE_NS,
+    REPORT_CODE,
+    SchematronCache,
+    SchematronValidator,
+)
+
+
+RULES = """<?xml version="1.0"?>
+<schema xmlns="http://purl.oclc.org/dsdl/schematron">
+  <pattern id="p-items">
+    <rule id="r-item" context="item">
+      <assert id="a-positive" test="number(@qty) &gt; 0">Cantidad no positiva: <value-of select="@qty"/></assert>
+      <report id="w-big" role="warning" test="number(@qty) &gt; 100">Cantidad muy alta</report>
+      <report role="info" test="@note">Nota presente</report>
+    </rule>
+  </pattern>
+</schema>
+"""
+
+
+@pytest.fixture
+def rules(tmp_path):
+    path = tmp_path / "rules.sch"
+    path.write_text(RULES)
+    return path
+
+
+def _validate(rules, xml, cache=None, **options):
+    request = ValidationRequest.from_bytes(xml.encode(), [], schematron_paths=[rules], **options)
+    return SchematronValidator(cache or SchematronCache()).validate(request)
+
+
+def test_sample_rules():
+    request = ValidationRequest(
+        xml_path=SAMPLES / "EJEM_2.XML",
+        xsd_paths=[],
+        schematron_paths=[SAMPLES / "reglas_factura.sch"],
+    )
+    report = SchematronValidator(SchematronCache()).validate(request)
+    assert not report.ok
+    assert [issue.line for issue in report.issues] == [16, 16, 16, 25, 37, 37, 37]
+    assert {issue.code for issue in report.issues} == {ASSERT_CODE}
+    assert report.issues[0].rule == "linea-base"
+    assert report.issues[0].severity is Severity.ERROR
+    assert "-10.00" in report.issues[0].message
+
+
+def test_valid_sample_has_no_issues():
+    request = ValidationRequest(
+        xml_path=SAMPLES / "EJEM_1.XML",
+        xsd_paths=[],
+        schematron_paths=[SAMPLES / "reglas_factura.sch"],
+    )
+    assert SchematronValidator(SchematronCache()).validate(request).ok
+
+
+def test_roles_codes_and_rules(rules):
+    xml = '<list>\n<item qty="0"/>\n<item qty="500"/>\n<item qty="1" note="x"/>\n</list>'
+    issues = _validate(rules, xml).issues
+    assert [(i.line, i.code, i.severity, i.rule) for i in issues] == [
+        (2, ASSERT_CODE, Severity.ERROR, "a-positive"),
+        (3, REPORT_CODE, Severity.WARNING, "w-big"),
+        # No id on the report: the rule that fired names it.
+        (4, REPORT_CODE, Severity.INFO, "r-item"),
+    ]
+    assert issues[0].message == "Cantidad no positiva: 0"
+
+
+def test_locations_are_rewritten_to_lines(rules):
+    compiled = SchematronCache().get(rules)
+    svrl = compiled.transform(etree.fromstring('<list>\n\n<item qty="0"/></list>').getroottree())
+    failed = svrl.getroot().find("{http://purl.oclc.org/dsdl/svrl}failed-assert")
+    assert failed.get("location") == "3"
+
+
+def test_line_locations_replaces_location_xpath():
+    xslt = etree.fromstring(
+        '<xsl:stylesheet xmlns:xsl="http://www.w3.org/1999/XSL/Transform" version="1.0">'
+        '<xsl:template match="/"><out>'
+        '<xsl:attribute name="location"><xsl:apply-templates select="." mode="schematron-get-full-path"/></xsl:attribute>'
+        '<xsl:attribute name="test">x</xsl:attribute>'
+        "</out></xsl:template></xsl:stylesheet>"
+    ).getroottree()
+    rewritten = schematron_validator._line_locations(xslt)
+    attributes = rewritten.getroot().iter("{http://www.w3.org/1999/XSL/Transform}attribute")
+    location, test = list(attributes)
+    assert [child.get("select") for child in location] == ["line:line(.)"]
+    assert location[0].nsmap["line"] == LINE_NS
+    assert test.text == "x"
+
+
+def test_lines_in_long_sibling_list(rules):
+    count = 2000
+    xml = "<list>\n" + "\n".join('<item qty="0"/>' for _ in range(count)) + "\n</list>"
+    issues = _validate(rules, xml).issues
+    assert [issue.line for issue in issues] == list(range(2, count + 2))
+
+
+def test_attribute_context_reports_element_line(tmp_path):
+    path = tmp_path / "attr.sch"
+    path.write_text(
+        '<schema xmlns="http://purl.oclc.org/dsdl/schematron"><pattern>'
+        '<rule context="item/@qty"><assert test=". != \'x\'">qty x</assert></rule>'
+        "</pattern></schema>"
+    )
+    issues = _validate(path, '<list>\n<item qty="x"/>\n</list>').issues
+    assert [issue.line for issue in issues] == [2]
+
+
+def test_limits(rules):
+    xml = "<list>" + '<item qty="0"/><item qty="500"/>' * 3 + "</list>"
+    report = _validate(rules, xml, max_issues=2)
+    assert len(report.issues) == 2 and report.truncated
+    report = _validate(rules, xml, max_issues_per_code=1)
+    assert sorted(issue.code for issue in report.issues) == [ASSERT_CODE, REPORT_CODE]
+    assert report.truncated
+    report = _validate(rules, xml, fail_fast=True)
+    assert len(report.issues) == 1 and report.truncated
+    assert not _validate(rules, xml).truncated
+
+
+def test_invalid_rules(tmp_path):
+    path = tmp_path / "broken.sch"
+    path.write_text("<schema xmlns='http://purl.oclc.org/dsdl/schematron'><pattern>")
+    with pytest.raises(ValidatorError):
+        _validate(path, "<list/>")
+
+
+def test_cache_reuses_rules_by_content(rules, tmp_path):
+    cache = SchematronCache()
+    copy = tmp_path / "copy.sch"
+    shutil.copy(rules, copy)
+    first = cache.get(rules)
+    assert cache.get(copy) is first
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    rules.write_text(RULES.replace("100", "200"))
+    assert cache.get(rules) is not first
+
+
+def test_cache_compiles_outside_the_lock(rules, monkeypatch):
+    cache = SchematronCache()
+    compile_rules = SchematronCache._compile
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_compile(path, digest):
+        calls.append(path)
+        started.set()
+        release.wait(5)
+        return compile_rules(path, digest)
+
+    monkeypatch.setattr(SchematronCache, "_compile", staticmethod(slow_compile))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(rules))) for _ in range(3)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # The cache lock stays free while the compile runs.
+    assert cache.stats().entries == 0
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert len(results) == 3 and all(entry is results[0] for entry in results)
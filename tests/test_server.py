@@ -0,0 +1,163 @@
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+from conftest import SAMPLES
+from xsd_manager.services.validation import server
+from xsd_manager.services.validation.server import (
+    SchemaRegistry,
+    ServiceBusy,
+    ValidationService,
+    create_server,
+)
+from xsd_manager.services.validation.use_case import ValidationUseCase
+from xsd_manager.services.validators.xsd_validator import XsdValidator
+
+
+CRASH_MARKER = b"<!-- crash -->"
+
+
+def _service(workers=1):
+    registry = SchemaRegistry()
+    registry.register("factura", [SAMPLES / "xsd_ejemplo_1.xsd"])
+    return ValidationService(registry, ValidationUseCase([XsdValidator()]), workers=workers)
+
+
+@pytest.fixture
+def serve():
+    running = []
+
+    def start(service, **options):
+        service.start()
+        httpd = create_server(service, port=0, **options)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        running.append((httpd, service))
+        host, port = httpd.server_address[:2]
+        return lambda: http.client.HTTPConnection(host, port, timeout=30)
+
+    yield start
+    for httpd, service in running:
+        httpd.shutdown()
+        httpd.server_close()
+        service.close()
+
+
+def _request(connect, method, path, body=None, headers=None):
+    connection = connect()
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read()
+    finally:
+        connection.close()
+
+
+def _raw_post(connect, path, length_header):
+    # http.client always fills in Content-Length; write the headers by hand.
+    connection = connect()
+    try:
+        connection.putrequest("POST", path)
+        if length_header is not None:
+            connection.putheader("Content-Length", length_header)
+        connection.endheaders()
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_get_routes(serve):
+    connect = serve(_service())
+    assert _request(connect, "GET", "/health")[::2] == (200, b'{"status": "ok"}')
+    status, _, body = _request(connect, "GET", "/schemas")
+    assert status == 200
+    assert [schema["name"] for schema in json.loads(body)["schemas"]] == ["factura"]
+    assert _request(connect, "GET", "/nada")[0] == 404
+
+
+def test_validate_valid_and_invalid(serve):
+    connect = serve(_service())
+    status, content_type, body = _request(connect, "POST", "/validate/factura", (SAMPLES / "EJEM_1.XML").read_bytes())
+    assert status == 200 and content_type.startswith("application/json")
+    assert json.loads(body)["ok"] is True
+    status, _, body = _request(connect, "POST", "/validate/factura?max_issues=3", (SAMPLES / "EJEM_2.XML").read_bytes())
+    report = json.loads(body)
+    assert status == 200
+    assert report["ok"] is False and report["truncated"] is True
+
+
+@pytest.mark.parametrize(
+    "path, status",
+    [
+        ("/otra/factura", 404),
+        ("/validate/desconocido", 404),
+        ("/validate/factura?max_issues=0", 400),
+        ("/validate/factura?max_issues=x", 400),
+    ],
+)
+def test_post_errors(serve, path, status):
+    connect = serve(_service())
+    code, _, body = _request(connect, "POST", path, b"<Factura/>")
+    assert code == status
+    assert json.loads(body)["error"]
+
+
+@pytest.mark.parametrize("length_header, status", [(None, 411), ("-1", 400), ("abc", 400), ("2048", 413)])
+def test_content_length_errors(serve, length_header, status):
+    connect = serve(_service(), max_body_bytes=1024)
+    code, body = _raw_post(connect, "/validate/factura", length_header)
+    assert code == status
+    assert body["error"]
+
+
+def test_busy_service_answers_503(serve, monkeypatch):
+    service = _service()
+    connect = serve(service)
+
+    def busy(schema_name, body, **options):
+        raise ServiceBusy(schema_name)
+
+    monkeypatch.setattr(service, "validate", busy)
+    assert _request(connect, "POST", "/validate/factura", b"<Factura/>")[0] == 503
+
+
+def test_metrics(serve):
+    service = _service()
+    connect = serve(service)
+    _request(connect, "POST", "/validate/factura", (SAMPLES / "EJEM_1.XML").read_bytes())
+    _request(connect, "POST", "/validate/factura", (SAMPLES / "EJEM_2.XML").read_bytes())
+    _request(connect, "POST", "/validate/factura", (SAMPLES / "EJEM_3.XML").read_bytes())
+    status, content_type, body = _request(connect, "GET", "/metrics")
+    assert status == 200 and content_type.startswith("text/plain")
+    lines = body.decode("utf-8").splitlines()
+    for outcome in ("valid", "invalid", "failed"):
+        assert f'xsd_validation_requests_total{{schema="factura",outcome="{outcome}"}} 1' in lines
+    assert 'xsd_validation_duration_seconds_count{schema="factura"} 3' in lines
+    assert 'xsd_validation_duration_seconds_bucket{schema="factura",le="+Inf"} 3' in lines
+    assert "xsd_validation_rejected_total 0" in lines
+    assert "xsd_validation_in_flight 0" in lines
+
+
+def _crash_on_marker(request):
+    if CRASH_MARKER in bytes(request.xml_content):
+        os._exit(1)
+    return server._validate_encoded(server._service_use_case, request)
+
+
+def test_dead_worker_answers_500_and_pool_is_replaced(serve, monkeypatch):
+    # Pool workers are forked after the patch, so they run _crash_on_marker.
+    monkeypatch.setattr(server, "_run_encoded", _crash_on_marker)
+    service = _service(workers=2)
+    connect = serve(service)
+    valid = (SAMPLES / "EJEM_1.XML").read_bytes()
+    status, _, body = _request(connect, "POST", "/validate/factura", valid + CRASH_MARKER)
+    assert status == 500 and json.loads(body)["error"]
+    status, _, body = _request(connect, "POST", "/validate/factura", valid)
+    assert status == 200 and json.loads(body)["ok"] is True
+    metrics = _request(connect, "GET", "/metrics")[2].decode("utf-8").splitlines()
+    assert 'xsd_validation_requests_total{schema="factura",outcome="failed"} 1' in metrics
+    assert "xsd_validation_in_flight 0" in metrics
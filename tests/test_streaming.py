@@ -0,0 +1,169 @@
+import pytest
+
+from xsd_manager.domain.models import ValidationRequest
+from xsd_manager.services.validators.schema_cache import SchemaCache
+from xsd_manager.services.validators.xsd_validator import XsdValidator
+
+
+NS = "urn:test:batch"
+
+XSD = f"""<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="{NS}"
+           xmlns="{NS}" elementFormDefault="qualified">
+  <xs:element name="batch">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="header" type="xs:string"/>
+        <xs:element name="items">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="item" maxOccurs="{{max_items}}">
+                <xs:complexType>
+                  <xs:sequence>
+                    <xs:element name="sku" type="xs:string"/>
+                    <xs:element name="qty" type="xs:int"/>
+                  </xs:sequence>
+                  <xs:attribute name="id" type="xs:int" use="required"/>
+                </xs:complexType>
+              </xs:element>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+  <xs:element name="list">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="item" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="sku" type="xs:string"/>
+              <xs:element name="qty" type="xs:int"/>
+            </xs:sequence>
+            <xs:attribute name="id" type="xs:int" use="required"/>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>
+"""
+
+ITEMS = [
+    ("1", "A", "1"),
+    ("2", "B", "x"),  # bad qty
+    ("oops", "C", "3"),  # bad id
+    ("4", "D", "4"),
+    ("5", "E", "-"),  # bad qty
+]
+
+
+def _document(items, header="<header>h</header>"):
+    lines = [f'<batch xmlns="{NS}">', header, "<items>"]
+    for item_id, sku, qty in items:
+        lines.append(f'<item id="{item_id}"><sku>{sku}</sku><qty>{qty}</qty></item>')
+    lines += ["</items>", "</batch>"]
+    return "\n".join(lines).encode()
+
+
+@pytest.fixture
+def xsd_path(tmp_path):
+    path = tmp_path / "batch.xsd"
+    path.write_text(XSD.format(max_items="unbounded"))
+    return path
+
+
+def _issues(xsd_path, data, **options):
+    request = ValidationRequest.from_bytes(data, [xsd_path], **options)
+    report = XsdValidator(schema_cache=SchemaCache()).validate(request)
+    return sorted((issue.line, issue.code, issue.message) for issue in report.issues)
+
+
+def test_stream_matches_tree_for_root_children(xsd_path):
+    # Without record_tag the records are the children of the root.
+    lines = [f'<list xmlns="{NS}">']
+    for item_id, sku, qty in ITEMS:
+        lines.append(f'<item id="{item_id}"><sku>{sku}</sku><qty>{qty}</qty></item>')
+    data = "\n".join(lines + ["</list>"]).encode()
+    tree = _issues(xsd_path, data)
+    assert len(tree) == 3
+    assert _issues(xsd_path, data, streaming=True) == tree
+
+
+@pytest.mark.parametrize("record_tag", ["item", f"{{{NS}}}item"])
+def test_stream_matches_tree_with_record_tag(xsd_path, record_tag):
+    data = _document(ITEMS)
+    tree = _issues(xsd_path, data)
+    assert len(tree) == 3
+    assert _issues(xsd_path, data, streaming=True, record_tag=record_tag) == tree
+
+
+def test_stream_checks_envelope(xsd_path):
+    data = _document(ITEMS[:2], header="")
+    tree = _issues(xsd_path, data)
+    assert len(tree) == 1
+    # libxml2 stops checking "items" after the envelope error; streaming still checks each record.
+    stream = _issues(xsd_path, data, streaming=True, record_tag="item")
+    assert tree[0] in stream
+    assert len(stream) == 2
+
+
+def test_stream_does_not_check_record_occurrences(tmp_path):
+    # Documented gap: streamed records are removed from the tree, so maxOccurs
+    # is only enforced in tree mode.
+    path = tmp_path / "limited.xsd"
+    path.write_text(XSD.format(max_items="2"))
+    data = _document([("1", "A", "1"), ("2", "B", "2"), ("3", "C", "3")])
+    assert len(_issues(path, data)) == 1
+    assert _issues(path, data, streaming=True, record_tag="item") == []
+
+
+COUNTED_XSD = """<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="list">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="item" type="xs:int" minOccurs="2" maxOccurs="unbounded"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+  <xs:element name="doc">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="h" type="xs:string"/>
+        <xs:element name="item" type="xs:int" minOccurs="0" maxOccurs="unbounded"/>
+        <xs:element name="t" type="xs:string" minOccurs="2" maxOccurs="2"/>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>
+"""
+
+
+@pytest.fixture
+def counted_xsd(tmp_path):
+    path = tmp_path / "counted.xsd"
+    path.write_text(COUNTED_XSD)
+    return path
+
+
+@pytest.mark.parametrize("record_tag", [None, "item"])
+def test_stream_keeps_min_occurs_records(counted_xsd, record_tag):
+    # Keeping a single record would leave the skeleton one "item" short.
+    data = b"<list><item>1</item><item>2</item><item>3</item></list>"
+    assert _issues(counted_xsd, data) == []
+    assert _issues(counted_xsd, data, streaming=True, record_tag=record_tag) == []
+
+
+def test_stream_keeps_fixed_count_records(counted_xsd):
+    data = b"<doc><h>x</h><item>1</item><item>2</item><item>3</item><t>a</t><t>b</t></doc>"
+    assert _issues(counted_xsd, data) == []
+    assert _issues(counted_xsd, data, streaming=True) == []
+
+
+def test_stream_reports_too_few_records(counted_xsd):
+    data = b"<list><item>1</item></list>"
+    tree = _issues(counted_xsd, data)
+    assert len(tree) == 1
+    assert _issues(counted_xsd, data, streaming=True) == tree
@@ -0,0 +1,190 @@
+import threading
+
+import pytest
+
+from conftest import SAMPLES
+from xsd_manager.domain.models import (
+    STAGE_CLASSIFY,
+    STAGE_CONVERT,
+    STAGE_PARSE,
+    STAGE_SCHEMA,
+    STAGE_VALIDATE,
+    IssueColumns,
+    Severity,
+    ValidationIssue,
+    ValidationMetadata,
+    ValidationReport,
+    ValidationRequest,
+)
+from xsd_manager.infra.result_cache import ResultCache
+from xsd_manager.services.validation.hooks import ValidationHook
+from xsd_manager.services.validation.use_case import ValidationUseCase
+from xsd_manager.services.validators.base import BaseValidator, ValidatorError
+from xsd_manager.services.validators.schematron_validator import SchematronValidator
+from xsd_manager.services.validators.xsd_validator import XsdValidator
+
+
+def _sample_request(name="EJEM_2.XML", **options):
+    return ValidationRequest(
+        xml_path=SAMPLES / name,
+        xsd_paths=[SAMPLES / "xsd_ejemplo_1.xsd"],
+        schematron_paths=[SAMPLES / "reglas_factura.sch"],
+        **options,
+    )
+
+
+def _xsd_and_schematron():
+    return ValidationUseCase([XsdValidator(), SchematronValidator()])
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_max_issues_caps_merged_report(columnar):
+    report = _xsd_and_schematron().run(_sample_request(max_issues=2, columnar=columnar))
+    assert len(report.issues) == 2
+    assert isinstance(report.issues, IssueColumns) == columnar
+    assert report.truncated and not report.ok
+    assert [part.validator for part in report.metadata.parts] == ["xsd", "schematron"]
+
+
+def test_max_issues_spanning_validators():
+    full = _xsd_and_schematron().run(_sample_request())
+    xsd_count = sum(1 for issue in full.issues if issue.code.startswith("SCHEMAV"))
+    report = _xsd_and_schematron().run(_sample_request(max_issues=xsd_count + 1))
+    assert list(report.issues) == list(full.issues)[: xsd_count + 1]
+    assert report.truncated
+
+
+def test_fail_fast_merged_report_has_one_issue():
+    report = _xsd_and_schematron().run(_sample_request(fail_fast=True))
+    assert len(report.issues) == 1
+    assert report.truncated
+
+
+def test_limit_not_reached_is_not_truncated():
+    full = _xsd_and_schematron().run(_sample_request())
+    report = _xsd_and_schematron().run(_sample_request(max_issues=len(full.issues)))
+    assert len(report.issues) == len(full.issues)
+    assert not report.truncated
+
+
+class RecordingHook(ValidationHook):
+    def __init__(self):
+        self.reports = []
+        self.errors = []
+
+    def on_report(self, request, report):
+        self.reports.append((request, report))
+
+    def on_error(self, request, error):
+        self.errors.append((request, error))
+
+
+class FakeValidator(BaseValidator):
+    """Report one issue per line in ``lines``, after waiting on ``barrier`` if given."""
+
+    def __init__(self, name, lines=(), barrier=None, error=None):
+        self.name = name
+        self.lines = lines
+        self.barrier = barrier
+        self.error = error
+        self.threads = []
+
+    def supports(self, request):
+        return True
+
+    def validate(self, request, document=None):
+        self.threads.append(threading.current_thread().name)
+        if self.barrier is not None:
+            # Only passes if every validator of the run is waiting at once.
+            self.barrier.wait(5)
+        if self.error is not None:
+            raise self.error
+        issues = [ValidationIssue(line, 0, f"{self.name} {line}", Severity.ERROR) for line in self.lines]
+        metadata = ValidationMetadata(
+            validator=self.name,
+            elapsed_ms=1.0,
+            stages={STAGE_VALIDATE: 1.0, self.name: 2.0},
+            bytes_read=10,
+        )
+        return ValidationReport(ok=not issues, issues=issues, metadata=metadata)
+
+
+def _fake_request(**options):
+    return ValidationRequest.from_bytes(b"<a/>", [], **options)
+
+
+def test_hooks_see_reports_and_errors(tmp_path):
+    hook = RecordingHook()
+    cache = ResultCache(tmp_path / "cache.sqlite3")
+    use_case = ValidationUseCase([XsdValidator(), SchematronValidator()], result_cache=cache, hooks=[hook])
+    request = _sample_request()
+    first = use_case.run(request)
+    second = use_case.run(request)
+    assert hook.reports == [(request, first), (request, second)]
+    assert not first.metadata.cached and second.metadata.cached
+
+    broken = ValidationRequest(xml_path=SAMPLES / "EJEM_3.XML", xsd_paths=[SAMPLES / "xsd_ejemplo_1.xsd"])
+    with pytest.raises(ValidatorError):
+        use_case.run(broken)
+    assert [(r, type(error)) for r, error in hook.errors] == [(broken, ValidatorError)]
+    assert len(hook.reports) == 2
+    # run_safe reports the error to the hooks before turning it into a report.
+    use_case.run_safe(broken)
+    assert len(hook.errors) == 2
+
+
+@pytest.mark.parametrize("streaming", [False, True], ids=["tree", "streaming"])
+def test_stage_metadata(streaming):
+    report = _xsd_and_schematron().run(_sample_request(streaming=streaming, count_elements=True))
+    metadata = report.metadata
+    assert metadata.validator == "xsd+schematron"
+    xsd, schematron = metadata.parts
+    assert set(xsd.stages) == {STAGE_SCHEMA, STAGE_PARSE, STAGE_VALIDATE, STAGE_CONVERT, STAGE_CLASSIFY}
+    assert set(schematron.stages) == {STAGE_SCHEMA, STAGE_PARSE, STAGE_VALIDATE, STAGE_CONVERT}
+    assert all(elapsed >= 0 for elapsed in metadata.stages.values())
+    size = (SAMPLES / "EJEM_2.XML").stat().st_size
+    assert metadata.bytes_read == xsd.bytes_read == size
+    assert metadata.elements == xsd.elements > 0
+
+
+def test_validators_run_concurrently_and_merge_in_order():
+    barrier = threading.Barrier(2)
+    first = FakeValidator("a", lines=[3, 1], barrier=barrier)
+    second = FakeValidator("b", lines=[2], barrier=barrier)
+    report = ValidationUseCase([first, second]).run(_fake_request())
+    assert [issue.message for issue in report.issues] == ["a 3", "a 1", "b 2"]
+    assert first.threads != second.threads
+    assert not report.ok
+
+
+def test_parts_aggregation():
+    report = ValidationUseCase([FakeValidator("a"), FakeValidator("b", lines=[1])]).run(_fake_request())
+    metadata = report.metadata
+    assert metadata.validator == "a+b"
+    assert [part.validator for part in metadata.parts] == ["a", "b"]
+    assert metadata.stages == {STAGE_VALIDATE: 2.0, "a": 2.0, "b": 2.0}
+    assert metadata.bytes_read == 10 and metadata.elements is None
+    assert metadata.elapsed_ms >= 0
+
+
+def test_single_validator_keeps_its_metadata():
+    report = ValidationUseCase([FakeValidator("a")]).run(_fake_request())
+    assert report.metadata.validator == "a" and report.metadata.parts == []
+
+
+def test_fail_fast_runs_validators_in_turn():
+    first = FakeValidator("a", lines=[1])
+    second = FakeValidator("b", lines=[2])
+    report = ValidationUseCase([first, second]).run(_fake_request(fail_fast=True))
+    assert [issue.message for issue in report.issues] == ["a 1"]
+    assert second.threads == []
+    assert report.truncated
+
+
+def test_error_in_one_validator_fails_the_run():
+    barrier = threading.Barrier(2)
+    use_case = ValidationUseCase(
+        [FakeValidator("a", barrier=barrier), FakeValidator("b", barrier=barrier, error=ValidatorError("roto"))]
+    )
+    with pytest.raises(ValidatorError, match="roto"):
+        use_case.run(_fake_request())
@@ -0,0 +1,51 @@
+import logging
+import os
+
+from xsd_manager.domain.models import ValidationReport
+from xsd_manager.services.validation import watch
+from xsd_manager.services.validation.use_case import ValidationUseCase
+from xsd_manager.services.validation.watch import FolderWatcher, WatchConfig, WatchedFile
+from xsd_manager.services.validators.base import BaseValidator
+
+
+class CrashingValidator(BaseValidator):
+    """Kills its worker process for files named crash*.xml."""
+
+    name = "crash"
+
+    def supports(self, request):
+        return True
+
+    def validate(self, request, document=None):
+        if request.xml_path.name.startswith("crash"):
+            os._exit(1)
+        return ValidationReport(ok=True, issues=[])
+
+
+def test_worker_crash_reports_failure_and_keeps_watching(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "crash.xml").write_text("<a/>")
+    config = WatchConfig(directories=[inbox], xsd_paths=[], poll_interval=0.05, settle_seconds=0, workers=2)
+    watcher = FolderWatcher(ValidationUseCase([CrashingValidator()]), config)
+    results = []
+    for result in watcher.results():
+        results.append(result)
+        if len(results) == 1:
+            # Dropped after the crash: only a new pool can validate it.
+            (inbox / "good.xml").write_text("<a/>")
+        else:
+            watcher.stop()
+    crashed, good = results
+    assert crashed.xml_path.name == "crash.xml"
+    assert not crashed.passed and "inesperada" in crashed.failure
+    assert good.xml_path.name == "good.xml" and good.passed
+    assert watcher.stats().failed == 1
+
+
+def test_report_write_error_is_logged(tmp_path, caplog):
+    result = WatchedFile(xml_path=tmp_path / "a.xml", report=ValidationReport(ok=True, issues=[]))
+    missing = tmp_path / "missing"
+    with caplog.at_level(logging.WARNING, logger=watch.__name__):
+        watch._write_json_report(result, missing)
+    assert "a.xml" in caplog.text
@@ -0,0 +1,31 @@
+import argparse
+
+import pytest
+
+import validar_xml
+from xsd_manager.services.validation.server import SchemaRegistry, ValidationService
+from xsd_manager.services.validation.use_case import ValidationUseCase
+from xsd_manager.services.validation.watch import WatchConfig
+
+
+def test_run_many_rejects_negative_workers():
+    with pytest.raises(ValueError):
+        list(ValidationUseCase([]).run_many([], workers=-1))
+
+
+def test_watch_config_rejects_negative_workers(tmp_path):
+    with pytest.raises(ValueError):
+        WatchConfig(directories=[tmp_path], xsd_paths=[], workers=-2)
+    assert WatchConfig(directories=[tmp_path], xsd_paths=[], workers=0).workers == 0
+
+
+def test_validation_service_rejects_negative_workers():
+    with pytest.raises(ValueError):
+        ValidationService(SchemaRegistry(), ValidationUseCase([]), workers=-1)
+
+
+def test_cli_workers_type():
+    assert validar_xml._non_negative_int("0") == 0
+    assert validar_xml._non_negative_int("4") == 4
+    with pytest.raises(argparse.ArgumentTypeError):
+        validar_xml._non_negative_int("-1")